@@ -1,5 +1,6 @@
 import math
 from ..constants import *
+from .distance_tables import cosmology
 
 def hubble_distance():
     """
@@ -16,77 +17,56 @@ def lookback_time(redshift, omega_m=0.31, omega_lambda=0.69):
     Calculate lookback time to given redshift.
     
     Args:
-        redshift (float): Cosmological redshift z
+        redshift (float or array): Cosmological redshift z
         omega_m (float): Matter density parameter
         omega_lambda (float): Dark energy density parameter
     
     Returns:
-        float: Lookback time (s)
+        float or array: Lookback time (s)
     """
-    # Simplified approximation for flat universe
-    hubble_time = 1 / HUBBLE_CONSTANT
-    integral_approx = (2/3) * (1/math.sqrt(omega_lambda)) * math.asinh(math.sqrt(omega_lambda/omega_m))
-    return hubble_time * integral_approx * (1 - 1/math.sqrt(1 + redshift))
-
+    return cosmology(omega_m, omega_lambda).lookback_time(redshift)
 
 def comoving_distance(redshift, omega_m=0.31, omega_lambda=0.69):
     """
     Calculate comoving distance to given redshift.
     
     Args:
-        redshift (float): Cosmological redshift z
+        redshift (float or array): Cosmological redshift z
         omega_m (float): Matter density parameter
         omega_lambda (float): Dark energy density parameter
     
     Returns:
-        float: Comoving distance (m)
+        float or array: Comoving distance (m)
     """
-    # Simplified for flat universe
-    dh = hubble_distance()
-    # Numerical integration approximation
-    z_steps = max(100, int(redshift * 100))
-    dz = redshift / z_steps
-    integral = 0
-    
-    for i in range(z_steps):
-        z = i * dz
-        ez = math.sqrt(omega_m * (1 + z)**3 + omega_lambda)
-        integral += dz / ez
-    
-    return dh * integral
-
+    return cosmology(omega_m, omega_lambda).comoving_distance(redshift)
 
 def angular_diameter_distance(redshift, omega_m=0.31, omega_lambda=0.69):
     """
     Calculate angular diameter distance.
     
     Args:
-        redshift (float): Cosmological redshift z
+        redshift (float or array): Cosmological redshift z
         omega_m (float): Matter density parameter
         omega_lambda (float): Dark energy density parameter
     
     Returns:
-        float: Angular diameter distance (m)
+        float or array: Angular diameter distance (m)
     """
-    dc = comoving_distance(redshift, omega_m, omega_lambda)
-    return dc / (1 + redshift)
-
+    return cosmology(omega_m, omega_lambda).angular_diameter_distance(redshift)
 
 def luminosity_distance(redshift, omega_m=0.31, omega_lambda=0.69):
     """
     Calculate luminosity distance.
     
     Args:
-        redshift (float): Cosmological redshift z
+        redshift (float or array): Cosmological redshift z
         omega_m (float): Matter density parameter
         omega_lambda (float): Dark energy density parameter
     
     Returns:
-        float: Luminosity distance (m)
+        float or array: Luminosity distance (m)
     """
-    dc = comoving_distance(redshift, omega_m, omega_lambda)
-    return dc * (1 + redshift)
-
+    return cosmology(omega_m, omega_lambda).luminosity_distance(redshift)
 
 def critical_density():
     """
@@ -125,15 +105,7 @@ def age_of_universe(omega_m=0.31, omega_lambda=0.69):
     Returns:
         float: Age of universe (s)
     """
-    hubble_time = 1 / HUBBLE_CONSTANT
-    # Approximation for flat universe
-    if omega_lambda > 0:
-        integral = (2/3) * (1/math.sqrt(omega_lambda)) * math.asinh(math.sqrt(omega_lambda/omega_m))
-        return hubble_time * integral
-    else:
-        # Matter-dominated universe
-        return (2/3) * hubble_time / math.sqrt(omega_m)
-
+    return cosmology(omega_m, omega_lambda).age_today
 
 def scale_factor(redshift):
     """
@@ -0,0 +1,235 @@
+import time
+import numpy as np
+from ..constants import GRAVITATIONAL_CONSTANT, COULOMB_CONSTANT
+
+
+def _morton_keys(icoords, depth):
+    dim = icoords.shape[1]
+    keys = np.zeros(len(icoords), dtype=np.uint64)
+    for bit in range(depth):
+        for axis in range(dim):
+            b = (icoords[:, axis] >> np.uint64(bit)) & np.uint64(1)
+            keys |= b << np.uint64(bit * dim + axis)
+    return keys
+
+
+def _expand_ranges(owners, starts, counts):
+    total = int(np.sum(counts))
+    offsets = np.cumsum(counts) - counts
+    local = np.arange(total) - np.repeat(offsets, counts)
+    return np.repeat(owners, counts), np.repeat(starts, counts) + local
+
+
+class BarnesHutTree:
+    def __init__(self, positions, strengths, leaf_size=8, max_depth=None):
+        positions = np.asarray(positions, dtype=float)
+        strengths = np.asarray(strengths, dtype=float)
+        n, dim = positions.shape
+        if dim not in (2, 3):
+            raise ValueError("Barnes-Hut tree supports 2D and 3D points only")
+        if max_depth is None:
+            max_depth = 63 // dim
+
+        lo = positions.min(axis=0)
+        box = max(float(np.max(positions.max(axis=0) - lo)), 1e-300) * (1 + 1e-9)
+        icoords = ((positions - lo) / box * 2**max_depth).astype(np.uint64)
+
+        order = np.argsort(_morton_keys(icoords, max_depth), kind='stable')
+        self.order = order
+        self.positions = positions[order]
+        self.strengths = strengths[order]
+        self.dim = dim
+        self.leaf_size = leaf_size
+        self.signed = bool(np.any(strengths < 0))
+        self.depth = max_depth
+        self.max_depth = max_depth
+        self.lo = lo
+        self.sizes = box / 2.0**np.arange(max_depth + 1)
+
+        keys = _morton_keys(icoords[order], max_depth)
+        weights = np.abs(self.strengths)
+        self.levels = []
+        for level in range(max_depth + 1):
+            level_keys = keys >> np.uint64(dim * (max_depth - level))
+            starts = np.flatnonzero(np.r_[True, level_keys[1:] != level_keys[:-1]])
+            counts = np.diff(np.r_[starts, n])
+
+            w = np.add.reduceat(weights, starts)
+            q = np.add.reduceat(self.strengths, starts)
+            wx = np.add.reduceat(weights[:, None] * self.positions, starts, axis=0)
+            safe_w = np.where(w > 0, w, 1)[:, None]
+            first = self.positions[starts]
+            center = np.where(w[:, None] > 0, wx / safe_w, first)
+            qx = np.add.reduceat(self.strengths[:, None] * self.positions, starts, axis=0)
+            dipole = qx - q[:, None] * center
+
+            cell = icoords[order][starts] >> np.uint64(max_depth - level)
+            box_center = lo + (cell.astype(float) + 0.5) * self.sizes[level]
+
+            self.levels.append({
+                'keys': level_keys[starts],
+                'starts': starts,
+                'counts': counts,
+                'charge': q,
+                'center': center,
+                'dipole': dipole,
+                'box_center': box_center,
+            })
+            if np.all(counts <= leaf_size):
+                self.depth = level
+                break
+
+        for level in range(self.depth):
+            parent_keys = self.levels[level + 1]['keys'] >> np.uint64(dim)
+            node = self.levels[level]
+            node['child_lo'] = np.searchsorted(parent_keys, node['keys'], side='left')
+            node['child_hi'] = np.searchsorted(parent_keys, node['keys'], side='right')
+
+    def _monopole_dipole(self, node, nodes, x):
+        r = x - node['center'][nodes]
+        r2 = np.einsum('ij,ij->i', r, r) + self._eps2
+        inv_r = 1 / np.sqrt(r2)
+        inv_r3 = inv_r / r2
+        q = node['charge'][nodes]
+        if not self.signed:
+            return q * inv_r, (q * inv_r3)[:, None] * r
+        p = node['dipole'][nodes]
+        pr = np.einsum('ij,ij->i', p, r)
+        phi = q * inv_r + pr * inv_r3
+        g = (q * inv_r3 + 3 * pr * inv_r3 / r2)[:, None] * r - inv_r3[:, None] * p
+        return phi, g
+
+    def evaluate(self, targets=None, theta=0.5, softening=0.0, group_size=8, chunk_size=1024):
+        self_targets = targets is None
+        if self_targets:
+            targets = self.positions
+            order = np.arange(len(targets))
+        else:
+            targets = np.asarray(targets, dtype=float)
+            icoords = (targets - self.lo) / self.sizes[0] * 2**self.max_depth
+            icoords = np.clip(icoords, 0, 2**self.max_depth - 1).astype(np.uint64)
+            order = np.argsort(_morton_keys(icoords, self.max_depth), kind='stable')
+            targets = targets[order]
+
+        n_targets = len(targets)
+        potential = np.zeros(n_targets)
+        field = np.zeros((n_targets, self.dim))
+        self._eps2 = softening**2
+
+        group_starts = np.arange(0, n_targets, group_size)
+        group_counts = np.minimum(group_size, n_targets - group_starts)
+        group_lo = np.minimum.reduceat(targets, group_starts, axis=0)
+        group_hi = np.maximum.reduceat(targets, group_starts, axis=0)
+        group_center = 0.5 * (group_lo + group_hi)
+        group_half = 0.5 * (group_hi - group_lo)
+        groups_per_chunk = max(1, chunk_size // group_size)
+
+        for g0 in range(0, len(group_starts), groups_per_chunk):
+            groups = np.arange(g0, min(g0 + groups_per_chunk, len(group_starts)))
+            t0 = group_starts[groups[0]]
+            t1 = group_starts[groups[-1]] + group_counts[groups[-1]]
+            phi = np.zeros(t1 - t0)
+            g = np.zeros((t1 - t0, self.dim))
+
+            pair_g = groups
+            pair_n = np.zeros(len(groups), dtype=int)
+            for level in range(self.depth + 1):
+                if len(pair_g) == 0:
+                    break
+                node = self.levels[level]
+                size = self.sizes[level]
+
+                gap = np.maximum(np.abs(node['center'][pair_n] - group_center[pair_g]) -
+                                 group_half[pair_g], 0)
+                d2 = np.einsum('ij,ij->i', gap, gap)
+                overlap = np.all(np.abs(node['box_center'][pair_n] - group_center[pair_g]) <=
+                                 size / 2 + group_half[pair_g], axis=1)
+                accept = ~overlap & (size * size < theta * theta * d2)
+                leaf = (node['counts'][pair_n] <= self.leaf_size) | (level == self.depth)
+
+                a = np.flatnonzero(accept)
+                if len(a):
+                    nodes, t = _expand_ranges(pair_n[a], group_starts[pair_g[a]],
+                                              group_counts[pair_g[a]])
+                    phi_a, g_a = self._monopole_dipole(node, nodes, targets[t])
+                    phi += np.bincount(t - t0, phi_a, minlength=t1 - t0)
+                    for k in range(self.dim):
+                        g[:, k] += np.bincount(t - t0, g_a[:, k], minlength=t1 - t0)
+
+                d = np.flatnonzero(~accept & leaf)
+                if len(d):
+                    nodes = pair_n[d]
+                    leaf_index, t = _expand_ranges(np.arange(len(d)), group_starts[pair_g[d]],
+                                                   group_counts[pair_g[d]])
+                    t, src = _expand_ranges(t, node['starts'][nodes[leaf_index]],
+                                            node['counts'][nodes[leaf_index]])
+                    rd = targets[t] - self.positions[src]
+                    r2d = np.einsum('ij,ij->i', rd, rd) + self._eps2
+                    valid = r2d > 0
+                    if self_targets:
+                        valid &= src != t
+                    t, rd, r2d, qd = t[valid], rd[valid], r2d[valid], self.strengths[src[valid]]
+                    inv_r = 1 / np.sqrt(r2d)
+                    phi += np.bincount(t - t0, qd * inv_r, minlength=t1 - t0)
+                    coeff = qd * inv_r / r2d
+                    for k in range(self.dim):
+                        g[:, k] += np.bincount(t - t0, coeff * rd[:, k], minlength=t1 - t0)
+
+                if level == self.depth:
+                    break
+                o = np.flatnonzero(~accept & ~leaf)
+                nodes = pair_n[o]
+                lo, hi = node['child_lo'][nodes], node['child_hi'][nodes]
+                pair_g, pair_n = _expand_ranges(pair_g[o], lo, hi - lo)
+
+            potential[t0:t1] = phi
+            field[t0:t1] = g
+
+        unsorted_potential = np.empty_like(potential)
+        unsorted_field = np.empty_like(field)
+        original = self.order if self_targets else order
+        unsorted_potential[original] = potential
+        unsorted_field[original] = field
+        return unsorted_potential, unsorted_field
+
+
+def barnes_hut_accelerations(positions, masses, theta=0.5, softening=0.0,
+                             G=GRAVITATIONAL_CONSTANT, leaf_size=8):
+    _, field = BarnesHutTree(positions, masses, leaf_size).evaluate(theta=theta, softening=softening)
+    return -G * field
+
+
+def barnes_hut_gravity(positions, masses, targets=None, theta=0.5, softening=0.0,
+                       G=GRAVITATIONAL_CONSTANT, leaf_size=8):
+    potential, field = BarnesHutTree(positions, masses, leaf_size).evaluate(targets, theta, softening)
+    return -G * potential, -G * field
+
+
+def barnes_hut_electric_field(positions, charges, targets=None, theta=0.5, softening=0.0,
+                              leaf_size=8):
+    potential, field = BarnesHutTree(positions, charges, leaf_size).evaluate(targets, theta, softening)
+    return COULOMB_CONSTANT * potential, COULOMB_CONSTANT * field
+
+
+def benchmark_barnes_hut(n_bodies=(1000, 10000, 100000), theta=0.5):
+    from .nbody import pairwise_accelerations
+
+    results = {}
+    for n in n_bodies:
+        positions = np.random.normal(size=(n, 3))
+        masses = np.full(n, 1.0 / n)
+
+        start = time.perf_counter()
+        tree_acc = barnes_hut_accelerations(positions, masses, theta, softening=1e-3, G=1.0)
+        tree_time = time.perf_counter() - start
+
+        entry = {'tree_time': tree_time}
+        if n <= 20000:
+            start = time.perf_counter()
+            direct_acc = pairwise_accelerations(positions, masses, softening=1e-3, G=1.0)
+            entry['direct_time'] = time.perf_counter() - start
+            entry['rms_relative_error'] = np.sqrt(
+                np.mean(np.sum((tree_acc - direct_acc)**2, axis=1)) /
+                np.mean(np.sum(direct_acc**2, axis=1)))
+        results[n] = entry
+    return results
@@ -0,0 +1,20 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+def evaluate_batch(f, X, vectorized=False, executor=None, chunksize=1):
+    if vectorized:
+        return np.asarray(f(X), dtype=float)
+    if executor is not None:
+        return np.fromiter(executor.map(f, X, chunksize=chunksize), dtype=float, count=len(X))
+    return np.array([f(x) for x in X], dtype=float)
+
+
+def batch_evaluator(f, vectorized=False, n_workers=None, chunksize=1):
+    # the caller owns the returned executor and must shut it down
+    executor = ProcessPoolExecutor(n_workers) if n_workers else None
+
+    def evaluate(X):
+        return evaluate_batch(f, X, vectorized, executor, chunksize)
+
+    return evaluate, executor
@@ -0,0 +1,271 @@
+import time
+from collections import namedtuple
+import numpy as np
+from ..constants import EARTH_GRAVITY, VACUUM_PERMEABILITY
+
+
+ConservationLaw = namedtuple('ConservationLaw', ['flux', 'wave_speeds', 'exact_flux'])
+
+
+def burgers_law():
+    def flux(U):
+        return 0.5 * U**2
+
+    def wave_speeds(U):
+        return U[0], U[0]
+
+    def exact_flux(UL, UR):
+        fL, fR = 0.5 * UL**2, 0.5 * UR**2
+        rarefaction = np.where(UL > 0, fL, np.where(UR < 0, fR, 0.0))
+        return np.where(UL <= UR, rarefaction, np.maximum(fL, fR))
+
+    return ConservationLaw(flux, wave_speeds, exact_flux)
+
+
+def advection_law(speed=1.0):
+    def flux(U):
+        return speed * U
+
+    def wave_speeds(U):
+        return np.full_like(U[0], speed), np.full_like(U[0], speed)
+
+    def exact_flux(UL, UR):
+        return speed * (UL if speed >= 0 else UR)
+
+    return ConservationLaw(flux, wave_speeds, exact_flux)
+
+
+def shallow_water_law(gravity=EARTH_GRAVITY):
+    def flux(U):
+        h, hu = U
+        return np.array([hu, hu**2 / h + 0.5 * gravity * h**2])
+
+    def wave_speeds(U):
+        u = U[1] / U[0]
+        c = np.sqrt(gravity * U[0])
+        return u - c, u + c
+
+    return ConservationLaw(flux, wave_speeds, None)
+
+
+def mhd_conserved_state(rho, u, v, w, by, bz, p, bx, gamma=5/3, permeability=VACUUM_PERMEABILITY):
+    rho, u, v, w, by, bz, p = np.broadcast_arrays(*[np.asarray(q, dtype=float)
+                                                    for q in (rho, u, v, w, by, bz, p)])
+    energy = (p / (gamma - 1) + 0.5 * rho * (u**2 + v**2 + w**2)
+              + 0.5 * (bx**2 + by**2 + bz**2) / permeability)
+    return np.array([rho, rho * u, rho * v, rho * w, by, bz, energy])
+
+
+def mhd_primitive_state(U, bx, gamma=5/3, permeability=VACUUM_PERMEABILITY):
+    rho, mx, my, mz, by, bz, energy = U
+    u, v, w = mx / rho, my / rho, mz / rho
+    p = (gamma - 1) * (energy - 0.5 * rho * (u**2 + v**2 + w**2)
+                       - 0.5 * (bx**2 + by**2 + bz**2) / permeability)
+    return rho, u, v, w, by, bz, p
+
+
+def ideal_mhd_law(bx, gamma=5/3, permeability=VACUUM_PERMEABILITY):
+    def flux(U):
+        rho, u, v, w, by, bz, p = mhd_primitive_state(U, bx, gamma, permeability)
+        total_pressure = p + 0.5 * (bx**2 + by**2 + bz**2) / permeability
+        u_dot_b = u * bx + v * by + w * bz
+        return np.array([
+            rho * u,
+            rho * u**2 + total_pressure - bx**2 / permeability,
+            rho * u * v - bx * by / permeability,
+            rho * u * w - bx * bz / permeability,
+            by * u - bx * v,
+            bz * u - bx * w,
+            (U[6] + total_pressure) * u - bx * u_dot_b / permeability,
+        ])
+
+    def wave_speeds(U):
+        rho, u, v, w, by, bz, p = mhd_primitive_state(U, bx, gamma, permeability)
+        a2 = gamma * p / rho
+        b2 = (bx**2 + by**2 + bz**2) / (permeability * rho)
+        bx2 = bx**2 / (permeability * rho)
+        cf = np.sqrt(0.5 * (a2 + b2 + np.sqrt(np.maximum((a2 + b2)**2 - 4 * a2 * bx2, 0))))
+        return u - cf, u + cf
+
+    return ConservationLaw(flux, wave_speeds, None)
+
+
+def minmod(a, b):
+    return np.where(a * b > 0, np.sign(a) * np.minimum(np.abs(a), np.abs(b)), 0.0)
+
+
+def van_leer(a, b):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(a * b > 0, 2 * a * b / (a + b), 0.0)
+
+
+def superbee(a, b):
+    s = np.sign(a)
+    a, b = np.abs(a), np.abs(b)
+    slope = np.maximum(np.minimum(2 * a, b), np.minimum(a, 2 * b))
+    return np.where(s * np.sign(b) > 0, s * slope, 0.0)
+
+
+def monotonized_central(a, b):
+    return minmod(minmod(2 * a, 2 * b), 0.5 * (a + b))
+
+
+LIMITERS = {
+    'minmod': minmod,
+    'van_leer': van_leer,
+    'superbee': superbee,
+    'mc': monotonized_central,
+}
+
+N_GHOST = 3
+
+
+def _pad(U, bc):
+    modes = {'periodic': 'wrap', 'outflow': 'edge'}
+    if bc not in modes:
+        raise ValueError("bc must be 'periodic' or 'outflow'")
+    return np.pad(U, ((0, 0), (N_GHOST, N_GHOST)), mode=modes[bc])
+
+
+def _stencil(Ug, n, offset):
+    start = N_GHOST - 1 + offset
+    return Ug[:, start:start + n + 1]
+
+
+def _weno5(v0, v1, v2, v3, v4, eps=1e-6):
+    b0 = 13/12 * (v0 - 2*v1 + v2)**2 + 0.25 * (v0 - 4*v1 + 3*v2)**2
+    b1 = 13/12 * (v1 - 2*v2 + v3)**2 + 0.25 * (v1 - v3)**2
+    b2 = 13/12 * (v2 - 2*v3 + v4)**2 + 0.25 * (3*v2 - 4*v3 + v4)**2
+    a0, a1, a2 = 0.1 / (eps + b0)**2, 0.6 / (eps + b1)**2, 0.3 / (eps + b2)**2
+    p0 = (2*v0 - 7*v1 + 11*v2) / 6
+    p1 = (-v1 + 5*v2 + 2*v3) / 6
+    p2 = (2*v2 + 5*v3 - v4) / 6
+    return (a0*p0 + a1*p1 + a2*p2) / (a0 + a1 + a2)
+
+
+def reconstruct(Ug, n, scheme='muscl', limiter='van_leer'):
+    def s(offset):
+        return _stencil(Ug, n, offset)
+
+    if scheme == 'godunov':
+        return s(0), s(1)
+    if scheme == 'muscl':
+        slope = LIMITERS[limiter](s(0) - s(-1), s(1) - s(0))
+        slope_right = LIMITERS[limiter](s(1) - s(0), s(2) - s(1))
+        return s(0) + 0.5 * slope, s(1) - 0.5 * slope_right
+    if scheme == 'weno5':
+        return _weno5(s(-2), s(-1), s(0), s(1), s(2)), _weno5(s(3), s(2), s(1), s(0), s(-1))
+    raise ValueError("scheme must be 'godunov', 'muscl' or 'weno5'")
+
+
+def numerical_flux(law, UL, UR, riemann='hll'):
+    if riemann == 'exact':
+        if law.exact_flux is None:
+            raise ValueError("This conservation law has no exact Riemann flux")
+        return law.exact_flux(UL, UR)
+
+    FL, FR = law.flux(UL), law.flux(UR)
+    minL, maxL = law.wave_speeds(UL)
+    minR, maxR = law.wave_speeds(UR)
+    if riemann == 'rusanov':
+        a = np.maximum.reduce([np.abs(minL), np.abs(maxL), np.abs(minR), np.abs(maxR)])
+        return 0.5 * (FL + FR) - 0.5 * a * (UR - UL)
+    if riemann == 'hll':
+        sL = np.minimum(np.minimum(minL, minR), 0.0)
+        sR = np.maximum(np.maximum(maxL, maxR), 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hll = (sR * FL - sL * FR + sL * sR * (UR - UL)) / (sR - sL)
+        return np.where(sR - sL > 0, hll, FL)
+    raise ValueError("riemann must be 'exact', 'rusanov' or 'hll'")
+
+
+def _rhs(law, U, dx, scheme, limiter, riemann, bc, viscosity):
+    n = U.shape[1]
+    Ug = _pad(U, bc)
+    UL, UR = reconstruct(Ug, n, scheme, limiter)
+    F = numerical_flux(law, UL, UR, riemann)
+    dUdt = -(F[:, 1:] - F[:, :-1]) / dx
+    if viscosity:
+        interior = Ug[:, N_GHOST:N_GHOST + n]
+        dUdt += viscosity * (Ug[:, N_GHOST + 1:N_GHOST + n + 1] - 2 * interior
+                             + Ug[:, N_GHOST - 1:N_GHOST + n - 1]) / dx**2
+    return dUdt
+
+
+SSP_ORDER = {'godunov': 1, 'muscl': 2, 'weno5': 3}
+
+
+def _ssp_step(rhs, U, dt, order):
+    if order == 1:
+        return U + dt * rhs(U)
+    if order == 2:
+        U1 = U + dt * rhs(U)
+        return 0.5 * (U + U1 + dt * rhs(U1))
+    U1 = U + dt * rhs(U)
+    U2 = 0.75 * U + 0.25 * (U1 + dt * rhs(U1))
+    return U / 3 + 2 / 3 * (U2 + dt * rhs(U2))
+
+
+def stable_time_step(law, U, dx, cfl=0.4, viscosity=0.0):
+    s_min, s_max = law.wave_speeds(U)
+    speed = max(np.max(np.abs(s_min)), np.max(np.abs(s_max)), 1e-300)
+    dt = cfl * dx / speed
+    if viscosity:
+        dt = min(dt, cfl * dx**2 / (2 * viscosity))
+    return dt
+
+
+def conservation_law_steps(law, U0, dx, t_final, save_times=None, n_snapshots=11, scheme='muscl',
+                           limiter='van_leer', riemann='hll', cfl=0.4, bc='outflow', viscosity=0.0,
+                           max_steps=10**7):
+    U0 = np.asarray(U0, dtype=float)
+    scalar = U0.ndim == 1
+    U = np.atleast_2d(U0).copy()
+    if save_times is None:
+        save_times = np.linspace(0, t_final, n_snapshots)
+    save_times = np.asarray(save_times, dtype=float)
+
+    def rhs(V):
+        return _rhs(law, V, dx, scheme, limiter, riemann, bc, viscosity)
+
+    order = SSP_ORDER[scheme]
+    t = 0.0
+    steps = 0
+    for t_save in save_times:
+        while t < t_save:
+            if steps >= max_steps:
+                raise RuntimeError(f"max_steps={max_steps} reached at t={t:.6g} before t={t_save:.6g}")
+            dt = min(stable_time_step(law, U, dx, cfl, viscosity), t_save - t)
+            U = _ssp_step(rhs, U, dt, order)
+            t = t_save if t_save - t <= dt else t + dt
+            steps += 1
+        yield t, (U[0] if scalar else U)
+
+
+def solve_conservation_law(law, U0, dx, t_final, save_times=None, n_snapshots=11, **options):
+    t, U = zip(*conservation_law_steps(law, U0, dx, t_final, save_times, n_snapshots, **options))
+    return np.array(t), np.array(U)
+
+
+def benchmark_conservation_laws(sizes=(200, 1000, 5000), t_final=0.5):
+    from ..mathematical.differential_equations import burgers_equation_1d
+
+    results = {}
+    for nx in sizes:
+        x = np.linspace(0, 2, nx)
+        dx = x[1] - x[0]
+        u0 = 1.0 + 0.5 * np.sin(np.pi * x)
+        entry = {}
+
+        nt = int(np.ceil(t_final / (0.4 * dx / 1.5)))
+        start = time.perf_counter()
+        burgers_equation_1d(0.0, 2.0, t_final, nx, nt, lambda x: 1.0 + 0.5 * np.sin(np.pi * x))
+        entry['upwind_history'] = time.perf_counter() - start
+
+        for scheme in ('godunov', 'muscl', 'weno5'):
+            start = time.perf_counter()
+            solve_conservation_law(burgers_law(), u0, dx, t_final, n_snapshots=2, scheme=scheme,
+                                   riemann='exact', bc='periodic')
+            entry[scheme] = time.perf_counter() - start
+        results[nx] = entry
+    return results
@@ -1,158 +1,178 @@
+import time
 import numpy as np
+from scipy.sparse import coo_matrix, diags
+from scipy.sparse.linalg import spsolve
+from .optimization import conjugate_gradient
 
 
-def linear_fem_1d(n_elements, length, load, boundary_conditions):
-    element_length = length / n_elements
-    k = np.zeros((n_elements + 1, n_elements + 1))
-    f = np.zeros(n_elements + 1)
+def assemble_sparse(element_matrices, element_dofs, global_size, element_vectors=None):
+    element_matrices = np.asarray(element_matrices, dtype=float)
+    element_dofs = np.asarray(element_dofs, dtype=int)
+    n_dofs = element_dofs.shape[1]
+
+    rows = np.repeat(element_dofs, n_dofs, axis=1).ravel()
+    cols = np.tile(element_dofs, (1, n_dofs)).ravel()
+    k = coo_matrix((element_matrices.ravel(), (rows, cols)),
+                   shape=(global_size, global_size)).tocsr()
+
+    f = np.zeros(global_size)
+    if element_vectors is not None:
+        f = np.bincount(element_dofs.ravel(), np.asarray(element_vectors, dtype=float).ravel(),
+                        minlength=global_size)
+    return k, f
 
-    for i in range(n_elements):
-        xi = i * element_length
-        xj = xi + element_length
-        k_local = np.array([[1, -1],
-                            [-1, 1]]) / element_length
 
-        f_local = load(xi, xj) * element_length / 2 * np.array([1, 1])
+def apply_dirichlet(k, f, boundary_conditions):
+    fixed = np.array([dof for dof, value in boundary_conditions.items() if value is not None],
+                     dtype=int)
+    values = np.array([boundary_conditions[dof] for dof in fixed], dtype=float)
+    free = np.setdiff1d(np.arange(k.shape[0]), fixed)
 
-        k[i:i+2, i:i+2] += k_local
-        f[i:i+2] += f_local
+    k_free = k[free]
+    k_ff = k_free[:, free]
+    f_f = f[free] - k_free[:, fixed] @ values
+    return k_ff, f_f, free, fixed, values
 
-    for node, value in boundary_conditions.items():
-        k[node, :] = 0
-        k[node, node] = 1
-        f[node] = value
 
-    u = np.linalg.solve(k, f)
+def nodal_boundary_conditions(boundary_conditions, dofs_per_node=2):
+    dof_conditions = {}
+    for node, conditions in boundary_conditions.items():
+        for i in range(dofs_per_node):
+            if conditions[i] is not None:
+                dof_conditions[dofs_per_node*node + i] = conditions[i]
+    return dof_conditions
+
+
+def solve_sparse(k, f, boundary_conditions, solver='direct', tol=1e-10, max_iter=None):
+    k_ff, f_f, free, fixed, values = apply_dirichlet(k.tocsr(), f, boundary_conditions)
+
+    if solver == 'direct':
+        u_free = spsolve(k_ff.tocsc(), f_f)
+    elif solver == 'cg':
+        inv_diag = diags(1 / k_ff.diagonal())
+        scale = max(np.linalg.norm(f_f), 1e-300)
+        u_free = conjugate_gradient(k_ff, f_f, tol=tol * scale, max_iter=max_iter,
+                                    preconditioner=inv_diag)
+    else:
+        raise ValueError("solver must be 'direct' or 'cg'")
+
+    u = np.zeros(k.shape[0])
+    u[free] = u_free
+    u[fixed] = values
     return u
 
 
-def quadratic_fem_1d(n_elements, length, load, boundary_conditions):
+def _uniform_nodes(n_elements, length):
     element_length = length / n_elements
-    n_nodes = 2 * n_elements + 1
-    k = np.zeros((n_nodes, n_nodes))
-    f = np.zeros(n_nodes)
-
-    for i in range(n_elements):
-        xi = i * element_length
-        xj = xi + element_length
-        k_local = np.array([[7, -8, 1],
-                            [-8, 16, -8],
-                            [1, -8, 7]]) / (3 * element_length)
-
-        f_local = load(xi, xj) * element_length / 6 * np.array([1, 4, 1])
-        nodes = [2*i, 2*i+1, 2*i+2]
-
-        for a in range(3):
-            for b in range(3):
-                k[nodes[a], nodes[b]] += k_local[a, b]
-            f[nodes[a]] += f_local[a]
-
-    for node, value in boundary_conditions.items():
-        k[node, :] = 0
-        k[node, node] = 1
-        f[node] = value
-
-    u = np.linalg.solve(k, f)
-    return u
+    xi = np.arange(n_elements) * element_length
+    return element_length, xi, xi + element_length
 
 
-def fem_assembly(n_elements, element_matrices, global_size, boundary_conditions):
-    k = np.zeros((global_size, global_size))
-    f = np.zeros(global_size)
+def _element_loads(load, xi, xj):
+    # array call first; callbacks written for scalars (math functions, if-branches) fall back per element
+    try:
+        return np.broadcast_to(np.asarray(load(xi, xj), dtype=float), xi.shape)
+    except (TypeError, ValueError):
+        return np.vectorize(load, otypes=[float])(xi, xj)
 
-    for elem_index, (element_matrix, element_vector, mapping) in enumerate(element_matrices):
-        for a, i in enumerate(mapping):
-            for b, j in enumerate(mapping):
-                k[i, j] += element_matrix[a, b]
-            f[i] += element_vector[a]
 
-    for node, value in boundary_conditions.items():
-        k[node, :] = 0
-        k[node, node] = 1
-        f[node] = value
+def linear_fem_1d(n_elements, length, load, boundary_conditions, solver='direct'):
+    element_length, xi, xj = _uniform_nodes(n_elements, length)
+    k_local = np.array([[1, -1],
+                        [-1, 1]]) / element_length
 
-    u = np.linalg.solve(k, f)
+    f_local = _element_loads(load, xi, xj)[:, None] * element_length / 2 * np.array([1, 1])
+    dofs = np.arange(n_elements)[:, None] + np.arange(2)
+
+    k, f = assemble_sparse(np.broadcast_to(k_local, (n_elements, 2, 2)), dofs,
+                           n_elements + 1, f_local)
+    u = solve_sparse(k, f, boundary_conditions, solver)
     return u
 
 
-def fem_solver_1d(length, n_elements, stiffness_matrix_func, load_vector_func, boundary_conditions):
-    element_length = length / n_elements
-    k_total = np.zeros((n_elements + 1, n_elements + 1))
-    f_total = np.zeros(n_elements + 1)
+def quadratic_fem_1d(n_elements, length, load, boundary_conditions, solver='direct'):
+    element_length, xi, xj = _uniform_nodes(n_elements, length)
+    n_nodes = 2 * n_elements + 1
+    k_local = np.array([[7, -8, 1],
+                        [-8, 16, -8],
+                        [1, -8, 7]]) / (3 * element_length)
 
-    for i in range(n_elements):
-        k_local = stiffness_matrix_func(i, element_length)
-        f_local = load_vector_func(i, element_length)
+    f_local = _element_loads(load, xi, xj)[:, None] * element_length / 6 * np.array([1, 4, 1])
+    dofs = 2 * np.arange(n_elements)[:, None] + np.arange(3)
 
-        k_total[i:i+2, i:i+2] += k_local
-        f_total[i:i+2] += f_local
+    k, f = assemble_sparse(np.broadcast_to(k_local, (n_elements, 3, 3)), dofs, n_nodes, f_local)
+    u = solve_sparse(k, f, boundary_conditions, solver)
+    return u
 
-    for node, value in boundary_conditions.items():
-        k_total[node, :] = 0
-        k_total[node, node] = 1
-        f_total[node] = value
 
-    displacements = np.linalg.solve(k_total, f_total)
-    return displacements
+def fem_assembly(n_elements, element_matrices, global_size, boundary_conditions, solver='direct'):
+    matrices, vectors, mappings = zip(*element_matrices)
+    k, f = assemble_sparse(np.array(matrices), np.array(mappings), global_size, np.array(vectors))
+    u = solve_sparse(k, f, boundary_conditions, solver)
+    return u
 
 
-def beam_2d(n_elements, length, force, support_positions):
+def fem_solver_1d(length, n_elements, stiffness_matrix_func, load_vector_func, boundary_conditions,
+                  solver='direct'):
     element_length = length / n_elements
-    n_nodes = n_elements + 1
-    k = np.zeros((n_nodes, n_nodes))
-    f = np.zeros(n_nodes)
+    k_locals = np.array([stiffness_matrix_func(i, element_length) for i in range(n_elements)])
+    f_locals = np.array([load_vector_func(i, element_length) for i in range(n_elements)])
+    dofs = np.arange(n_elements)[:, None] + np.arange(2)
 
-    for i in range(n_elements):
-        xi = i * element_length
-        xj = xi + element_length
-        k_local = np.array([[1, -1],
-                            [-1, 1]]) * 12 / element_length**3
+    k_total, f_total = assemble_sparse(k_locals, dofs, n_elements + 1, f_locals)
+    displacements = solve_sparse(k_total, f_total, boundary_conditions, solver)
+    return displacements
 
-        f_local = force(xi, xj) * element_length / 2 * np.array([1, 1])
 
-        k[i:i+2, i:i+2] += k_local
-        f[i:i+2] += f_local
+def beam_2d(n_elements, length, force, support_positions, solver='direct'):
+    element_length, xi, xj = _uniform_nodes(n_elements, length)
+    n_nodes = n_elements + 1
+    k_local = np.array([[1, -1],
+                        [-1, 1]]) * 12 / element_length**3
 
-    for node in support_positions:
-        k[node, :] = 0
-        k[node, node] = 1
-        f[node] = 0
+    f_local = _element_loads(force, xi, xj)[:, None] * element_length / 2 * np.array([1, 1])
+    dofs = np.arange(n_elements)[:, None] + np.arange(2)
 
-    displacements = np.linalg.solve(k, f)
+    k, f = assemble_sparse(np.broadcast_to(k_local, (n_elements, 2, 2)), dofs, n_nodes, f_local)
+    displacements = solve_sparse(k, f, {node: 0.0 for node in support_positions}, solver)
     return displacements
 
 
-def truss_2d(elements, nodes, forces, boundary_conditions):
+def truss_stiffness_matrices(nodes, connectivity, areas, youngs_moduli):
+    nodes = np.asarray(nodes, dtype=float)
+    connectivity = np.asarray(connectivity, dtype=int)
+    d = nodes[connectivity[:, 1]] - nodes[connectivity[:, 0]]
+    length = np.linalg.norm(d, axis=1)
+    c, s = d[:, 0] / length, d[:, 1] / length
+
+    block = np.stack([np.stack([c*c, c*s], -1), np.stack([c*s, s*s], -1)], -2)
+    k_local = np.concatenate([np.concatenate([block, -block], -1),
+                              np.concatenate([-block, block], -1)], -2)
+    k_local *= (np.asarray(youngs_moduli) * np.asarray(areas) / length)[:, None, None]
+
+    dofs = np.stack([2*connectivity[:, 0], 2*connectivity[:, 0] + 1,
+                     2*connectivity[:, 1], 2*connectivity[:, 1] + 1], axis=1)
+    return k_local, dofs
+
+
+def truss_2d(elements, nodes, forces, boundary_conditions, solver='direct'):
     num_nodes = len(nodes)
-    k_global = np.zeros((2*num_nodes, 2*num_nodes))
-    f_global = np.zeros(2*num_nodes)
-
-    for (node_i, node_j), area, youngs_modulus in elements:
-        xi, yi = nodes[node_i]
-        xj, yj = nodes[node_j]
-        length = np.sqrt((xj - xi)**2 + (yj - yi)**2)
-        c = (xj - xi) / length
-        s = (yj - yi) / length
-        k_local = (youngs_modulus * area / length) * np.array([[c*c, c*s, -c*c, -c*s],
-                                                                 [c*s, s*s, -c*s, -s*s],
-                                                                 [-c*c, -c*s, c*c, c*s],
-                                                                 [-c*s, -s*s, c*s, s*s]])
-        node_map = [2*node_i, 2*node_i+1, 2*node_j, 2*node_j+1]
-
-        for a in range(4):
-            for b in range(4):
-                k_global[node_map[a], node_map[b]] += k_local[a, b]
+    connectivity, areas, youngs_moduli = zip(*elements)
+    k_local, dofs = truss_stiffness_matrices(nodes, connectivity, areas, youngs_moduli)
+    k_global, f_global = assemble_sparse(k_local, dofs, 2*num_nodes)
 
     for node, values in forces.items():
         f_global[2*node:2*node+2] = values
 
-    for node, conditions in boundary_conditions.items():
-        f_global[2*node:2*node+2] = np.array(conditions)
-        for i in range(2):
-            dof_index = 2*node + i
-            if conditions[i] is not None:
-                k_global[dof_index, :] = 0
-                k_global[dof_index, dof_index] = 1
-
-    displacements = np.linalg.solve(k_global, f_global)
+    displacements = solve_sparse(k_global, f_global, nodal_boundary_conditions(boundary_conditions),
+                                 solver)
     return displacements
+
+
+def benchmark_sparse_fem(n_elements=(10**3, 10**4, 10**5, 10**6)):
+    results = {}
+    for n in n_elements:
+        start = time.perf_counter()
+        linear_fem_1d(n, 1.0, lambda xi, xj: 1.0, {0: 0.0, n: 0.0})
+        results[n] = time.perf_counter() - start
+    return results
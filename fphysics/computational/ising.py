@@ -0,0 +1,186 @@
+import time
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from ..statistical_mechanics.critical_phenomena import ising_model_magnetization
+
+
+ISING_CRITICAL_TEMPERATURE_2D = 2 / np.log(1 + np.sqrt(2))
+
+
+def onsager_magnetization(temperature, coupling=1.0):
+    temperature = np.asarray(temperature, dtype=float)
+    with np.errstate(divide='ignore', over='ignore'):
+        x = 1 - np.sinh(2 * coupling / temperature)**-4
+    return np.where(x > 0, np.abs(x)**(1/8), 0.0)
+
+
+class IsingModel2D:
+    def __init__(self, size, temperature, coupling=1.0, field=0.0, initial='random', seed=None):
+        if size % 2:
+            raise ValueError("Checkerboard updates require an even lattice size")
+        self.size = size
+        self.coupling = coupling
+        self.field = field
+        self.rng = np.random.default_rng(seed)
+
+        if initial == 'random':
+            self.spins = self.rng.choice(np.array([-1, 1], dtype=np.int8), size=(size, size))
+        elif initial == 'up':
+            self.spins = np.ones((size, size), dtype=np.int8)
+        else:
+            raise ValueError("initial must be 'random' or 'up'")
+
+        i, j = np.indices((size, size))
+        self._colors = [(i + j) % 2 == 0, (i + j) % 2 == 1]
+        self.set_temperature(temperature)
+        self.energy = self.total_energy()
+        self.magnetization = int(np.sum(self.spins, dtype=np.int64))
+
+    def set_temperature(self, temperature):
+        self.temperature = temperature
+        self.beta = 1.0 / temperature
+        s = np.array([-1, 1])[:, None]
+        nb = np.arange(-4, 5, 2)[None, :]
+        delta_e = 2 * s * (self.coupling * nb + self.field)
+        self._acceptance = np.minimum(1.0, np.exp(-self.beta * delta_e))
+        self._bond_probability = 1 - np.exp(-2 * self.beta * self.coupling)
+
+    def _neighbor_sum(self, spins=None):
+        s = self.spins if spins is None else spins
+        return (np.roll(s, 1, 0) + np.roll(s, -1, 0) +
+                np.roll(s, 1, 1) + np.roll(s, -1, 1)).astype(np.int64)
+
+    def total_energy(self):
+        s = self.spins.astype(np.int64)
+        bonds = np.sum(s * (np.roll(s, 1, 0) + np.roll(s, 1, 1)))
+        return float(-self.coupling * bonds - self.field * np.sum(s))
+
+    def metropolis_sweep(self):
+        for color in self._colors:
+            nb = self._neighbor_sum()
+            s = self.spins.astype(np.int64)
+            p = self._acceptance[(s + 1) // 2, (nb + 4) // 2]
+            flip = color & (self.rng.random(s.shape) < p)
+            flipped = s[flip]
+            self.energy += float(np.sum(2 * flipped * (self.coupling * nb[flip] + self.field)))
+            self.magnetization -= 2 * int(np.sum(flipped))
+            self.spins[flip] *= -1
+
+    def _require_zero_field(self):
+        if self.field != 0:
+            raise ValueError("Cluster updates are implemented for zero external field only")
+
+    def wolff_step(self):
+        self._require_zero_field()
+        L = self.size
+        flat = self.spins.ravel()
+        seed = self.rng.integers(L * L)
+        cluster_spin = flat[seed]
+        in_cluster = np.zeros(L * L, dtype=bool)
+        in_cluster[seed] = True
+        frontier = np.array([seed])
+
+        while len(frontier):
+            r, c = np.divmod(frontier, L)
+            neighbors = np.concatenate([((r + 1) % L) * L + c, ((r - 1) % L) * L + c,
+                                        r * L + (c + 1) % L, r * L + (c - 1) % L])
+            candidates = neighbors[(flat[neighbors] == cluster_spin) & ~in_cluster[neighbors]]
+            added = candidates[self.rng.random(len(candidates)) < self._bond_probability]
+            frontier = np.unique(added)
+            in_cluster[frontier] = True
+
+        cluster = in_cluster.reshape(L, L)
+        s = self.spins.astype(np.int64)
+        boundary = 0
+        for shift, axis in ((1, 0), (-1, 0), (1, 1), (-1, 1)):
+            outside = cluster & ~np.roll(cluster, shift, axis)
+            boundary += np.sum(s[outside] * np.roll(s, shift, axis)[outside])
+
+        self.energy += 2 * self.coupling * float(boundary)
+        self.magnetization -= 2 * int(cluster_spin) * int(np.sum(cluster))
+        self.spins[cluster] *= -1
+        return int(np.sum(cluster))
+
+    def swendsen_wang_step(self):
+        self._require_zero_field()
+        L = self.size
+        index = np.arange(L * L).reshape(L, L)
+        rows, cols = [], []
+        for axis in (0, 1):
+            aligned = self.spins == np.roll(self.spins, -1, axis)
+            active = aligned & (self.rng.random((L, L)) < self._bond_probability)
+            rows.append(index[active])
+            cols.append(np.roll(index, -1, axis)[active])
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+
+        graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(L * L, L * L))
+        n_clusters, labels = connected_components(graph, directed=False)
+        flip = (self.rng.random(n_clusters) < 0.5)[labels].reshape(L, L)
+        self.spins[flip] *= -1
+        self.energy = self.total_energy()
+        self.magnetization = int(np.sum(self.spins, dtype=np.int64))
+        return n_clusters
+
+    def run(self, n_sweeps, method='metropolis', burn_in=0, measure_every=1):
+        steps = {
+            'metropolis': self.metropolis_sweep,
+            'wolff': self.wolff_step,
+            'swendsen_wang': self.swendsen_wang_step,
+        }
+        if method not in steps:
+            raise ValueError("method must be 'metropolis', 'wolff' or 'swendsen_wang'")
+        step = steps[method]
+
+        for _ in range(burn_in):
+            step()
+
+        n_measurements = n_sweeps // measure_every
+        energies = np.empty(n_measurements)
+        magnetizations = np.empty(n_measurements)
+        n_sites = self.size**2
+        for k in range(n_sweeps):
+            step()
+            if (k + 1) % measure_every == 0:
+                energies[k // measure_every] = self.energy / n_sites
+                magnetizations[k // measure_every] = self.magnetization / n_sites
+
+        return energies, magnetizations
+
+
+def ising_magnetization_curve(temperatures, size=32, n_sweeps=1000, burn_in=200,
+                              method='wolff', seed=None):
+    temperatures = np.asarray(temperatures, dtype=float)
+    model = IsingModel2D(size, temperatures[0], initial='up', seed=seed)
+    simulated = np.empty(len(temperatures))
+    for k, T in enumerate(temperatures):
+        model.set_temperature(T)
+        _, m = model.run(n_sweeps, method, burn_in)
+        simulated[k] = np.mean(np.abs(m))
+
+    return {
+        'temperature': temperatures,
+        'simulated': simulated,
+        'onsager': onsager_magnetization(temperatures),
+        'mean_field': np.array([ising_model_magnetization(T, ISING_CRITICAL_TEMPERATURE_2D, 0)
+                                for T in temperatures]),
+    }
+
+
+def benchmark_ising(size=256, temperature=ISING_CRITICAL_TEMPERATURE_2D, n_sweeps=20):
+    from .monte_carlo import ising_model_2d
+
+    n_flips = 20000
+    start = time.perf_counter()
+    ising_model_2d(size, temperature, n_steps=n_flips)
+    legacy_rate = n_flips / size**2 / (time.perf_counter() - start)
+
+    results = {'size': size, 'legacy_sweeps_per_second': legacy_rate}
+    for method, key in (('metropolis', 'metropolis_sweeps_per_second'),
+                        ('wolff', 'wolff_clusters_per_second'),
+                        ('swendsen_wang', 'swendsen_wang_sweeps_per_second')):
+        model = IsingModel2D(size, temperature)
+        start = time.perf_counter()
+        model.run(n_sweeps, method)
+        results[key] = n_sweeps / (time.perf_counter() - start)
+    return results
@@ -0,0 +1,198 @@
+import numpy as np
+from .batch_evaluation import batch_evaluator
+
+
+def temperature_ladder(n_replicas, t_max=10.0):
+    return np.geomspace(1.0, t_max, n_replicas)
+
+
+def _replica_exchange(X, L, betas, parity, rng):
+    i = np.arange(parity, len(betas) - 1, 2)
+    j = i + 1
+    log_alpha = (betas[i] - betas[j]) * (L[j] - L[i])
+    accept = np.log(rng.random(len(i))) < log_alpha
+    src = np.concatenate([i[accept], j[accept]])
+    dst = np.concatenate([j[accept], i[accept]])
+    X[src] = X[dst]
+    L[src] = L[dst]
+    return accept
+
+
+def parallel_tempering(log_prob, initial_state, temperatures=None, n_replicas=8, t_max=10.0,
+                       step_size=0.1, n_samples=10000, burn_in=1000, swap_every=1,
+                       vectorized=False, n_workers=None, chunksize=1, seed=None):
+    rng = np.random.default_rng(seed)
+    if temperatures is None:
+        temperatures = temperature_ladder(n_replicas, t_max)
+    temperatures = np.asarray(temperatures, dtype=float)
+    betas = 1.0 / temperatures
+    K = len(temperatures)
+
+    initial_state = np.asarray(initial_state, dtype=float)
+    X = np.array(np.broadcast_to(initial_state, (K,) + initial_state.shape[-1:]))
+    d = X.shape[1]
+    scales = step_size * np.sqrt(temperatures)[:, None]
+
+    samples = np.empty((n_samples, K, d))
+    log_probs = np.empty((n_samples, K))
+    n_accepted = np.zeros(K)
+    n_swaps_proposed = np.zeros(K - 1)
+    n_swaps_accepted = np.zeros(K - 1)
+
+    evaluate, executor = batch_evaluator(log_prob, vectorized, n_workers, chunksize)
+    try:
+        L = evaluate(X)
+        parity = 0
+        for step in range(n_samples + burn_in):
+            proposal = X + scales * rng.normal(size=X.shape)
+            L_prop = evaluate(proposal)
+            accept = np.log(rng.random(K)) < betas * (L_prop - L)
+            X[accept] = proposal[accept]
+            L[accept] = L_prop[accept]
+            n_accepted += accept
+
+            if K > 1 and (step + 1) % swap_every == 0:
+                swapped = _replica_exchange(X, L, betas, parity, rng)
+                pairs = np.arange(parity, K - 1, 2)
+                n_swaps_proposed[pairs] += 1
+                n_swaps_accepted[pairs] += swapped
+                parity = 1 - parity
+
+            if step >= burn_in:
+                samples[step - burn_in] = X
+                log_probs[step - burn_in] = L
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    acceptance_rate = n_accepted / (n_samples + burn_in)
+    swap_acceptance_rate = n_swaps_accepted / np.maximum(n_swaps_proposed, 1)
+    return samples, log_probs, acceptance_rate, swap_acceptance_rate
+
+
+def _split_chains(samples):
+    n = samples.shape[0] // 2
+    return np.concatenate([samples[:n], samples[-n:]], axis=1)
+
+
+def split_rhat(samples):
+    chains = _split_chains(np.asarray(samples, dtype=float))
+    n = chains.shape[0]
+    W = np.mean(np.var(chains, axis=0, ddof=1), axis=0)
+    B = n * np.var(np.mean(chains, axis=0), axis=0, ddof=1)
+    var_plus = (n - 1) / n * W + B / n
+    return np.sqrt(var_plus / W)
+
+
+def _autocovariance(x):
+    n = x.shape[0]
+    size = 2 ** int(np.ceil(np.log2(2 * n)))
+    centered = x - np.mean(x, axis=0)
+    spectrum = np.fft.rfft(centered, size, axis=0)
+    return np.fft.irfft(spectrum * np.conj(spectrum), size, axis=0)[:n] / n
+
+
+def effective_sample_size(samples):
+    chains = _split_chains(np.asarray(samples, dtype=float))
+    n, m, d = chains.shape
+    acov = _autocovariance(chains)
+    W = np.mean(acov[0] * n / (n - 1), axis=0)
+    B = n * np.var(np.mean(chains, axis=0), axis=0, ddof=1)
+    var_plus = (n - 1) / n * W + B / n
+    rho = 1 - (W - np.mean(acov, axis=1)) / var_plus
+
+    ess = np.empty(d)
+    for k in range(d):
+        pairs = rho[:-1:2, k] + rho[1::2, k]
+        positive = np.cumprod(pairs > 0).astype(bool)
+        pairs = np.minimum.accumulate(pairs[positive])
+        tau = -1 + 2 * np.sum(pairs)
+        ess[k] = m * n / max(tau, 1.0 / np.log10(m * n))
+    return ess
+
+
+def _sample_buffer(shape, memmap_path):
+    if memmap_path is None:
+        return np.empty(shape)
+    return np.lib.format.open_memmap(memmap_path, mode='w+', dtype=float, shape=shape)
+
+
+def _monitor(samples, filled, history):
+    history['n_samples'].append(filled)
+    history['rhat'].append(split_rhat(samples[:filled]))
+    history['ess'].append(effective_sample_size(samples[:filled]))
+
+
+def _finish_history(history):
+    return {key: np.array(value) for key, value in history.items()}
+
+
+def metropolis_chains(log_prob, initial_states, step_size, n_samples=10000, burn_in=1000,
+                      monitor_every=None, memmap_path=None, seed=None):
+    rng = np.random.default_rng(seed)
+    X = np.array(initial_states, dtype=float)
+    M, d = X.shape
+    L = np.asarray(log_prob(X), dtype=float)
+
+    samples = _sample_buffer((n_samples, M, d), memmap_path)
+    history = {'n_samples': [], 'rhat': [], 'ess': []}
+    n_accepted = np.zeros(M)
+
+    for i in range(n_samples + burn_in):
+        proposal = X + step_size * rng.normal(size=X.shape)
+        L_prop = np.asarray(log_prob(proposal), dtype=float)
+        accept = np.log(rng.random(M)) < L_prop - L
+        X[accept] = proposal[accept]
+        L[accept] = L_prop[accept]
+        n_accepted += accept
+
+        if i >= burn_in:
+            filled = i - burn_in + 1
+            samples[filled - 1] = X
+            if monitor_every and filled % monitor_every == 0 and filled >= 4:
+                _monitor(samples, filled, history)
+
+    acceptance_rate = n_accepted / (n_samples + burn_in)
+    return samples, acceptance_rate, _finish_history(history)
+
+
+def hamiltonian_monte_carlo_chains(log_prob, grad_log_prob, initial_states, step_size=0.01,
+                                   n_steps=10, n_samples=1000, burn_in=100, monitor_every=None,
+                                   memmap_path=None, seed=None):
+    rng = np.random.default_rng(seed)
+    Q = np.array(initial_states, dtype=float)
+    M, d = Q.shape
+    U = -np.asarray(log_prob(Q), dtype=float)
+    grad = np.asarray(grad_log_prob(Q), dtype=float)
+
+    samples = _sample_buffer((n_samples, M, d), memmap_path)
+    history = {'n_samples': [], 'rhat': [], 'ess': []}
+    n_accepted = np.zeros(M)
+
+    for i in range(n_samples + burn_in):
+        P0 = rng.normal(size=Q.shape)
+        q, g = Q.copy(), grad.copy()
+        p = P0 + 0.5 * step_size * g
+        for step in range(n_steps):
+            q += step_size * p
+            g = np.asarray(grad_log_prob(q), dtype=float)
+            if step < n_steps - 1:
+                p += step_size * g
+        p += 0.5 * step_size * g
+
+        U_prop = -np.asarray(log_prob(q), dtype=float)
+        log_alpha = U - U_prop + 0.5 * np.sum(P0**2, axis=1) - 0.5 * np.sum(p**2, axis=1)
+        accept = np.log(rng.random(M)) < log_alpha
+        Q[accept] = q[accept]
+        U[accept] = U_prop[accept]
+        grad[accept] = g[accept]
+        n_accepted += accept
+
+        if i >= burn_in:
+            filled = i - burn_in + 1
+            samples[filled - 1] = Q
+            if monitor_every and filled % monitor_every == 0 and filled >= 4:
+                _monitor(samples, filled, history)
+
+    acceptance_rate = n_accepted / (n_samples + burn_in)
+    return samples, acceptance_rate, _finish_history(history)
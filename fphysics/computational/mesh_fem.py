@@ -0,0 +1,195 @@
+import time
+import math
+import itertools
+import numpy as np
+from .finite_elements import assemble_sparse, solve_sparse, nodal_boundary_conditions
+from ..mechanics.continuum import constitutive_isotropic_2d, elasticity_tensor_2d
+from ..thermodynamics.heat_transfer import fourier_law_conduction
+
+
+def _permutations(point):
+    return sorted(set(itertools.permutations(point)))
+
+
+TRIANGLE_QUADRATURE = {
+    1: (np.array([[1/3, 1/3, 1/3]]), np.array([1.0])),
+    2: (np.array([[2/3, 1/6, 1/6], [1/6, 2/3, 1/6], [1/6, 1/6, 2/3]]), np.full(3, 1/3)),
+    3: (np.array([[1/3, 1/3, 1/3], [0.6, 0.2, 0.2], [0.2, 0.6, 0.2], [0.2, 0.2, 0.6]]),
+        np.array([-27/48, 25/48, 25/48, 25/48])),
+    4: (np.array(_permutations((0.445948490915965, 0.445948490915965, 0.108103018168070)) +
+                 _permutations((0.091576213509771, 0.091576213509771, 0.816847572980459))),
+        np.array([0.223381589678011] * 3 + [0.109951743655322] * 3)),
+}
+
+TETRAHEDRON_QUADRATURE = {
+    1: (np.array([[1/4, 1/4, 1/4, 1/4]]), np.array([1.0])),
+    2: (np.array(_permutations((0.5854101966249685, 0.1381966011250105,
+                                0.1381966011250105, 0.1381966011250105))), np.full(4, 1/4)),
+    3: (np.array([[1/4, 1/4, 1/4, 1/4]] +
+                 _permutations((1/2, 1/6, 1/6, 1/6))),
+        np.array([-4/5] + [9/20] * 4)),
+}
+
+
+def rectangle_mesh(nx, ny, lx=1.0, ly=1.0):
+    x, y = np.meshgrid(np.linspace(0, lx, nx + 1), np.linspace(0, ly, ny + 1), indexing='ij')
+    nodes = np.column_stack([x.ravel(), y.ravel()])
+
+    index = np.arange((nx + 1) * (ny + 1)).reshape(nx + 1, ny + 1)
+    n00, n10 = index[:-1, :-1].ravel(), index[1:, :-1].ravel()
+    n01, n11 = index[:-1, 1:].ravel(), index[1:, 1:].ravel()
+    elements = np.concatenate([np.column_stack([n00, n10, n11]),
+                               np.column_stack([n00, n11, n01])])
+    return nodes, elements
+
+
+def box_mesh(nx, ny, nz, lx=1.0, ly=1.0, lz=1.0):
+    grid = np.meshgrid(np.linspace(0, lx, nx + 1), np.linspace(0, ly, ny + 1),
+                       np.linspace(0, lz, nz + 1), indexing='ij')
+    nodes = np.column_stack([g.ravel() for g in grid])
+
+    index = np.arange(len(nodes)).reshape(nx + 1, ny + 1, nz + 1)
+    corner = {}
+    for i in (0, 1):
+        for j in (0, 1):
+            for k in (0, 1):
+                corner[i, j, k] = index[i:i + nx, j:j + ny, k:k + nz].ravel()
+
+    paths = [((1, 0, 0), (1, 1, 0)), ((1, 0, 0), (1, 0, 1)), ((0, 1, 0), (1, 1, 0)),
+             ((0, 1, 0), (0, 1, 1)), ((0, 0, 1), (1, 0, 1)), ((0, 0, 1), (0, 1, 1))]
+    elements = np.concatenate([
+        np.column_stack([corner[0, 0, 0], corner[a], corner[b], corner[1, 1, 1]])
+        for a, b in paths
+    ])
+    return nodes, elements
+
+
+def element_geometry(nodes, elements):
+    X = np.asarray(nodes, dtype=float)[elements]
+    dim = X.shape[2]
+    J = np.transpose(X[:, 1:] - X[:, :1], (0, 2, 1))
+    det = np.linalg.det(J)
+    reference_gradients = np.vstack([-np.ones(dim), np.eye(dim)])
+    gradients = np.einsum('kj,mji->mki', reference_gradients, np.linalg.inv(J))
+    volumes = np.abs(det) / math.factorial(dim)
+    return gradients, volumes
+
+
+def conduction_matrices(gradients, volumes, conductivity=1.0):
+    weight = volumes * np.broadcast_to(np.asarray(conductivity, dtype=float), volumes.shape)
+    return np.einsum('m,mai,mbi->mab', weight, gradients, gradients)
+
+
+def mass_matrices(volumes, dim, coefficient=1.0):
+    n = dim + 1
+    reference = (np.ones((n, n)) + np.eye(n)) / ((n) * (n + 1))
+    weight = volumes * np.broadcast_to(np.asarray(coefficient, dtype=float), volumes.shape)
+    return weight[:, None, None] * reference
+
+
+def load_vectors(nodes, elements, volumes, source, order=2):
+    nodes = np.asarray(nodes, dtype=float)
+    dim = nodes.shape[1]
+    if not callable(source):
+        return np.outer(volumes * source / (dim + 1), np.ones(dim + 1))
+
+    table = TRIANGLE_QUADRATURE if dim == 2 else TETRAHEDRON_QUADRATURE
+    bary, weights = table[order]
+    points = np.einsum('qa,mad->mqd', bary, nodes[elements])
+    values = np.asarray(source(points.reshape(-1, dim)), dtype=float).reshape(points.shape[:2])
+    return volumes[:, None] * np.einsum('mq,q,qa->ma', values, weights, bary)
+
+
+def steady_heat_conduction(nodes, elements, conductivity, heat_source, dirichlet, solver='direct'):
+    nodes = np.asarray(nodes, dtype=float)
+    elements = np.asarray(elements, dtype=int)
+    gradients, volumes = element_geometry(nodes, elements)
+
+    k, f = assemble_sparse(conduction_matrices(gradients, volumes, conductivity), elements,
+                           len(nodes), load_vectors(nodes, elements, volumes, heat_source))
+    return solve_sparse(k, f, dirichlet, solver)
+
+
+def element_heat_flux(nodes, elements, temperatures, conductivity):
+    gradients, _ = element_geometry(nodes, elements)
+    temperature_gradient = np.einsum('mki,mk->mi', gradients, np.asarray(temperatures)[elements])
+    k = np.broadcast_to(np.asarray(conductivity, dtype=float), len(elements))[:, None]
+    return fourier_law_conduction(k, 1.0, temperature_gradient)
+
+
+def constitutive_matrix_2d(elastic_modulus, poissons_ratio, plane='stress'):
+    if plane == 'stress':
+        return np.array(elasticity_tensor_2d(elastic_modulus, poissons_ratio), dtype=float)
+    if plane == 'strain':
+        unit_strains = [[[1, 0], [0, 0]], [[0, 0], [0, 1]], [[0, 0.5], [0.5, 0]]]
+        columns = []
+        for strain in unit_strains:
+            sigma = constitutive_isotropic_2d(strain, elastic_modulus, poissons_ratio)
+            columns.append([sigma[0][0], sigma[1][1], sigma[0][1]])
+        return np.array(columns, dtype=float).T
+    raise ValueError("plane must be 'stress' or 'strain'")
+
+
+def strain_displacement_matrices(gradients):
+    m, k, _ = gradients.shape
+    B = np.zeros((m, 3, 2 * k))
+    B[:, 0, 0::2] = gradients[:, :, 0]
+    B[:, 1, 1::2] = gradients[:, :, 1]
+    B[:, 2, 0::2] = gradients[:, :, 1]
+    B[:, 2, 1::2] = gradients[:, :, 0]
+    return B
+
+
+def elasticity_2d(nodes, elements, elastic_modulus, poissons_ratio, body_force=(0.0, 0.0),
+                  point_forces=None, dirichlet=None, thickness=1.0, plane='stress',
+                  solver='direct'):
+    nodes = np.asarray(nodes, dtype=float)
+    elements = np.asarray(elements, dtype=int)
+    gradients, volumes = element_geometry(nodes, elements)
+    B = strain_displacement_matrices(gradients)
+    D = constitutive_matrix_2d(elastic_modulus, poissons_ratio, plane)
+
+    k_local = np.einsum('m,mia,ij,mjb->mab', thickness * volumes, B, D, B)
+    dofs = np.repeat(2 * elements, 2, axis=1) + np.tile([0, 1], elements.shape[1])
+    f_local = np.outer(thickness * volumes / 3, np.tile(body_force, 3))
+
+    k, f = assemble_sparse(k_local, dofs, 2 * len(nodes), f_local)
+    for node, force in (point_forces or {}).items():
+        f[2*node:2*node+2] += force
+
+    dof_conditions = nodal_boundary_conditions(dirichlet or {})
+    return solve_sparse(k, f, dof_conditions, solver).reshape(-1, 2)
+
+
+def element_stresses_2d(nodes, elements, displacements, elastic_modulus, poissons_ratio,
+                        plane='stress'):
+    gradients, _ = element_geometry(nodes, elements)
+    B = strain_displacement_matrices(gradients)
+    u = np.asarray(displacements).reshape(-1, 2)[elements].reshape(len(elements), -1)
+    strain = np.einsum('mia,ma->mi', B, u)
+    D = constitutive_matrix_2d(elastic_modulus, poissons_ratio, plane)
+    return strain, strain @ D.T
+
+
+def benchmark_mesh_fem(sizes=(16, 32, 64, 128, 256)):
+    results = {}
+    for n in sizes:
+        nodes, elements = rectangle_mesh(n, n)
+        start = time.perf_counter()
+        gradients, volumes = element_geometry(nodes, elements)
+        k_local = conduction_matrices(gradients, volumes)
+        kernel_time = time.perf_counter() - start
+
+        k, f = assemble_sparse(k_local, elements, len(nodes),
+                               load_vectors(nodes, elements, volumes, 1.0))
+        assembly_time = time.perf_counter() - start - kernel_time
+
+        boundary = np.flatnonzero((nodes[:, 0] == 0) | (nodes[:, 0] == 1) |
+                                  (nodes[:, 1] == 0) | (nodes[:, 1] == 1))
+        solve_sparse(k, f, {node: 0.0 for node in boundary})
+        results[len(elements)] = {
+            'kernels': kernel_time,
+            'assembly': assembly_time,
+            'solve': time.perf_counter() - start - kernel_time - assembly_time,
+        }
+    return results
@@ -0,0 +1,215 @@
+import time
+import numpy as np
+from ..constants import GRAVITATIONAL_CONSTANT
+from ..astrophysics.planetary import hill_sphere_radius
+from .barnes_hut import barnes_hut_accelerations
+
+
+_YOSHIDA_W1 = 1 / (2 - 2**(1/3))
+_YOSHIDA_W0 = -2**(1/3) * _YOSHIDA_W1
+_YOSHIDA_DRIFTS = np.array([_YOSHIDA_W1 / 2, (_YOSHIDA_W0 + _YOSHIDA_W1) / 2,
+                            (_YOSHIDA_W0 + _YOSHIDA_W1) / 2, _YOSHIDA_W1 / 2])
+_YOSHIDA_KICKS = np.array([_YOSHIDA_W1, _YOSHIDA_W0, _YOSHIDA_W1])
+
+
+def pairwise_accelerations(positions, masses, softening=0.0, G=GRAVITATIONAL_CONSTANT,
+                           chunk_size=None):
+    positions = np.asarray(positions, dtype=float)
+    masses = np.asarray(masses, dtype=float)
+    n = len(positions)
+    if chunk_size is None:
+        chunk_size = max(1, 2**22 // max(n, 1))
+
+    acc = np.empty_like(positions)
+    eps2 = softening**2
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        dx = positions[None, :, :] - positions[start:stop, None, :]
+        r2 = np.einsum('ijk,ijk->ij', dx, dx) + eps2
+        with np.errstate(divide='ignore'):
+            inv_r3 = r2**-1.5
+        inv_r3[r2 == 0] = 0.0
+        inv_r3[np.arange(stop - start), np.arange(start, stop)] = 0.0
+        acc[start:stop] = G * np.einsum('ij,ijk->ik', inv_r3 * masses, dx)
+    return acc
+
+
+def nbody_potential_energy(positions, masses, softening=0.0, G=GRAVITATIONAL_CONSTANT):
+    positions = np.asarray(positions, dtype=float)
+    masses = np.asarray(masses, dtype=float)
+    i, j = np.triu_indices(len(positions), k=1)
+    r = np.sqrt(np.sum((positions[i] - positions[j])**2, axis=1) + softening**2)
+    return -G * np.sum(masses[i] * masses[j] / r)
+
+
+def nbody_kinetic_energy(velocities, masses):
+    return 0.5 * np.sum(np.asarray(masses) * np.sum(np.asarray(velocities)**2, axis=1))
+
+
+def nbody_total_energy(positions, velocities, masses, softening=0.0, G=GRAVITATIONAL_CONSTANT):
+    return (nbody_kinetic_energy(velocities, masses) +
+            nbody_potential_energy(positions, masses, softening, G))
+
+
+def orbital_diagnostics(positions, velocities, masses, central=0, G=GRAVITATIONAL_CONSTANT):
+    positions = np.asarray(positions, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+    masses = np.asarray(masses, dtype=float)
+    others = np.arange(len(masses)) != central
+
+    r_vec = positions[others] - positions[central]
+    v_vec = velocities[others] - velocities[central]
+    r = np.linalg.norm(r_vec, axis=1)
+    v2 = np.sum(v_vec**2, axis=1)
+    mu = G * (masses[central] + masses[others])
+    semi_major_axis = 1 / (2 / r - v2 / mu)
+
+    return {
+        'semi_major_axis': semi_major_axis,
+        'orbital_energy': -G * masses[others] * masses[central] / (2 * semi_major_axis),
+        'hill_radius': hill_sphere_radius(masses[central], masses[others], semi_major_axis),
+    }
+
+
+def _kepler_drift(Q, V, mu, dt, tol=1e-14, max_iter=50):
+    r0 = np.linalg.norm(Q, axis=1)
+    u = np.sum(Q * V, axis=1)
+    v2 = np.sum(V**2, axis=1)
+    inv_a = 2 / r0 - v2 / mu
+    if np.any(inv_a <= 0):
+        raise ValueError("Wisdom-Holman drift requires bound heliocentric orbits")
+
+    a = 1 / inv_a
+    n = np.sqrt(mu * inv_a**3)
+    ec = 1 - r0 * inv_a
+    es = u / (n * a**2)
+    M = n * dt
+
+    x = M.copy()
+    for _ in range(max_iter):
+        sx, cx = np.sin(x), np.cos(x)
+        fx = x - ec * sx + es * (1 - cx) - M
+        dx = fx / (1 - ec * cx + es * sx)
+        x -= dx
+        if np.all(np.abs(dx) < tol):
+            break
+
+    sx, cx = np.sin(x), np.cos(x)
+    r = a * (1 - ec * cx + es * sx)
+    f = 1 + a / r0 * (cx - 1)
+    g = dt + (sx - x) / n
+    fdot = -a**2 * n * sx / (r * r0)
+    gdot = 1 + a / r * (cx - 1)
+
+    Q_new = f[:, None] * Q + g[:, None] * V
+    V_new = fdot[:, None] * Q + gdot[:, None] * V
+    return Q_new, V_new
+
+
+def _save_slot(step, n_steps, save_every):
+    # every save_every-th step plus the final step, even when it is not a multiple
+    if step % save_every == 0 or step == n_steps:
+        return -(-step // save_every)
+    return None
+
+
+def _wisdom_holman(x, v, masses, dt, n_steps, save_every, softening, G, X_out, V_out):
+    m0, m = masses[0], masses[1:]
+    total_mass = np.sum(masses)
+    x_cm = np.sum(masses[:, None] * x, axis=0) / total_mass
+    v_cm = np.sum(masses[:, None] * v, axis=0) / total_mass
+
+    Q = x[1:] - x[0]
+    V = v[1:] - v_cm
+    mu = G * m0
+
+    def to_inertial(x_cm, Q, V):
+        x0 = x_cm - np.sum(m[:, None] * Q, axis=0) / total_mass
+        v0 = v_cm - np.sum(m[:, None] * V, axis=0) / m0
+        return np.vstack([x0, Q + x0]), np.vstack([v0, V + v_cm])
+
+    def kick(V, Q, h):
+        if len(m) > 1:
+            V += h * pairwise_accelerations(Q, m, softening, G)
+
+    def sun_drift(Q, V, h):
+        Q += h * np.sum(m[:, None] * V, axis=0) / m0
+
+    for step in range(1, n_steps + 1):
+        kick(V, Q, dt / 2)
+        sun_drift(Q, V, dt / 2)
+        Q, V = _kepler_drift(Q, V, mu, dt)
+        sun_drift(Q, V, dt / 2)
+        kick(V, Q, dt / 2)
+        x_cm = x_cm + v_cm * dt
+
+        slot = _save_slot(step, n_steps, save_every)
+        if slot is not None:
+            X_out[slot], V_out[slot] = to_inertial(x_cm, Q, V)
+
+
+def integrate_nbody(positions, velocities, masses, dt, n_steps, method='leapfrog',
+                    softening=0.0, save_every=1, acceleration=None, theta=None,
+                    G=GRAVITATIONAL_CONSTANT):
+    x = np.array(positions, dtype=float)
+    v = np.array(velocities, dtype=float)
+    masses = np.asarray(masses, dtype=float)
+
+    if method == 'wisdom_holman' and (acceleration is not None or theta is not None):
+        raise ValueError("wisdom_holman uses its own Kepler drift and direct interactions; "
+                         "acceleration and theta are not supported")
+
+    if acceleration is None and theta is not None:
+        def acceleration(pos):
+            return barnes_hut_accelerations(pos, masses, theta, softening, G)
+    elif acceleration is None:
+        def acceleration(pos):
+            return pairwise_accelerations(pos, masses, softening, G)
+
+    times = np.append(np.arange(0, n_steps, save_every), n_steps) * dt
+    n_saved = len(times)
+    X_out = np.empty((n_saved,) + x.shape)
+    V_out = np.empty((n_saved,) + v.shape)
+    X_out[0], V_out[0] = x, v
+
+    if method == 'wisdom_holman':
+        _wisdom_holman(x, v, masses, dt, n_steps, save_every, softening, G, X_out, V_out)
+        return times, X_out, V_out
+
+    if method == 'leapfrog':
+        a = acceleration(x)
+        for step in range(1, n_steps + 1):
+            v += 0.5 * dt * a
+            x += dt * v
+            a = acceleration(x)
+            v += 0.5 * dt * a
+            slot = _save_slot(step, n_steps, save_every)
+            if slot is not None:
+                X_out[slot], V_out[slot] = x, v
+    elif method == 'yoshida4':
+        for step in range(1, n_steps + 1):
+            for c, d in zip(_YOSHIDA_DRIFTS[:3], _YOSHIDA_KICKS):
+                x += c * dt * v
+                v += d * dt * acceleration(x)
+            x += _YOSHIDA_DRIFTS[3] * dt * v
+            slot = _save_slot(step, n_steps, save_every)
+            if slot is not None:
+                X_out[slot], V_out[slot] = x, v
+    else:
+        raise ValueError("method must be 'leapfrog', 'yoshida4' or 'wisdom_holman'")
+
+    return times, X_out, V_out
+
+
+def benchmark_nbody(n_bodies=(10, 100, 1000, 5000), n_steps=5, method='leapfrog'):
+    results = {}
+    for n in n_bodies:
+        positions = np.random.normal(size=(n, 3))
+        velocities = np.random.normal(scale=0.1, size=(n, 3))
+        masses = np.full(n, 1.0 / n)
+
+        start = time.perf_counter()
+        integrate_nbody(positions, velocities, masses, 1e-3, n_steps, method=method,
+                        softening=1e-2, save_every=n_steps, G=1.0)
+        results[n] = (time.perf_counter() - start) / n_steps
+    return results
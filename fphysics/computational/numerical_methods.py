@@ -151,15 +151,14 @@ def poisson_2d_jacobi(f, boundary, dx, dy, tol=1e-6, max_iter=10000):
     u[:, 0] = boundary['left']
     u[:, -1] = boundary['right']
     
+    u_new = u.copy()
     for iteration in range(max_iter):
-        u_new = u.copy()
-        for i in range(1, nx-1):
-            for j in range(1, ny-1):
-                u_new[i, j] = 0.25 * (u[i+1, j] + u[i-1, j] + u[i, j+1] + u[i, j-1] - dx*dy*f[i, j])
+        u_new[1:-1, 1:-1] = 0.25 * (u[2:, 1:-1] + u[:-2, 1:-1] + u[1:-1, 2:] + u[1:-1, :-2]
+                                    - dx*dy*f[1:-1, 1:-1])
         
         if np.max(np.abs(u_new - u)) < tol:
             return u_new
-        u = u_new
+        u, u_new = u_new, u
     
     return u
 
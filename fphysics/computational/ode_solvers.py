@@ -0,0 +1,321 @@
+import time
+import numpy as np
+
+
+def batch_rhs(f, *args):
+    # Lifts a single-trajectory system such as lorenz_system(t, y, ...) that
+    # unpacks y into components onto an (n_trajectories, dim) state array.
+    def rhs(t, Y):
+        return np.stack(np.broadcast_arrays(*f(t, Y.T, *args)), axis=1)
+    return rhs
+
+
+def _time_grid(t_span, h):
+    t_start, t_end = t_span
+    return np.arange(t_start, t_end + h, h)
+
+
+def _batch_state(y0):
+    return np.atleast_2d(np.array(y0, dtype=float))
+
+
+def _output_buffers(t, Y, save_every):
+    # every save_every-th step plus the final step, even when it is not a multiple
+    n_saved = -(-(len(t) - 1) // save_every) + 1
+    t_out = np.append(t[:-1:save_every], t[-1])[:n_saved]
+    Y_out = np.empty((n_saved,) + Y.shape)
+    Y_out[0] = Y
+    return t_out, Y_out
+
+
+def _save_slot(step, n_steps, save_every):
+    if step % save_every == 0 or step == n_steps:
+        return -(-step // save_every)
+    return None
+
+
+def euler_batch(f, y0, t_span, h, save_every=1):
+    t = _time_grid(t_span, h)
+    Y = _batch_state(y0)
+    t_out, Y_out = _output_buffers(t, Y, save_every)
+
+    for i in range(len(t) - 1):
+        Y = Y + h * f(t[i], Y)
+        slot = _save_slot(i + 1, len(t) - 1, save_every)
+        if slot is not None:
+            Y_out[slot] = Y
+
+    return t_out, Y_out
+
+
+def rk4_batch(f, y0, t_span, h, save_every=1):
+    t = _time_grid(t_span, h)
+    Y = _batch_state(y0)
+    t_out, Y_out = _output_buffers(t, Y, save_every)
+    half_h = h / 2
+
+    for i in range(len(t) - 1):
+        k1 = f(t[i], Y)
+        k2 = f(t[i] + half_h, Y + half_h * k1)
+        k3 = f(t[i] + half_h, Y + half_h * k2)
+        k4 = f(t[i] + h, Y + h * k3)
+        Y = Y + (h / 6) * (k1 + 2*k2 + 2*k3 + k4)
+        slot = _save_slot(i + 1, len(t) - 1, save_every)
+        if slot is not None:
+            Y_out[slot] = Y
+
+    return t_out, Y_out
+
+
+_DOPRI_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+_DOPRI_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+]
+_DOPRI_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+_DOPRI_E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+_DOPRI_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+
+def _rms(x):
+    return np.sqrt(np.mean(x**2, axis=-1))
+
+
+def _initial_step(f, t, Y, F, rtol, atol):
+    scale = atol + np.abs(Y) * rtol
+    d0 = _rms(Y / scale)
+    d1 = _rms(F / scale)
+    h0 = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / np.maximum(d1, 1e-300))
+    F1 = f(t + h0, Y + h0[:, None] * F)
+    d2 = _rms((F1 - F) / scale) / h0
+    h1 = np.where(np.maximum(d1, d2) <= 1e-15, np.maximum(1e-6, h0 * 1e-3),
+                  (0.01 / np.maximum(np.maximum(d1, d2), 1e-300))**(1/5))
+    return np.minimum(100 * h0, h1)
+
+
+def dopri5_step(f, t, Y, F, h):
+    K = np.empty((7,) + Y.shape)
+    K[0] = F
+    hc = h[:, None]
+    for s in range(1, 6):
+        dY = sum(a * K[j] for j, a in enumerate(_DOPRI_A[s]))
+        K[s] = f(t + _DOPRI_C[s] * h, Y + hc * dY)
+    Y_new = Y + hc * np.tensordot(_DOPRI_B, K[:6], axes=1)
+    K[6] = f(t + h, Y_new)
+    error = hc * np.tensordot(_DOPRI_E, K, axes=1)
+    return Y_new, K, error
+
+
+def _dopri_dense(Y, K, h, x):
+    Q = np.einsum('smd,sp->mdp', K, _DOPRI_P)
+    powers = np.cumprod(np.repeat(np.atleast_1d(x)[:, None], 4, axis=1), axis=1)
+    return Y + h[:, None] * np.einsum('mdp,mp->md', Q, powers)
+
+
+def _locate_events(g, t, Y, K, h, x_lo, x_hi, g_lo, iterations=50):
+    for _ in range(iterations):
+        x_mid = 0.5 * (x_lo + x_hi)
+        g_mid = g(t + x_mid * h, _dopri_dense(Y, K, h, x_mid))
+        same = np.sign(g_mid) == np.sign(g_lo)
+        x_lo = np.where(same, x_mid, x_lo)
+        g_lo = np.where(same, g_mid, g_lo)
+        x_hi = np.where(same, x_hi, x_mid)
+    return x_hi
+
+
+def dopri5_batch(f, y0, t_span, t_eval=None, rtol=1e-6, atol=1e-9, events=None,
+                 h0=None, max_step=np.inf, max_steps=100000):
+    t_start, t_end = t_span
+    if t_end <= t_start:
+        raise ValueError("t_span must be increasing")
+
+    Y = _batch_state(y0)
+    n, dim = Y.shape
+    t_eval = np.array([t_start, t_end] if t_eval is None else t_eval, dtype=float)
+    events = [] if events is None else ([events] if callable(events) else list(events))
+
+    Y_eval = np.full((len(t_eval), n, dim), np.nan)
+    at_start = t_eval == t_start
+    Y_eval[at_start] = Y
+
+    t = np.full(n, float(t_start))
+    F = f(t, Y)
+    if h0 is None:
+        h = _initial_step(f, t, Y, F, rtol, atol)
+    else:
+        h = np.full(n, float(h0))
+    h = np.minimum(h, max_step)
+
+    G = [g(t, Y) for g in events]
+    event_records = [([], [], []) for _ in events]
+
+    status = np.zeros(n, dtype=int)
+    n_steps = np.zeros(n, dtype=int)
+    n_rejected = np.zeros(n, dtype=int)
+    rejected_last = np.zeros(n, dtype=bool)
+    active = np.ones(n, dtype=bool)
+
+    while np.any(active):
+        # rejected attempts count too, otherwise a blow-up that rejects every step never stops
+        exhausted = active & (n_steps + n_rejected >= max_steps)
+        status[exhausted] = -1
+        active &= ~exhausted
+        if not np.any(active):
+            break
+
+        idx = np.nonzero(active)[0]
+        t_a, Y_a, F_a = t[idx], Y[idx], F[idx]
+        last = h[idx] >= t_end - t_a
+        h_a = np.where(last, t_end - t_a, h[idx])
+
+        with np.errstate(over='ignore', invalid='ignore'):
+            Y_new, K, error = dopri5_step(f, t_a, Y_a, F_a, h_a)
+            scale = atol + np.maximum(np.abs(Y_a), np.abs(Y_new)) * rtol
+            error_norm = _rms(error / scale)
+
+        # step size underflow or a non-finite error norm means the solution has blown up
+        failed = ~np.isfinite(error_norm) | (h_a < 16 * np.finfo(float).eps * np.abs(t_a))
+        status[idx[failed]] = -1
+        active[idx[failed]] = False
+
+        accept = (error_norm < 1) & ~failed
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor = np.clip(0.9 * error_norm**(-1/5), 0.2, 10)
+        factor = np.where(accept & rejected_last[idx], np.minimum(factor, 1), factor)
+        h[idx] = np.where(failed, h_a, np.minimum(h_a * factor, max_step))
+        rejected_last[idx] = ~accept
+        n_rejected[idx[~accept & ~failed]] += 1
+
+        acc = np.nonzero(accept)[0]
+        if len(acc) == 0:
+            continue
+
+        j = idx[acc]
+        t_old, Y_old, K_acc, h_acc = t_a[acc], Y_a[acc], K[:, acc], h_a[acc]
+        t_new = np.where(last[acc], t_end, t_old + h_acc)
+        Y_acc = Y_new[acc]
+        t_stop = t_new.copy()
+        terminated = np.zeros(len(acc), dtype=bool)
+
+        for k, g in enumerate(events):
+            g_old = G[k][j]
+            g_new = g(t_new, Y_acc)
+            direction = getattr(g, 'direction', 0)
+            up = (g_old < 0) & (g_new >= 0)
+            down = (g_old > 0) & (g_new <= 0)
+            crossed = (up & (direction >= 0)) | (down & (direction <= 0))
+            G[k][j] = g_new
+
+            c = np.nonzero(crossed)[0]
+            if len(c) == 0:
+                continue
+            x_root = _locate_events(g, t_old[c], Y_old[c], K_acc[:, c], h_acc[c],
+                                    np.zeros(len(c)), np.ones(len(c)), g_old[c])
+            t_root = t_old[c] + x_root * h_acc[c]
+            Y_root = _dopri_dense(Y_old[c], K_acc[:, c], h_acc[c], x_root)
+            event_records[k][0].append(t_root)
+            event_records[k][1].append(j[c])
+            event_records[k][2].append(Y_root)
+
+            if getattr(g, 'terminal', False):
+                earlier = t_root < t_stop[c]
+                t_stop[c[earlier]] = t_root[earlier]
+                Y_acc[c[earlier]] = Y_root[earlier]
+                terminated[c] = True
+
+        lo = np.searchsorted(t_eval, t_old, side='right')
+        hi = np.searchsorted(t_eval, t_stop, side='right')
+        for offset in range(int(np.max(hi - lo, initial=0))):
+            m = np.nonzero(lo + offset < hi)[0]
+            i_eval = lo[m] + offset
+            x = (t_eval[i_eval] - t_old[m]) / h_acc[m]
+            Y_eval[i_eval, j[m]] = _dopri_dense(Y_old[m], K_acc[:, m], h_acc[m], x)
+
+        t[j] = t_stop
+        Y[j] = Y_acc
+        F[j] = K_acc[6]
+        n_steps[j] += 1
+
+        finished = terminated | (t_stop >= t_end)
+        status[j[terminated]] = 1
+        active[j[finished]] = False
+
+    info = {
+        'status': status,
+        'n_steps': n_steps,
+        'n_rejected': n_rejected,
+        't_final': t,
+        'y_final': Y,
+        't_events': [np.concatenate(r[0]) if r[0] else np.empty(0) for r in event_records],
+        'i_events': [np.concatenate(r[1]) if r[1] else np.empty(0, dtype=int) for r in event_records],
+        'y_events': [np.concatenate(r[2]) if r[2] else np.empty((0, dim)) for r in event_records],
+    }
+    return t_eval, Y_eval, info
+
+
+def benchmark_batch_integrators(n_trajectories=1000, t_span=(0, 1), h=1e-3, save_every=10):
+    from .numerical_methods import rk4
+    from ..mathematical.differential_equations import lorenz_system
+
+    params = (10.0, 28.0, 8.0 / 3.0)
+    y0 = np.random.uniform(-10, 10, size=(n_trajectories, 3))
+
+    def single(t, y):
+        return np.array(lorenz_system(t, y, *params))
+
+    start = time.perf_counter()
+    for y in y0:
+        rk4(single, y, t_span, h)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rk4_batch(batch_rhs(lorenz_system, *params), y0, t_span, h, save_every)
+    batch_time = time.perf_counter() - start
+
+    return {
+        'n_trajectories': n_trajectories,
+        'loop_time': loop_time,
+        'batch_time': batch_time,
+        'speedup': loop_time / batch_time,
+    }
+
+
+def benchmark_adaptive_integrators(n_trajectories=200, t_span=(0, 20), rtol=1e-6, atol=1e-9):
+    from .numerical_methods import rk45_adaptive
+    from ..mathematical.differential_equations import van_der_pol_oscillator
+
+    mu = 2.0
+    y0 = np.random.uniform(-2, 2, size=(n_trajectories, 2))
+
+    def single(t, y):
+        return van_der_pol_oscillator(t, y, mu)
+
+    start = time.perf_counter()
+    for y in y0:
+        rk45_adaptive(single, y, t_span, rtol, atol)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, _, info = dopri5_batch(batch_rhs(van_der_pol_oscillator, mu), y0, t_span,
+                              rtol=rtol, atol=atol)
+    batch_time = time.perf_counter() - start
+
+    return {
+        'n_trajectories': n_trajectories,
+        'loop_time': loop_time,
+        'batch_time': batch_time,
+        'speedup': loop_time / batch_time,
+        'mean_steps': np.mean(info['n_steps']),
+    }
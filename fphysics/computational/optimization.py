@@ -1,5 +1,8 @@
+import time
+from functools import partial
 import numpy as np
 from scipy.optimize import minimize
+from .batch_evaluation import batch_evaluator
 
 
 def gradient_descent(f, grad_f, x0, learning_rate=0.01, tol=1e-6, max_iter=10000):
@@ -93,33 +96,43 @@ def adam_optimizer(f, grad_f, x0, learning_rate=0.001, beta1=0.9, beta2=0.999,
     return x, history
 
 
-def conjugate_gradient(A, b, x0=None, tol=1e-6, max_iter=None):
+def conjugate_gradient(A, b, x0=None, tol=1e-6, max_iter=None, preconditioner=None):
     n = len(b)
     if x0 is None:
         x = np.zeros(n)
     else:
-        x = x0.copy()
+        x = np.array(x0, dtype=float)
     
     if max_iter is None:
         max_iter = n
     
-    r = b - A @ x
-    p = r.copy()
-    rsold = r @ r
+    matvec = A if callable(A) else (lambda v: A @ v)
+    if preconditioner is None:
+        precondition = lambda v: v
+    elif callable(preconditioner):
+        precondition = preconditioner
+    else:
+        precondition = lambda v: preconditioner @ v
+    
+    r = b - matvec(x)
+    z = precondition(r)
+    p = z.copy()
+    rzold = r @ z
     
     for i in range(max_iter):
-        Ap = A @ p
-        alpha = rsold / (p @ Ap)
+        if np.sqrt(r @ r) < tol:
+            break
+        
+        Ap = matvec(p)
+        alpha = rzold / (p @ Ap)
         x = x + alpha * p
         r = r - alpha * Ap
-        rsnew = r @ r
-        
-        if np.sqrt(rsnew) < tol:
-            break
+        z = precondition(r)
+        rznew = r @ z
         
-        beta = rsnew / rsold
-        p = r + beta * p
-        rsold = rsnew
+        beta = rznew / rzold
+        p = z + beta * p
+        rzold = rznew
     
     return x
 
@@ -207,49 +220,57 @@ def simulated_annealing(f, x0, neighbor_func, initial_temp=1000, cooling_rate=0.
     return best_x, best_f, history
 
 
+def _bounds_arrays(bounds):
+    bounds = np.asarray(bounds, dtype=float)
+    return bounds[:, 0], bounds[:, 1]
+
+
+def _distinct_indices(rng, n_rows, n_pop, k, exclude_self=False):
+    keys = rng.random((n_rows, n_pop))
+    if exclude_self:
+        keys[np.arange(n_rows), np.arange(n_rows)] = np.inf
+    return np.argpartition(keys, k - 1, axis=1)[:, :k]
+
+
 def genetic_algorithm(f, bounds, population_size=50, generations=1000, 
-                     mutation_rate=0.1, crossover_rate=0.8, elitism=0.1):
-    n_vars = len(bounds)
+                     mutation_rate=0.1, crossover_rate=0.8, elitism=0.1,
+                     vectorized=False, n_workers=None, chunksize=1, seed=None):
+    rng = np.random.default_rng(seed)
+    low, high = _bounds_arrays(bounds)
+    n_vars = len(low)
     n_elite = int(elitism * population_size)
+    n_children = population_size - n_elite
+    n_pairs = (n_children + 1) // 2
     
-    population = np.random.uniform(
-        low=[b[0] for b in bounds],
-        high=[b[1] for b in bounds],
-        size=(population_size, n_vars)
-    )
+    population = rng.uniform(low, high, size=(population_size, n_vars))
     
-    for generation in range(generations):
-        fitness = np.array([f(individual) for individual in population])
-        sorted_indices = np.argsort(fitness)
-        
-        elite = population[sorted_indices[:n_elite]]
-        
-        new_population = list(elite)
-        
-        while len(new_population) < population_size:
-            parent1_idx = tournament_selection(fitness, k=3)
-            parent2_idx = tournament_selection(fitness, k=3)
+    evaluate, executor = batch_evaluator(f, vectorized, n_workers, chunksize)
+    try:
+        fitness = evaluate(population)
+        for generation in range(generations):
+            order = np.argsort(fitness)
             
-            parent1 = population[parent1_idx]
-            parent2 = population[parent2_idx]
+            contestants = _distinct_indices(rng, 2 * n_pairs, population_size, min(3, population_size))
+            winners = contestants[np.arange(2 * n_pairs), np.argmin(fitness[contestants], axis=1)]
+            parent1, parent2 = population[winners[:n_pairs]], population[winners[n_pairs:]]
             
-            if np.random.rand() < crossover_rate:
-                child1, child2 = crossover(parent1, parent2)
-            else:
-                child1, child2 = parent1.copy(), parent2.copy()
+            alpha = np.where(rng.random(n_pairs) < crossover_rate, rng.random(n_pairs), 1.0)[:, None]
+            children = np.stack([alpha * parent1 + (1 - alpha) * parent2,
+                                 (1 - alpha) * parent1 + alpha * parent2], axis=1)
+            children = children.reshape(-1, n_vars)[:n_children]
             
-            if np.random.rand() < mutation_rate:
-                child1 = mutate(child1, bounds)
-            if np.random.rand() < mutation_rate:
-                child2 = mutate(child2, bounds)
+            genes = (rng.random((n_children, 1)) < mutation_rate) & (rng.random(children.shape) < 0.1)
+            noise = rng.normal(0, 0.1 * (high - low), size=children.shape)
+            children = np.clip(np.where(genes, children + noise, children), low, high)
             
-            new_population.extend([child1, child2])
-        
-        population = np.array(new_population[:population_size])
+            elite = order[:n_elite]
+            population = np.concatenate([population[elite], children])
+            fitness = np.concatenate([fitness[elite], evaluate(children)])
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
-    fitness = np.array([f(individual) for individual in population])
     best_idx = np.argmin(fitness)
-    
     return population[best_idx], fitness[best_idx]
 
 
@@ -277,85 +298,81 @@ def mutate(individual, bounds, mutation_strength=0.1):
 
 
 def particle_swarm_optimization(f, bounds, n_particles=30, max_iter=1000, 
-                               w=0.729, c1=1.494, c2=1.494):
-    n_vars = len(bounds)
-    
-    positions = np.random.uniform(
-        low=[b[0] for b in bounds],
-        high=[b[1] for b in bounds],
-        size=(n_particles, n_vars)
-    )
-    
-    velocities = np.random.uniform(-1, 1, size=(n_particles, n_vars))
-    
-    personal_best_positions = positions.copy()
-    personal_best_fitness = np.array([f(p) for p in positions])
-    
-    global_best_idx = np.argmin(personal_best_fitness)
-    global_best_position = personal_best_positions[global_best_idx].copy()
-    global_best_fitness = personal_best_fitness[global_best_idx]
-    
-    for iteration in range(max_iter):
-        for i in range(n_particles):
-            r1, r2 = np.random.rand(2)
-            
-            velocities[i] = (w * velocities[i] + 
-                           c1 * r1 * (personal_best_positions[i] - positions[i]) + 
-                           c2 * r2 * (global_best_position - positions[i]))
-            
-            positions[i] += velocities[i]
+                               w=0.729, c1=1.494, c2=1.494,
+                               vectorized=False, n_workers=None, chunksize=1, seed=None):
+    rng = np.random.default_rng(seed)
+    low, high = _bounds_arrays(bounds)
+    n_vars = len(low)
+    
+    positions = rng.uniform(low, high, size=(n_particles, n_vars))
+    velocities = rng.uniform(-1, 1, size=(n_particles, n_vars))
+    
+    evaluate, executor = batch_evaluator(f, vectorized, n_workers, chunksize)
+    try:
+        personal_best_positions = positions.copy()
+        personal_best_fitness = evaluate(positions)
+        
+        global_best_idx = np.argmin(personal_best_fitness)
+        global_best_position = personal_best_positions[global_best_idx].copy()
+        global_best_fitness = personal_best_fitness[global_best_idx]
+        
+        for iteration in range(max_iter):
+            r1, r2 = rng.random((2, n_particles, 1))
+            velocities = (w * velocities + 
+                          c1 * r1 * (personal_best_positions - positions) + 
+                          c2 * r2 * (global_best_position - positions))
+            positions = np.clip(positions + velocities, low, high)
             
-            for j in range(n_vars):
-                positions[i, j] = np.clip(positions[i, j], bounds[j][0], bounds[j][1])
+            fitness = evaluate(positions)
             
-            fitness = f(positions[i])
+            improved = fitness < personal_best_fitness
+            personal_best_positions[improved] = positions[improved]
+            personal_best_fitness[improved] = fitness[improved]
             
-            if fitness < personal_best_fitness[i]:
-                personal_best_positions[i] = positions[i].copy()
-                personal_best_fitness[i] = fitness
-                
-                if fitness < global_best_fitness:
-                    global_best_position = positions[i].copy()
-                    global_best_fitness = fitness
+            best = np.argmin(personal_best_fitness)
+            if personal_best_fitness[best] < global_best_fitness:
+                global_best_position = personal_best_positions[best].copy()
+                global_best_fitness = personal_best_fitness[best]
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     return global_best_position, global_best_fitness
 
 
 def differential_evolution(f, bounds, population_size=15, max_iter=1000, 
-                          F=0.5, CR=0.7):
-    n_vars = len(bounds)
-    
-    population = np.random.uniform(
-        low=[b[0] for b in bounds],
-        high=[b[1] for b in bounds],
-        size=(population_size, n_vars)
-    )
-    
-    fitness = np.array([f(individual) for individual in population])
-    
-    for generation in range(max_iter):
-        for i in range(population_size):
-            indices = list(range(population_size))
-            indices.remove(i)
-            a, b, c = np.random.choice(indices, 3, replace=False)
-            
-            mutant = population[a] + F * (population[b] - population[c])
-            
-            for j in range(n_vars):
-                mutant[j] = np.clip(mutant[j], bounds[j][0], bounds[j][1])
-            
-            trial = population[i].copy()
-            j_rand = np.random.randint(n_vars)
+                          F=0.5, CR=0.7, vectorized=False, n_workers=None, chunksize=1, seed=None):
+    if population_size < 4:
+        raise ValueError("differential_evolution needs population_size >= 4 to draw three "
+                         "distinct donors other than the target")
+    rng = np.random.default_rng(seed)
+    low, high = _bounds_arrays(bounds)
+    n_vars = len(low)
+    rows = np.arange(population_size)
+    
+    population = rng.uniform(low, high, size=(population_size, n_vars))
+    
+    evaluate, executor = batch_evaluator(f, vectorized, n_workers, chunksize)
+    try:
+        fitness = evaluate(population)
+        
+        for generation in range(max_iter):
+            a, b, c = _distinct_indices(rng, population_size, population_size, 3,
+                                        exclude_self=True).T
+            mutants = np.clip(population[a] + F * (population[b] - population[c]), low, high)
             
-            for j in range(n_vars):
-                if np.random.rand() < CR or j == j_rand:
-                    trial[j] = mutant[j]
+            cross = rng.random((population_size, n_vars)) < CR
+            cross[rows, rng.integers(n_vars, size=population_size)] = True
+            trials = np.where(cross, mutants, population)
             
-            trial_fitness = f(trial)
+            trial_fitness = evaluate(trials)
             
-            if trial_fitness < fitness[i]:
-                population[i] = trial
-                fitness[i] = trial_fitness
+            improved = trial_fitness < fitness
+            population[improved] = trials[improved]
+            fitness[improved] = trial_fitness[improved]
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     best_idx = np.argmin(fitness)
     return population[best_idx], fitness[best_idx]
@@ -406,3 +423,41 @@ def line_search(f, grad_f, x, p, alpha0=1.0, c1=1e-4, c2=0.9, max_iter=20):
         alpha *= 0.5
     
     return alpha
+
+
+def rastrigin(x):
+    x = np.asarray(x, dtype=float)
+    return 10 * x.shape[-1] + np.sum(x**2 - 10 * np.cos(2 * np.pi * x), axis=-1)
+
+
+def _delayed_rastrigin(x, delay):
+    time.sleep(delay)
+    return rastrigin(x)
+
+
+def benchmark_population_optimizers(n_vars=8, population_size=64, iterations=20, delay=1e-3,
+                                    n_workers=4, chunksize=4, seed=0):
+    bounds = [(-5.12, 5.12)] * n_vars
+    optimizers = {
+        'genetic_algorithm': lambda **kw: genetic_algorithm(
+            population_size=population_size, generations=iterations, **kw),
+        'particle_swarm_optimization': lambda **kw: particle_swarm_optimization(
+            n_particles=population_size, max_iter=iterations, **kw),
+        'differential_evolution': lambda **kw: differential_evolution(
+            population_size=population_size, max_iter=iterations, **kw),
+    }
+    costly = partial(_delayed_rastrigin, delay=delay)
+    modes = {
+        'per_individual': dict(f=costly),
+        'vectorized': dict(f=rastrigin, vectorized=True),
+        'pooled': dict(f=costly, n_workers=n_workers, chunksize=chunksize),
+    }
+
+    results = {}
+    for name, run in optimizers.items():
+        results[name] = {}
+        for mode, options in modes.items():
+            start = time.perf_counter()
+            _, best = run(bounds=bounds, seed=seed, **options)
+            results[name][mode] = {'time': time.perf_counter() - start, 'best': best}
+    return results
@@ -0,0 +1,160 @@
+import time
+import numpy as np
+from scipy.sparse import diags, identity
+from scipy.sparse.linalg import splu
+
+
+def _second_difference(n):
+    return diags([1.0, -2.0, 1.0], [-1, 0, 1], shape=(n, n), format='csc')
+
+
+def _factorize(n, coefficient):
+    return splu((identity(n, format='csc') - coefficient * _second_difference(n)).tocsc())
+
+
+def _lap_1d(u):
+    return u[2:] - 2 * u[1:-1] + u[:-2]
+
+
+def _boundary_vector(n, left, right):
+    b = np.zeros(n)
+    b[0] += left
+    b[-1] += right
+    return b
+
+
+def heat_1d_steps(alpha, L, T, nx, nt, initial_condition, boundary_conditions, theta=0.5,
+                  save_every=1):
+    dx = L / (nx - 1)
+    dt = T / nt
+    r = alpha * dt / dx**2
+    x = np.linspace(0, L, nx)
+    left, right = boundary_conditions
+
+    lu = _factorize(nx - 2, theta * r)
+    u = np.asarray(initial_condition(x), dtype=float)
+    yield 0.0, u
+
+    for n in range(nt):
+        t_new = (n + 1) * dt
+        g_new = (left(t_new), right(t_new))
+        rhs = u[1:-1] + (1 - theta) * r * _lap_1d(u) + theta * r * _boundary_vector(nx - 2, *g_new)
+        u = np.concatenate([[g_new[0]], lu.solve(rhs), [g_new[1]]])
+        if (n + 1) % save_every == 0 or n == nt - 1:
+            yield t_new, u
+
+
+def heat_equation_1d_implicit(alpha, L, T, nx, nt, initial_condition, boundary_conditions,
+                              theta=0.5, save_every=1):
+    t, u = zip(*heat_1d_steps(alpha, L, T, nx, nt, initial_condition, boundary_conditions,
+                              theta, save_every))
+    return np.linspace(0, L, nx), np.array(t), np.array(u)
+
+
+def wave_1d_steps(c, L, T, nx, nt, initial_position, initial_velocity, boundary_conditions,
+                  theta=0.25, save_every=1):
+    dx = L / (nx - 1)
+    dt = T / nt
+    r2 = (c * dt / dx)**2
+    x = np.linspace(0, L, nx)
+    left, right = boundary_conditions
+
+    lu = _factorize(nx - 2, theta * r2)
+    u_old = np.asarray(initial_position(x), dtype=float)
+    v = np.asarray(initial_velocity(x), dtype=float)
+    yield 0.0, u_old
+
+    g = (left(dt), right(dt))
+    rhs = (u_old[1:-1] + dt * v[1:-1] + 0.5 * (1 - 2 * theta) * r2 * _lap_1d(u_old)
+           - theta * r2 * dt * _lap_1d(v) + theta * r2 * _boundary_vector(nx - 2, *g))
+    u = np.concatenate([[g[0]], lu.solve(rhs), [g[1]]])
+    if save_every == 1 or nt == 1:
+        yield dt, u
+
+    for n in range(1, nt):
+        t_new = (n + 1) * dt
+        g = (left(t_new), right(t_new))
+        rhs = (2 * u[1:-1] - u_old[1:-1] + (1 - 2 * theta) * r2 * _lap_1d(u)
+               + theta * r2 * _lap_1d(u_old) + theta * r2 * _boundary_vector(nx - 2, *g))
+        u_old, u = u, np.concatenate([[g[0]], lu.solve(rhs), [g[1]]])
+        if (n + 1) % save_every == 0 or n == nt - 1:
+            yield t_new, u
+
+
+def wave_equation_1d_implicit(c, L, T, nx, nt, initial_position, initial_velocity,
+                              boundary_conditions, theta=0.25, save_every=1):
+    t, u = zip(*wave_1d_steps(c, L, T, nx, nt, initial_position, initial_velocity,
+                              boundary_conditions, theta, save_every))
+    return np.linspace(0, L, nx), np.array(t), np.array(u)
+
+
+def _axis_difference(u, axis):
+    index = [slice(1, -1)] * u.ndim
+    shifted = []
+    for offset in (1, 0, -1):
+        index[axis] = slice(1 + offset, u.shape[axis] - 1 + offset)
+        shifted.append(u[tuple(index)])
+    return shifted[0] - 2 * shifted[1] + shifted[2]
+
+
+def _solve_along(lu, rhs, axis):
+    moved = np.moveaxis(rhs, axis, 0)
+    solved = lu.solve(moved.reshape(moved.shape[0], -1)).reshape(moved.shape)
+    return np.moveaxis(solved, 0, axis)
+
+
+def heat_adi_steps(alpha, u0, spacing, dt, n_steps, save_every=1):
+    u = np.array(u0, dtype=float)
+    ndim = u.ndim
+    h = np.broadcast_to(np.asarray(spacing, dtype=float), (ndim,))
+    r = alpha * dt / h**2
+    interior = (slice(1, -1),) * ndim
+
+    factors = [_factorize(u.shape[a] - 2, 0.5 * r[a]) for a in range(ndim)]
+    frame = u.copy()
+    frame[interior] = 0.0
+    boundary_terms = [0.5 * r[a] * _axis_difference(frame, a) for a in range(ndim)]
+    yield 0.0, u
+
+    for n in range(n_steps):
+        explicit = [r[a] * _axis_difference(u, a) for a in range(ndim)]
+        v = _solve_along(factors[0], u[interior] + 0.5 * explicit[0] + sum(explicit[1:])
+                         + boundary_terms[0], 0)
+        for a in range(1, ndim):
+            v = _solve_along(factors[a], v - 0.5 * explicit[a] + boundary_terms[a], a)
+
+        u = frame.copy()
+        u[interior] = v
+        if (n + 1) % save_every == 0 or n == n_steps - 1:
+            yield (n + 1) * dt, u
+
+
+def heat_equation_adi(alpha, u0, spacing, dt, n_steps, save_every=1):
+    t, u = zip(*heat_adi_steps(alpha, u0, spacing, dt, n_steps, save_every))
+    return np.array(t), np.array(u)
+
+
+def benchmark_pde_steppers(nx=201, T=0.1, alpha=1.0, step_ratios=(1, 10, 100)):
+    from ..mathematical.differential_equations import heat_equation_1d
+
+    initial = lambda x: np.sin(np.pi * x)
+    boundary = (lambda t: 0.0, lambda t: 0.0)
+    x = np.linspace(0, 1, nx)
+    exact = np.exp(-alpha * np.pi**2 * T) * np.sin(np.pi * x)
+    nt_explicit = int(np.ceil(2 * alpha * T * (nx - 1)**2))
+
+    start = time.perf_counter()
+    _, u = heat_equation_1d(alpha, 1.0, T, nx, nt_explicit, initial, boundary)
+    results = {'explicit': {'steps': nt_explicit, 'time': time.perf_counter() - start,
+                            'error': np.max(np.abs(u[-1] - exact)), 'stored_bytes': u.nbytes}}
+
+    for ratio in step_ratios:
+        nt = max(nt_explicit // ratio, 1)
+        start = time.perf_counter()
+        for _, u_final in heat_1d_steps(alpha, 1.0, T, nx, nt, initial, boundary, save_every=nt):
+            pass
+        results['crank_nicolson_%dx' % ratio] = {
+            'steps': nt, 'time': time.perf_counter() - start,
+            'error': np.max(np.abs(u_final - exact)), 'stored_bytes': u_final.nbytes,
+        }
+    return results
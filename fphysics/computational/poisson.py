@@ -0,0 +1,180 @@
+import numpy as np
+from scipy import fft
+
+
+def _spacing(spacing, ndim):
+    return np.broadcast_to(np.asarray(spacing, dtype=float), (ndim,))
+
+
+def _shifted(u, axis, offset):
+    index = [slice(1, -1)] * u.ndim
+    index[axis] = slice(1 + offset, u.shape[axis] - 1 + offset)
+    return u[tuple(index)]
+
+
+def _interior(u):
+    return u[(slice(1, -1),) * u.ndim]
+
+
+def laplacian_interior(u, spacing):
+    h = _spacing(spacing, u.ndim)
+    return sum((_shifted(u, a, 1) - 2 * _interior(u) + _shifted(u, a, -1)) / h[a]**2
+               for a in range(u.ndim))
+
+
+def poisson_residual(u, f, spacing):
+    r = np.zeros_like(u)
+    r[(slice(1, -1),) * u.ndim] = _interior(f) - laplacian_interior(u, spacing)
+    return r
+
+
+def _color_masks(shape):
+    parity = sum(np.indices([n - 2 for n in shape])) % 2
+    return parity == 0, parity == 1
+
+
+def _red_black_sweep(u, f, h, masks, omega=1.0):
+    diagonal = np.sum(2 / h**2)
+    for mask in masks:
+        neighbors = sum((_shifted(u, a, 1) + _shifted(u, a, -1)) / h[a]**2 for a in range(u.ndim))
+        gauss_seidel = (neighbors - _interior(f)) / diagonal
+        interior = _interior(u)
+        interior[mask] += omega * (gauss_seidel[mask] - interior[mask])
+
+
+def poisson_sor(f, u0, spacing, omega=None, tol=1e-8, max_iter=10000):
+    f = np.asarray(f, dtype=float)
+    u = np.array(u0, dtype=float)
+    h = _spacing(spacing, u.ndim)
+    if omega is None:
+        omega = 2 / (1 + np.sin(np.pi / (max(u.shape) - 1)))
+
+    masks = _color_masks(u.shape)
+    f_norm = max(np.linalg.norm(_interior(f)), 1e-300)
+    history = []
+    for iteration in range(max_iter):
+        _red_black_sweep(u, f, h, masks, omega)
+        history.append(np.linalg.norm(poisson_residual(u, f, h)) / f_norm)
+        if history[-1] < tol:
+            break
+
+    return u, np.array(history)
+
+
+def _restrict(r):
+    for axis in range(r.ndim):
+        r = np.moveaxis(r, axis, 0)
+        coarse = np.zeros(((r.shape[0] - 1) // 2 + 1,) + r.shape[1:])
+        coarse[1:-1] = 0.25 * r[1:-2:2] + 0.5 * r[2:-1:2] + 0.25 * r[3::2]
+        r = np.moveaxis(coarse, 0, axis)
+    return r
+
+
+def _prolong(e):
+    for axis in range(e.ndim):
+        e = np.moveaxis(e, axis, 0)
+        fine = np.empty((2 * (e.shape[0] - 1) + 1,) + e.shape[1:])
+        fine[::2] = e
+        fine[1::2] = 0.5 * (e[:-1] + e[1:])
+        e = np.moveaxis(fine, 0, axis)
+    return e
+
+
+def _multigrid_levels(shape, min_size=3):
+    levels = 0
+    shape = np.array(shape)
+    while np.all((shape - 1) % 2 == 0) and np.all((shape - 1) // 2 + 1 >= min_size):
+        shape = (shape - 1) // 2 + 1
+        levels += 1
+    return levels
+
+
+def _multigrid_cycle(u, f, h, level, gamma, pre_smooth, post_smooth):
+    if level == 0:
+        # exact correction for the residual, so Dirichlet values already in u are honoured
+        _interior(u)[...] += _dirichlet_dst(_interior(f) - laplacian_interior(u, h), h)
+        return u
+
+    masks = _color_masks(u.shape)
+    for _ in range(pre_smooth):
+        _red_black_sweep(u, f, h, masks)
+
+    r_coarse = _restrict(poisson_residual(u, f, h))
+    e_coarse = np.zeros_like(r_coarse)
+    for _ in range(gamma):
+        e_coarse = _multigrid_cycle(e_coarse, r_coarse, 2 * h, level - 1, gamma,
+                                    pre_smooth, post_smooth)
+    u += _prolong(e_coarse)
+
+    for _ in range(post_smooth):
+        _red_black_sweep(u, f, h, masks)
+    return u
+
+
+def poisson_multigrid(f, u0, spacing, cycle='V', tol=1e-8, max_cycles=50,
+                      pre_smooth=2, post_smooth=2, levels=None):
+    f = np.asarray(f, dtype=float)
+    u = np.array(u0, dtype=float)
+    h = _spacing(spacing, u.ndim)
+    gamma = {'V': 1, 'W': 2}[cycle]
+    if levels is None:
+        levels = _multigrid_levels(u.shape)
+
+    f_norm = max(np.linalg.norm(_interior(f)), 1e-300)
+    history = []
+    for _ in range(max_cycles):
+        u = _multigrid_cycle(u, f, h, levels, gamma, pre_smooth, post_smooth)
+        history.append(np.linalg.norm(poisson_residual(u, f, h)) / f_norm)
+        if history[-1] < tol:
+            break
+
+    return u, np.array(history)
+
+
+def _symbol(n, h, bc):
+    if bc == 'periodic':
+        k = np.arange(n)
+        return (2 * np.cos(2 * np.pi * k / n) - 2) / h**2
+    if bc == 'dirichlet':
+        k = np.arange(1, n + 1)
+        return (2 * np.cos(np.pi * k / (n + 1)) - 2) / h**2
+    k = np.arange(n)
+    return (2 * np.cos(np.pi * k / (n - 1)) - 2) / h**2
+
+
+def _eigenvalues(shape, h, bc):
+    grids = np.meshgrid(*[_symbol(n, h[a], bc) for a, n in enumerate(shape)], indexing='ij')
+    return sum(grids)
+
+
+def _dirichlet_dst(f_interior, h):
+    lam = _eigenvalues(f_interior.shape, h, 'dirichlet')
+    return fft.idstn(fft.dstn(f_interior, type=1) / lam, type=1)
+
+
+def poisson_fft(f, spacing, bc='periodic', boundary=None):
+    f = np.asarray(f, dtype=float)
+    h = _spacing(spacing, f.ndim)
+
+    if bc == 'periodic':
+        lam = _eigenvalues(f.shape, h, 'periodic')
+        lam.flat[0] = 1.0
+        u_hat = fft.fftn(f) / lam
+        u_hat.flat[0] = 0.0
+        return np.real(fft.ifftn(u_hat))
+
+    if bc == 'neumann':
+        lam = _eigenvalues(f.shape, h, 'neumann')
+        lam.flat[0] = 1.0
+        u_hat = fft.dctn(f, type=1) / lam
+        u_hat.flat[0] = 0.0
+        return fft.idctn(u_hat, type=1)
+
+    if bc == 'dirichlet':
+        u = np.zeros_like(f) if boundary is None else np.array(boundary, dtype=float)
+        _interior(u)[...] = 0.0
+        rhs = _interior(f) - laplacian_interior(u, h)
+        _interior(u)[...] = _dirichlet_dst(rhs, h)
+        return u
+
+    raise ValueError("bc must be 'periodic', 'neumann' or 'dirichlet'")
@@ -0,0 +1,209 @@
+import time
+from functools import cached_property
+import numpy as np
+
+
+def symmetric_pairs(dim):
+    return np.triu_indices(dim)
+
+
+def antisymmetric_pairs(dim):
+    return np.triu_indices(dim, 1)
+
+
+def _grid_axes(coordinates):
+    return [k for k, axis in enumerate(coordinates) if axis is not None]
+
+
+def metric_derivatives(metric, coordinates, edge_order=2):
+    metric = np.asarray(metric, dtype=float)
+    dim = metric.shape[0]
+    grid_ndim = metric.ndim - 2
+    axes = _grid_axes(coordinates)
+    if len(axes) != grid_ndim:
+        raise ValueError("Need one coordinate axis per grid dimension and None elsewhere")
+
+    a, b = symmetric_pairs(dim)
+    packed = metric[a, b]
+    dg = np.zeros((dim, dim, dim) + metric.shape[2:])
+    if grid_ndim:
+        gradients = np.gradient(packed, *[coordinates[k] for k in axes],
+                                axis=tuple(range(1, grid_ndim + 1)), edge_order=edge_order)
+        if grid_ndim == 1:
+            gradients = [gradients]
+        for k, gradient in zip(axes, gradients):
+            dg[k, a, b] = gradient
+            dg[k, b, a] = gradient
+    return dg
+
+
+def inverse_metric(metric):
+    metric = np.asarray(metric, dtype=float)
+    moved = np.moveaxis(metric, (0, 1), (-2, -1))
+    return np.moveaxis(np.linalg.inv(moved), (-2, -1), (0, 1))
+
+
+def christoffel_from_derivatives(metric_inverse, dg):
+    first_kind = 0.5 * (np.einsum('bdc...->dbc...', dg) + np.einsum('cdb...->dbc...', dg) - dg)
+    return np.einsum('ad...,dbc...->abc...', metric_inverse, first_kind, optimize=True)
+
+
+def christoffel_symbols(metric, coordinates, metric_inverse=None, edge_order=2):
+    if metric_inverse is None:
+        metric_inverse = inverse_metric(metric)
+    return christoffel_from_derivatives(metric_inverse, metric_derivatives(metric, coordinates,
+                                                                           edge_order))
+
+
+def christoffel_derivatives(christoffel, coordinates, edge_order=2):
+    dim = christoffel.shape[0]
+    grid_ndim = christoffel.ndim - 3
+    axes = _grid_axes(coordinates)
+    b, c = symmetric_pairs(dim)
+    packed = christoffel[:, b, c]
+    dG = np.zeros((dim,) + christoffel.shape)
+    if grid_ndim:
+        gradients = np.gradient(packed, *[coordinates[k] for k in axes],
+                                axis=tuple(range(2, grid_ndim + 2)), edge_order=edge_order)
+        if grid_ndim == 1:
+            gradients = [gradients]
+        for k, gradient in zip(axes, gradients):
+            dG[k][:, b, c] = gradient
+            dG[k][:, c, b] = gradient
+    return dG
+
+
+def packed_riemann(christoffel, dG):
+    dim = christoffel.shape[0]
+    k, l = antisymmetric_pairs(dim)
+    derivative = np.moveaxis(dG[k, :, l, :], 0, 2) - np.moveaxis(dG[l, :, k, :], 0, 2)
+    quadratic = (np.einsum('apm...,mpb...->abp...', christoffel[:, k, :], christoffel[:, l, :],
+                           optimize=True)
+                 - np.einsum('apm...,mpb...->abp...', christoffel[:, l, :], christoffel[:, k, :],
+                             optimize=True))
+    return derivative + quadratic
+
+
+def unpack_riemann(packed):
+    dim = packed.shape[0]
+    k, l = antisymmetric_pairs(dim)
+    R = np.zeros((dim, dim, dim, dim) + packed.shape[3:])
+    R[:, :, k, l] = packed
+    R[:, :, l, k] = -packed
+    return R
+
+
+def _ricci_selector(dim):
+    k, l = antisymmetric_pairs(dim)
+    S = np.zeros((dim, len(k), dim))
+    S[k, np.arange(len(k)), l] = 1.0
+    S[l, np.arange(len(k)), k] = -1.0
+    return S
+
+
+def ricci_from_packed(packed):
+    return np.einsum('abp...,apd->bd...', packed, _ricci_selector(packed.shape[0]), optimize=True)
+
+
+class CurvatureGrid:
+    def __init__(self, metric, coordinates, edge_order=2):
+        self.metric = np.asarray(metric, dtype=float)
+        self.coordinates = list(coordinates)
+        self.dim = self.metric.shape[0]
+        self.edge_order = edge_order
+
+    @cached_property
+    def metric_inverse(self):
+        return inverse_metric(self.metric)
+
+    @cached_property
+    def metric_derivatives(self):
+        return metric_derivatives(self.metric, self.coordinates, self.edge_order)
+
+    @cached_property
+    def christoffel(self):
+        return christoffel_from_derivatives(self.metric_inverse, self.metric_derivatives)
+
+    @cached_property
+    def riemann_packed(self):
+        dG = christoffel_derivatives(self.christoffel, self.coordinates, self.edge_order)
+        return packed_riemann(self.christoffel, dG)
+
+    @property
+    def riemann(self):
+        return unpack_riemann(self.riemann_packed)
+
+    @cached_property
+    def ricci(self):
+        return ricci_from_packed(self.riemann_packed)
+
+    @cached_property
+    def ricci_scalar(self):
+        return np.einsum('ab...,ab...->...', self.metric_inverse, self.ricci)
+
+    @cached_property
+    def einstein(self):
+        return self.ricci - 0.5 * self.ricci_scalar * self.metric
+
+    @cached_property
+    def kretschmann(self):
+        R_up = self.riemann_packed
+        R_down = np.einsum('ae...,ebp...->abp...', self.metric, R_up, optimize=True)
+        k, l = antisymmetric_pairs(self.dim)
+        g_inv = self.metric_inverse
+        pair_inverse = (g_inv[k[:, None], k] * g_inv[l[:, None], l]
+                        - g_inv[k[:, None], l] * g_inv[l[:, None], k])
+        R_raised = np.einsum('ac...,bd...,pq...,cdq...->abp...', g_inv, g_inv, pair_inverse, R_down,
+                             optimize=True)
+        return 2 * np.einsum('abp...,abp...->...', R_down, R_raised)
+
+
+def _looped_christoffel(metric, metric_inverse, coordinates):
+    dim = metric.shape[0]
+    axes = _grid_axes(coordinates)
+
+    def derivative(f, k):
+        if coordinates[k] is None:
+            return np.zeros_like(f)
+        return np.gradient(f, coordinates[k], axis=axes.index(k), edge_order=2)
+
+    gamma = np.zeros((dim, dim, dim) + metric.shape[2:])
+    for i in range(dim):
+        for j in range(dim):
+            for k in range(dim):
+                for l in range(dim):
+                    gamma[i, j, k] += 0.5 * metric_inverse[i, l] * (
+                        derivative(metric[l, j], k) + derivative(metric[l, k], j)
+                        - derivative(metric[j, k], l))
+    return gamma
+
+
+def benchmark_curvature(grid_sizes=(16, 32, 64)):
+    results = {}
+    for n in grid_sizes:
+        r = np.linspace(3.0, 10.0, n)
+        theta = np.linspace(0.5, 2.5, n)
+        R, TH = np.meshgrid(r, theta, indexing='ij')
+        g = np.zeros((4, 4) + R.shape)
+        g[0, 0] = -(1 - 2 / R)
+        g[1, 1] = 1 / (1 - 2 / R)
+        g[2, 2] = R**2
+        g[3, 3] = (R * np.sin(TH))**2
+        coordinates = [None, r, theta, None]
+
+        start = time.perf_counter()
+        _looped_christoffel(g, inverse_metric(g), coordinates)
+        looped = time.perf_counter() - start
+
+        start = time.perf_counter()
+        curvature = CurvatureGrid(g, coordinates)
+        curvature.christoffel
+        christoffel_time = time.perf_counter() - start
+        curvature.einstein
+        results[n] = {
+            'looped_christoffel': looped,
+            'christoffel': christoffel_time,
+            'einstein': time.perf_counter() - start,
+            'max_abs_einstein': float(np.max(np.abs(curvature.einstein[:, :, 2:-2, 2:-2]))),
+        }
+    return results
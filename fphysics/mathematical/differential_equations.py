@@ -3,6 +3,7 @@ from scipy.integrate import odeint, solve_ivp
 from scipy.sparse import diags
 from scipy.sparse.linalg import spsolve
 import matplotlib.pyplot as plt
+from ..quantum.bound_states import bound_states, hamiltonian
 
 def euler_method(f, y0, t_span, h):
     t = np.arange(t_span[0], t_span[1] + h, h)
@@ -144,14 +145,14 @@ def rossler_system(t, y, a, b, c):
     dzdt = b + z * (x - c)
     return [dxdt, dydt, dzdt]
 
-def schrodinger_1d_finite_difference(V, x, m=1, hbar=1):
+def schrodinger_1d_finite_difference(V, x, m=1, hbar=1, k=None, sigma=None):
     dx = x[1] - x[0]
-    n = len(x)
     
-    kinetic = -hbar**2 / (2 * m * dx**2) * diags([-1, 2, -1], [-1, 0, 1], shape=(n-2, n-2))
-    potential = diags(V[1:-1], 0, shape=(n-2, n-2))
+    if k is not None:
+        eigenvalues, states = bound_states(V[1:-1], dx, k, sigma, m, hbar)
+        return eigenvalues, states.T * np.sqrt(dx)
     
-    H = kinetic + potential
+    H = hamiltonian(V[1:-1], dx, m, hbar)
     eigenvalues, eigenvectors = np.linalg.eigh(H.toarray())
     
     return eigenvalues, eigenvectors
@@ -166,9 +167,8 @@ def burgers_equation_1d(nu, L, T, nx, nt, initial_condition):
     
     for n in range(nt):
         u_new = u[n].copy()
-        for i in range(1, nx - 1):
-            u_new[i] = u[n, i] - u[n, i] * dt/dx * (u[n, i] - u[n, i-1]) + \
-                      nu * dt/dx**2 * (u[n, i+1] - 2*u[n, i] + u[n, i-1])
+        u_new[1:-1] = u[n, 1:-1] - u[n, 1:-1] * dt/dx * (u[n, 1:-1] - u[n, :-2]) + \
+                      nu * dt/dx**2 * (u[n, 2:] - 2*u[n, 1:-1] + u[n, :-2])
         u[n+1] = u_new
     
     return x, u
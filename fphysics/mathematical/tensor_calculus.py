@@ -1,4 +1,5 @@
 import numpy as np
+from . import curvature
 
 class Tensor:
     def __init__(self, components, indices_type="covariant"):
@@ -22,55 +23,29 @@ def metric_tensor_minkowski(dim=4):
         g[i, i] = 1
     return g
 
+def _sampled_coordinates(coordinates):
+    # the original signature took one value or array per coordinate; coordinates that are
+    # scalars or constant along the grid have no grid axis in the curvature pipeline
+    axes = []
+    for axis in coordinates:
+        if axis is None or np.ndim(axis) == 0 or np.ptp(np.asarray(axis, dtype=float)) == 0:
+            axes.append(None)
+        else:
+            axes.append(np.asarray(axis, dtype=float))
+    return axes
+
 def christoffel_symbols(metric, coordinates):
-    dim = len(coordinates)
-    gamma = np.zeros((dim, dim, dim))
-    
-    for i in range(dim):
-        for j in range(dim):
-            for k in range(dim):
-                for l in range(dim):
-                    gamma[i, j, k] += 0.5 * metric[i, l] * (
-                        np.gradient(metric[l, j], coordinates[k]) +
-                        np.gradient(metric[l, k], coordinates[j]) -
-                        np.gradient(metric[j, k], coordinates[l])
-                    )
-    
-    return gamma
+    return curvature.christoffel_symbols(metric, _sampled_coordinates(coordinates))
 
 def riemann_tensor(christoffel, coordinates):
-    dim = christoffel.shape[0]
-    R = np.zeros((dim, dim, dim, dim))
-    
-    for i in range(dim):
-        for j in range(dim):
-            for k in range(dim):
-                for l in range(dim):
-                    R[i, j, k, l] = (
-                        np.gradient(christoffel[i, j, l], coordinates[k]) -
-                        np.gradient(christoffel[i, j, k], coordinates[l])
-                    )
-                    for m in range(dim):
-                        R[i, j, k, l] += (
-                            christoffel[i, m, k] * christoffel[m, j, l] -
-                            christoffel[i, m, l] * christoffel[m, j, k]
-                        )
-    
-    return R
+    dG = curvature.christoffel_derivatives(christoffel, _sampled_coordinates(coordinates))
+    return curvature.unpack_riemann(curvature.packed_riemann(christoffel, dG))
 
 def ricci_tensor(riemann_tensor):
-    dim = riemann_tensor.shape[0]
-    R_ij = np.zeros((dim, dim))
-    
-    for i in range(dim):
-        for j in range(dim):
-            for k in range(dim):
-                R_ij[i, j] += riemann_tensor[k, i, k, j]
-    
-    return R_ij
+    return np.einsum('kikj...->ij...', riemann_tensor)
 
 def ricci_scalar(ricci_tensor, metric_inverse):
-    return np.trace(np.dot(metric_inverse, ricci_tensor))
+    return np.einsum('ij...,ij...->...', metric_inverse, ricci_tensor)
 
 def einstein_tensor(ricci_tensor, ricci_scalar, metric):
     return ricci_tensor - 0.5 * ricci_scalar * metric
@@ -116,19 +91,15 @@ def parallel_transport(vector, path, christoffel):
     return transported
 
 def geodesic_equation(christoffel, initial_position, initial_velocity, t_span, dt):
-    positions = [initial_position]
-    velocities = [initial_velocity]
+    n_steps = len(np.arange(0, t_span, dt))
+    positions = np.empty((n_steps + 1,) + np.shape(initial_position))
+    velocities = np.empty((n_steps + 1,) + np.shape(initial_velocity))
+    positions[0] = initial_position
+    velocities[0] = initial_velocity
     
-    for t in np.arange(0, t_span, dt):
-        pos = positions[-1]
-        vel = velocities[-1]
-        
-        acceleration = -np.einsum('ijk,j,k->i', christoffel, vel, vel)
-        
-        new_vel = vel + acceleration * dt
-        new_pos = pos + vel * dt
-        
-        positions.append(new_pos)
-        velocities.append(new_vel)
+    for n in range(n_steps):
+        acceleration = -np.einsum('ijk,j,k->i', christoffel, velocities[n], velocities[n])
+        velocities[n + 1] = velocities[n] + acceleration * dt
+        positions[n + 1] = positions[n] + velocities[n] * dt
     
-    return np.array(positions), np.array(velocities)
+    return positions, velocities
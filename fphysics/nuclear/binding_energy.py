@@ -1,3 +1,4 @@
+import warnings
 import numpy as np
 import matplotlib.pyplot as plt
 from typing import Union, List, Tuple, Dict
@@ -34,30 +35,14 @@ def atomic_number_from_mass(mass_number: int) -> int:
         return int(mass_number / 2.4)
 
 
-def semi_empirical_mass_formula(A: int, Z: int) -> float:
-    a_v = 15.75
-    a_s = 17.8
-    a_c = 0.711
-    a_A = 23.7
-    
-    if Z % 2 == 0 and (A - Z) % 2 == 0:
-        delta = 11.18 / math.sqrt(A)
-    elif Z % 2 == 1 and (A - Z) % 2 == 1:
-        delta = -11.18 / math.sqrt(A)
-    else:
-        delta = 0
-    
-    BE = (a_v * A - 
-          a_s * A**(2/3) - 
-          a_c * Z**2 / A**(1/3) - 
-          a_A * (A - 2*Z)**2 / A + 
-          delta)
-    
-    mass_energy = Z * PROTON_MASS_MEV + (A - Z) * NEUTRON_MASS_MEV - BE
+def semi_empirical_mass_formula(A: Union[int, np.ndarray], Z: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+    BE = binding_energy_semf(A, Z)
+    mass_energy = Z * PROTON_MASS_MEV + (np.asarray(A) - Z) * NEUTRON_MASS_MEV - BE
     return mass_energy / ATOMIC_MASS_UNIT_MEV
 
 
-def separation_energy(A: int, Z: int, particle: str = 'neutron') -> float:
+def separation_energy(A: Union[int, np.ndarray], Z: Union[int, np.ndarray],
+                      particle: str = 'neutron') -> Union[float, np.ndarray]:
     if particle == 'neutron':
         BE_initial = binding_energy_semf(A, Z)
         BE_final = binding_energy_semf(A-1, Z)
@@ -74,24 +59,20 @@ def separation_energy(A: int, Z: int, particle: str = 'neutron') -> float:
         raise ValueError(f"Unknown particle type: {particle}")
 
 
-def binding_energy_semf(A: int, Z: int) -> float:
+def binding_energy_semf(A: Union[int, np.ndarray], Z: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
     a_v = 15.75
     a_s = 17.8
     a_c = 0.711
     a_A = 23.7
     
-    if Z % 2 == 0 and (A - Z) % 2 == 0:
-        delta = 11.18 / math.sqrt(A)
-    elif Z % 2 == 1 and (A - Z) % 2 == 1:
-        delta = -11.18 / math.sqrt(A)
-    else:
-        delta = 0
-    
-    return (a_v * A - 
-            a_s * A**(2/3) - 
-            a_c * Z**2 / A**(1/3) - 
-            a_A * (A - 2*Z)**2 / A + 
-            delta)
+    A = np.asarray(A, dtype=float)
+    Z = np.asarray(Z, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (a_v * A - 
+                a_s * A**(2/3) - 
+                a_c * Z**2 / A**(1/3) - 
+                a_A * (A - 2*Z)**2 / A + 
+                pairing_energy(A, Z))
 
 
 def q_value_alpha_decay(A_parent: int, Z_parent: int) -> float:
@@ -119,10 +100,10 @@ def magic_numbers() -> List[int]:
     return [2, 8, 20, 28, 50, 82, 126]
 
 
-def is_magic_nucleus(A: int, Z: int) -> bool:
-    N = A - Z
+def is_magic_nucleus(A: Union[int, np.ndarray], Z: Union[int, np.ndarray]) -> Union[bool, np.ndarray]:
+    N = np.asarray(A) - Z
     magic = magic_numbers()
-    return Z in magic or N in magic
+    return np.isin(Z, magic) | np.isin(N, magic)
 
 
 def nuclear_radius(A: int) -> float:
@@ -155,31 +136,20 @@ def asymmetry_energy(A: int, Z: int) -> float:
     return a_A * (A - 2*Z)**2 / A
 
 
-def pairing_energy(A: int, Z: int) -> float:
-    N = A - Z
-    if Z % 2 == 0 and N % 2 == 0:
-        return 11.18 / math.sqrt(A)
-    elif Z % 2 == 1 and N % 2 == 1:
-        return -11.18 / math.sqrt(A)
-    else:
-        return 0
+def pairing_energy(A: Union[int, np.ndarray], Z: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+    A = np.asarray(A, dtype=float)
+    Z_odd = np.asarray(Z) % 2
+    N_odd = (A - Z) % 2
+    sign = np.where((Z_odd == 0) & (N_odd == 0), 1.0, np.where((Z_odd == 1) & (N_odd == 1), -1.0, 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return sign * 11.18 / np.sqrt(A)
 
 
 def valley_of_stability(A_range: Tuple[int, int]) -> List[int]:
-    stable_Z = []
-    for A in range(A_range[0], A_range[1] + 1):
-        min_mass = float('inf')
-        best_Z = 1
-        
-        for Z in range(1, A):
-            mass = semi_empirical_mass_formula(A, Z)
-            if mass < min_mass:
-                min_mass = mass
-                best_Z = Z
-        
-        stable_Z.append(best_Z)
-    
-    return stable_Z
+    A = np.arange(A_range[0], A_range[1] + 1)[:, None]
+    Z = np.arange(1, max(A_range[1], 2))[None, :]
+    mass = np.where(Z < A, semi_empirical_mass_formula(A, Z), np.inf)
+    return (np.argmin(mass, axis=1) + 1).tolist()
 
 
 def plot_binding_energy_curve(A_range: Tuple[int, int] = (1, 250)):
@@ -209,53 +179,56 @@ def plot_binding_energy_curve(A_range: Tuple[int, int] = (1, 250)):
     plt.show()
 
 
-def mass_excess(A: int, Z: int) -> float:
+def mass_excess(A: Union[int, np.ndarray], Z: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
     atomic_mass_u = semi_empirical_mass_formula(A, Z)
     return (atomic_mass_u - A) * ATOMIC_MASS_UNIT_MEV
 
 
-def two_neutron_separation_energy(A: int, Z: int) -> float:
+def two_neutron_separation_energy(A: Union[int, np.ndarray], Z: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
     BE_initial = binding_energy_semf(A, Z)
-    BE_final = binding_energy_semf(A - 2, Z)
+    BE_final = binding_energy_semf(np.asarray(A) - 2, Z)
     return BE_initial - BE_final
 
 
-def neutron_drip_line(Z: int) -> int:
-    for A in range(Z, 300):
-        S_n = separation_energy(A, Z, 'neutron')
-        if S_n <= 0:
-            return A - 1
-    return 300
+def _last_bound(Z: Union[int, np.ndarray], particle: str, A_max: int = 300) -> Union[int, np.ndarray]:
+    # scan A = Z .. A_max - 1 for every Z at once and stop at the first unbound isotope
+    Z = np.asarray(Z)
+    column = Z.reshape(-1, 1)
+    A = np.arange(min(int(Z.min()), A_max), A_max)
+    with np.errstate(invalid='ignore'):
+        unbound = (A >= column) & (separation_energy(A, column, particle) <= 0)
+    last = np.where(unbound.any(axis=1), A[np.argmax(unbound, axis=1)] - 1, A_max).reshape(Z.shape)
+    return int(last) if last.ndim == 0 else last
 
 
-def proton_drip_line(Z: int) -> int:
-    for A in range(Z, 300):
-        S_p = separation_energy(A, Z, 'proton')
-        if S_p <= 0:
-            return A - 1
-    return 300
+def neutron_drip_line(Z: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+    return _last_bound(Z, 'neutron')
 
 
-NUCLEAR_DATA = {
-    'H-1': {'A': 1, 'Z': 1, 'mass': 1.007825},
-    'H-2': {'A': 2, 'Z': 1, 'mass': 2.014102},
-    'H-3': {'A': 3, 'Z': 1, 'mass': 3.016049},
-    'He-3': {'A': 3, 'Z': 2, 'mass': 3.016029},
-    'He-4': {'A': 4, 'Z': 2, 'mass': 4.002603},
-    'Li-6': {'A': 6, 'Z': 3, 'mass': 6.015122},
-    'Li-7': {'A': 7, 'Z': 3, 'mass': 7.016004},
-    'C-12': {'A': 12, 'Z': 6, 'mass': 12.000000},
-    'N-14': {'A': 14, 'Z': 7, 'mass': 14.003074},
-    'O-16': {'A': 16, 'Z': 8, 'mass': 15.994915},
-    'Fe-56': {'A': 56, 'Z': 26, 'mass': 55.934942},
-    'U-235': {'A': 235, 'Z': 92, 'mass': 235.043930},
-    'U-238': {'A': 238, 'Z': 92, 'mass': 238.050788}
-}
+def proton_drip_line(Z: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+    return _last_bound(Z, 'proton')
 
 
 def get_nuclear_data(nucleus: str) -> Dict:
-    if nucleus in NUCLEAR_DATA:
-        return NUCLEAR_DATA[nucleus].copy()
-    else:
-        available = ', '.join(NUCLEAR_DATA.keys())
-        raise ValueError(f"Nucleus {nucleus} not found. Available: {available}")
+    from .nuclide_table import nuclide_table, parse_nuclide
+    Z, A = parse_nuclide(nucleus)
+    table = nuclide_table()
+    row = table.index(Z, A)
+    if row < 0:
+        raise ValueError(f"Nucleus {nucleus} not found in the nuclide table")
+    return {'A': A, 'Z': Z, 'N': A - Z, 'mass': float(table.atomic_mass(Z, A)),
+            'mass_excess': float(table.mass_excess[row]), 'half_life': float(table.half_life[row])}
+
+
+_NUCLEAR_DATA_NUCLIDES = ('H-1', 'H-2', 'H-3', 'He-3', 'He-4', 'Li-6', 'Li-7', 'C-12', 'N-14', 'O-16',
+                          'Fe-56', 'U-235', 'U-238')
+
+
+def __getattr__(name: str):
+    # NUCLEAR_DATA used to be a hand-written dict; it is now a read-only snapshot of the nuclide table
+    if name == 'NUCLEAR_DATA':
+        warnings.warn("NUCLEAR_DATA is deprecated. Use get_nuclear_data() or nuclide_table.nuclide_table()",
+                      DeprecationWarning, stacklevel=2)
+        return {nucleus: {key: data[key] for key in ('A', 'Z', 'mass')}
+                for nucleus, data in ((n, get_nuclear_data(n)) for n in _NUCLEAR_DATA_NUCLIDES)}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,261 +1,256 @@
+import time
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Union, List, Tuple, Dict
-from ..constants import *
-import math
-
-
-def binding_energy(mass_number: int, atomic_mass: float) -> float:
-    Z = atomic_number_from_mass(mass_number)
-    mass_defect = Z * PROTON_MASS + (mass_number - Z) * NEUTRON_MASS - atomic_mass * ATOMIC_MASS_UNIT
-    return mass_defect * SPEED_OF_LIGHT**2 / ELECTRON_VOLT / 1e6
-
-
-def binding_energy_per_nucleon(mass_number: int, atomic_mass: float) -> float:
-    BE = binding_energy(mass_number, atomic_mass)
-    return BE / mass_number
-
-
-def mass_defect(mass_number: int, atomic_mass: float) -> float:
-    Z = atomic_number_from_mass(mass_number)
-    theoretical_mass = Z * PROTON_MASS_MEV + (mass_number - Z) * NEUTRON_MASS_MEV
-    actual_mass = atomic_mass * ATOMIC_MASS_UNIT_MEV
-    return (theoretical_mass - actual_mass) / ATOMIC_MASS_UNIT_MEV
-
-
-def atomic_number_from_mass(mass_number: int) -> int:
-    if mass_number <= 20:
-        return mass_number // 2
-    elif mass_number <= 40:
-        return int(mass_number / 2.1)
-    elif mass_number <= 100:
-        return int(mass_number / 2.2)
-    else:
-        return int(mass_number / 2.4)
-
-
-def semi_empirical_mass_formula(A: int, Z: int) -> float:
-    a_v = 15.75
-    a_s = 17.8
-    a_c = 0.711
-    a_A = 23.7
-    
-    if Z % 2 == 0 and (A - Z) % 2 == 0:
-        delta = 11.18 / math.sqrt(A)
-    elif Z % 2 == 1 and (A - Z) % 2 == 1:
-        delta = -11.18 / math.sqrt(A)
-    else:
-        delta = 0
-    
-    BE = (a_v * A - 
-          a_s * A**(2/3) - 
-          a_c * Z**2 / A**(1/3) - 
-          a_A * (A - 2*Z)**2 / A + 
-          delta)
-    
-    mass_energy = Z * PROTON_MASS_MEV + (A - Z) * NEUTRON_MASS_MEV - BE
-    return mass_energy / ATOMIC_MASS_UNIT_MEV
-
-
-def separation_energy(A: int, Z: int, particle: str = 'neutron') -> float:
-    if particle == 'neutron':
-        BE_initial = binding_energy_semf(A, Z)
-        BE_final = binding_energy_semf(A-1, Z)
-        return BE_initial - BE_final
-    elif particle == 'proton':
-        BE_initial = binding_energy_semf(A, Z)
-        BE_final = binding_energy_semf(A-1, Z-1)
-        return BE_initial - BE_final
-    elif particle == 'alpha':
-        BE_initial = binding_energy_semf(A, Z)
-        BE_final = binding_energy_semf(A-4, Z-2)
-        return BE_initial - BE_final - 28.3
-    else:
-        raise ValueError(f"Unknown particle type: {particle}")
-
-
-def binding_energy_semf(A: int, Z: int) -> float:
-    a_v = 15.75
-    a_s = 17.8
-    a_c = 0.711
-    a_A = 23.7
-    
-    if Z % 2 == 0 and (A - Z) % 2 == 0:
-        delta = 11.18 / math.sqrt(A)
-    elif Z % 2 == 1 and (A - Z) % 2 == 1:
-        delta = -11.18 / math.sqrt(A)
-    else:
-        delta = 0
-    
-    return (a_v * A - 
-            a_s * A**(2/3) - 
-            a_c * Z**2 / A**(1/3) - 
-            a_A * (A - 2*Z)**2 / A + 
-            delta)
-
-
-def q_value_alpha_decay(A_parent: int, Z_parent: int) -> float:
-    M_parent = semi_empirical_mass_formula(A_parent, Z_parent)
-    M_daughter = semi_empirical_mass_formula(A_parent - 4, Z_parent - 2)
-    M_alpha = 4.002603
-    
-    return (M_parent - M_daughter - M_alpha) * ATOMIC_MASS_UNIT_MEV
-
-
-def q_value_beta_decay(A: int, Z: int, decay_type: str = 'beta-') -> float:
-    if decay_type == 'beta-':
-        M_parent = semi_empirical_mass_formula(A, Z)
-        M_daughter = semi_empirical_mass_formula(A, Z + 1)
-        return (M_parent - M_daughter) * ATOMIC_MASS_UNIT_MEV
-    elif decay_type == 'beta+':
-        M_parent = semi_empirical_mass_formula(A, Z)
-        M_daughter = semi_empirical_mass_formula(A, Z - 1)
-        return (M_parent - M_daughter - 2 * ELECTRON_MASS_MEV) * ATOMIC_MASS_UNIT_MEV
-    else:
-        raise ValueError(f"Unknown decay type: {decay_type}")
-
-
-def magic_numbers() -> List[int]:
-    return [2, 8, 20, 28, 50, 82, 126]
-
-
-def is_magic_nucleus(A: int, Z: int) -> bool:
-    N = A - Z
-    magic = magic_numbers()
-    return Z in magic or N in magic
-
-
-def nuclear_radius(A: int) -> float:
-    r0 = NUCLEAR_RADIUS_CONSTANT
-    return r0 * A**(1/3)
-
-
-def nuclear_density() -> float:
-    r0 = NUCLEAR_RADIUS_CONSTANT * 1e-15
-    volume_per_nucleon = (4/3) * math.pi * r0**3
-    return ATOMIC_MASS_UNIT / volume_per_nucleon
-
-
-def liquid_drop_energy(A: int, Z: int) -> float:
-    return -binding_energy_semf(A, Z) + Z * PROTON_MASS_MEV + (A - Z) * NEUTRON_MASS_MEV
-
-
-def coulomb_energy(A: int, Z: int) -> float:
-    R = nuclear_radius(A) * 1e-15
-    return (3/5) * COULOMB_CONSTANT * Z**2 * ELEMENTARY_CHARGE**2 / R / ELECTRON_VOLT / 1e6
-
-
-def surface_energy(A: int) -> float:
-    a_s = 17.8
-    return a_s * A**(2/3)
-
-
-def asymmetry_energy(A: int, Z: int) -> float:
-    a_A = 23.7
-    return a_A * (A - 2*Z)**2 / A
-
-
-def pairing_energy(A: int, Z: int) -> float:
-    N = A - Z
-    if Z % 2 == 0 and N % 2 == 0:
-        return 11.18 / math.sqrt(A)
-    elif Z % 2 == 1 and N % 2 == 1:
-        return -11.18 / math.sqrt(A)
-    else:
-        return 0
-
-
-def valley_of_stability(A_range: Tuple[int, int]) -> List[int]:
-    stable_Z = []
-    for A in range(A_range[0], A_range[1] + 1):
-        min_mass = float('inf')
-        best_Z = 1
-        
-        for Z in range(1, A):
-            mass = semi_empirical_mass_formula(A, Z)
-            if mass < min_mass:
-                min_mass = mass
-                best_Z = Z
-        
-        stable_Z.append(best_Z)
-    
-    return stable_Z
-
-
-def plot_binding_energy_curve(A_range: Tuple[int, int] = (1, 250)):
-    A_values = range(A_range[0], A_range[1] + 1)
-    BE_per_A = []
-    
-    for A in A_values:
-        Z = atomic_number_from_mass(A)
-        BE = binding_energy_semf(A, Z)
-        BE_per_A.append(BE / A)
-    
-    plt.figure(figsize=(12, 8))
-    plt.plot(A_values, BE_per_A, 'b-', linewidth=2)
-    plt.xlabel('Mass Number (A)')
-    plt.ylabel('Binding Energy per Nucleon (MeV)')
-    plt.title('Nuclear Binding Energy Curve')
-    plt.grid(True, alpha=0.3)
-    
-    important_nuclei = [(4, 'He-4'), (12, 'C-12'), (16, 'O-16'), (56, 'Fe-56'), (238, 'U-238')]
-    for A, label in important_nuclei:
-        if A_range[0] <= A <= A_range[1]:
-            Z = atomic_number_from_mass(A)
-            BE = binding_energy_semf(A, Z) / A
-            plt.annotate(label, (A, BE), xytext=(A, BE + 0.5), 
-                        arrowprops=dict(arrowstyle='->', color='red'))
-    
-    plt.show()
-
-
-def mass_excess(A: int, Z: int) -> float:
-    atomic_mass_u = semi_empirical_mass_formula(A, Z)
-    return (atomic_mass_u - A) * ATOMIC_MASS_UNIT_MEV
-
-
-def two_neutron_separation_energy(A: int, Z: int) -> float:
-    BE_initial = binding_energy_semf(A, Z)
-    BE_final = binding_energy_semf(A - 2, Z)
-    return BE_initial - BE_final
-
-
-def neutron_drip_line(Z: int) -> int:
-    for A in range(Z, 300):
-        S_n = separation_energy(A, Z, 'neutron')
-        if S_n <= 0:
-            return A - 1
-    return 300
-
-
-def proton_drip_line(Z: int) -> int:
-    for A in range(Z, 300):
-        S_p = separation_energy(A, Z, 'proton')
-        if S_p <= 0:
-            return A - 1
-    return 300
-
-
-NUCLEAR_DATA = {
-    'H-1': {'A': 1, 'Z': 1, 'mass': 1.007825},
-    'H-2': {'A': 2, 'Z': 1, 'mass': 2.014102},
-    'H-3': {'A': 3, 'Z': 1, 'mass': 3.016049},
-    'He-3': {'A': 3, 'Z': 2, 'mass': 3.016029},
-    'He-4': {'A': 4, 'Z': 2, 'mass': 4.002603},
-    'Li-6': {'A': 6, 'Z': 3, 'mass': 6.015122},
-    'Li-7': {'A': 7, 'Z': 3, 'mass': 7.016004},
-    'C-12': {'A': 12, 'Z': 6, 'mass': 12.000000},
-    'N-14': {'A': 14, 'Z': 7, 'mass': 14.003074},
-    'O-16': {'A': 16, 'Z': 8, 'mass': 15.994915},
-    'Fe-56': {'A': 56, 'Z': 26, 'mass': 55.934942},
-    'U-235': {'A': 235, 'Z': 92, 'mass': 235.043930},
-    'U-238': {'A': 238, 'Z': 92, 'mass': 238.050788}
-}
-
-
-def get_nuclear_data(nucleus: str) -> Dict:
-    if nucleus in NUCLEAR_DATA:
-        return NUCLEAR_DATA[nucleus].copy()
+from typing import Union, List, Tuple, Dict, Optional
+from scipy.linalg import solve_triangular
+from scipy.sparse import csc_matrix, csr_matrix, coo_matrix, identity, bmat
+from scipy.sparse.linalg import splu, expm_multiply
+from ..constants import BARN_TO_SQUARE_METER
+
+
+# I-135 / Xe-135 data (decay constants in 1/s, thermal U-235 fission yields, Xe-135 absorption in m^2)
+LAMBDA_I135 = 2.92e-5
+LAMBDA_XE135 = 2.09e-5
+YIELD_I135 = 0.061
+YIELD_XE135 = 0.063
+SIGMA_XE135 = 2.65e6 * BARN_TO_SQUARE_METER
+
+CRAM16_ALPHA0 = 2.124853710495224e-16
+CRAM16_ALPHA = np.array([
+    +5.464930576870210e+3 - 3.797983575308356e+4j,
+    +9.045112476907548e+1 - 1.115537522430261e+3j,
+    +2.344818070467641e+2 - 4.228020157070496e+2j,
+    +9.453304067358312e+1 - 2.951294291446048e+2j,
+    +7.283792954673409e+2 - 1.205646080220011e+5j,
+    +3.648229059594851e+1 - 1.155509621409682e+2j,
+    +2.547321630156819e+1 - 2.639500283021502e+1j,
+    +2.394538338734709e+1 - 5.650522971778156e+0j,
+])
+CRAM16_THETA = np.array([
+    +3.509103608414918 + 8.436198985884374j,
+    +5.948152268951177 + 3.587457362018322j,
+    -5.264971343442647 + 16.22022147316793j,
+    +1.419375897185666 + 10.92536348449672j,
+    +6.416177699099435 + 1.194122393370139j,
+    +4.993174737717997 + 5.996881713603942j,
+    -1.413928462488886 + 13.49772569889275j,
+    -10.84391707869699 + 19.27744616718165j,
+])
+
+
+def decay_constant(half_life: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    with np.errstate(divide='ignore'):
+        return np.where(np.isfinite(half_life), np.log(2) / np.asarray(half_life, dtype=float), 0.0)
+
+
+def half_life(decay_const: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    with np.errstate(divide='ignore'):
+        return np.log(2) / np.asarray(decay_const, dtype=float)
+
+
+def transmutation_matrix(decay_constants: np.ndarray, branches: List[Tuple[int, int, float]],
+                         removal: Optional[np.ndarray] = None,
+                         transmutations: List[Tuple[int, int, float]] = ()) -> csr_matrix:
+    lam = np.asarray(decay_constants, dtype=float)
+    n = len(lam)
+    loss = lam + (0.0 if removal is None else np.asarray(removal, dtype=float))
+    rows, cols, values = [np.arange(n)], [np.arange(n)], [-loss]
+    if len(branches):
+        parent, daughter, fraction = (np.asarray(v) for v in zip(*branches))
+        rows.append(daughter.astype(int))
+        cols.append(parent.astype(int))
+        values.append(fraction * lam[parent.astype(int)])
+    for parent, daughter, rate in transmutations:
+        rows += [[daughter], [parent]]
+        cols += [[parent], [parent]]
+        values += [[rate], [-rate]]
+    return coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                      shape=(n, n)).tocsr()
+
+
+def _with_source(A: csr_matrix, n0: np.ndarray, source: np.ndarray) -> Tuple[csr_matrix, np.ndarray]:
+    column = csr_matrix(np.asarray(source, dtype=float).reshape(-1, 1))
+    augmented = bmat([[A, column], [None, csr_matrix((1, 1))]], format='csr')
+    ones = np.ones((1,) + n0.shape[1:])
+    return augmented, np.concatenate([n0, ones])
+
+
+def topological_order(A: csr_matrix) -> np.ndarray:
+    n = A.shape[0]
+    coo = A.tocoo()
+    off = coo.row != coo.col
+    parents, children = coo.col[off], coo.row[off]
+    in_degree = np.bincount(children, minlength=n)
+    children_of = [[] for _ in range(n)]
+    for p, c in zip(parents, children):
+        children_of[p].append(c)
+
+    order, ready = [], list(np.flatnonzero(in_degree == 0))
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for child in children_of[node]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                ready.append(child)
+    if len(order) < n:
+        raise ValueError("Chain contains a cycle; use method='cram' or 'expm'")
+    return np.array(order)
+
+
+def bateman_solution(A: csr_matrix, n0: np.ndarray, times: np.ndarray) -> np.ndarray:
+    order = topological_order(A)
+    L = A.toarray()[np.ix_(order, order)]
+    d = np.diag(L)
+    n = len(d)
+    # 1 / (d_j - d_i) amplifies rounding once the constants agree to about half the digits
+    degenerate_gap = 1e-8 * np.max(np.abs(d), initial=0.0)
+
+    V = np.eye(n)
+    for j in range(n):
+        for i in range(j + 1, n):
+            numerator = L[i, j:i] @ V[j:i, j]
+            if numerator == 0:
+                continue
+            if abs(d[j] - d[i]) <= degenerate_gap:
+                raise ValueError("Degenerate or nearly equal decay constants along a chain; "
+                                 "use method='cram'")
+            V[i, j] = numerator / (d[j] - d[i])
+
+    coefficients = solve_triangular(V, n0[order], lower=True, unit_diagonal=True)
+    exponentials = np.exp(np.multiply.outer(times, d))
+    shape = exponentials.shape + (1,) * (coefficients.ndim - 1)
+    result = np.einsum('ij,tj...->ti...', V, exponentials.reshape(shape) * coefficients)
+    out = np.empty_like(result)
+    out[:, order] = result
+    return out
+
+
+def cram_factors(A: csr_matrix, dt: float) -> List:
+    At = csc_matrix(A * dt, dtype=complex)
+    I = identity(A.shape[0], dtype=complex, format='csc')
+    return [splu(At - theta * I) for theta in CRAM16_THETA]
+
+
+def cram(A: csr_matrix, n0: np.ndarray, dt: float, factors: Optional[List] = None) -> np.ndarray:
+    factors = cram_factors(A, dt) if factors is None else factors
+    y = np.asarray(n0, dtype=float)
+    for alpha, lu in zip(CRAM16_ALPHA, factors):
+        y = y + 2 * np.real(alpha * lu.solve(y.astype(complex)))
+    return y * CRAM16_ALPHA0
+
+
+def solve_inventory(A: csr_matrix, n0: np.ndarray, times: np.ndarray, method: str = 'cram',
+                    source: Optional[np.ndarray] = None) -> np.ndarray:
+    n0 = np.asarray(n0, dtype=float)
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    n = A.shape[0]
+    if source is not None:
+        if method == 'bateman':
+            raise ValueError("Sources require method='cram' or 'expm'")
+        A, n0 = _with_source(A, n0, source)
+
+    if method == 'bateman':
+        result = bateman_solution(A, n0, times)
+    elif method == 'expm':
+        steps = np.diff(times)
+        if len(times) > 1 and np.all(steps > 0) and np.allclose(steps, steps[0]):
+            result = expm_multiply(A, n0, start=times[0], stop=times[-1], num=len(times), endpoint=True)
+        else:
+            result = np.array([expm_multiply(A * t, n0) for t in times])
+    elif method == 'cram':
+        # march through the sorted times, reusing the factorizations whenever a step repeats
+        order = np.argsort(times)
+        result = np.empty((len(times),) + n0.shape)
+        factors = {}
+        state, t_prev = n0, 0.0
+        for k in order:
+            dt = times[k] - t_prev
+            if dt > 0:
+                key = round(dt, 12 - int(np.floor(np.log10(dt))))
+                if key not in factors:
+                    factors[key] = cram_factors(A, dt)
+                state = cram(A, state, dt, factors[key])
+            result[k] = state
+            t_prev = times[k]
     else:
-        available = ', '.join(NUCLEAR_DATA.keys())
-        raise ValueError(f"Nucleus {nucleus} not found. Available: {available}")
+        raise ValueError("method must be 'bateman', 'cram' or 'expm'")
+    return result[:, :n]
+
+
+class DecayChain:
+    def __init__(self, nuclides: List[str], half_lives: Union[List[float], np.ndarray],
+                 branches: List[Tuple[str, str, float]] = ()):
+        self.nuclides = list(nuclides)
+        self.index = {name: i for i, name in enumerate(self.nuclides)}
+        self.half_lives = np.asarray(half_lives, dtype=float)
+        self.decay_constants = decay_constant(self.half_lives)
+        self.branches = [(self.index[p], self.index[d], f) for p, d, f in branches]
+
+    @classmethod
+    def from_table(cls, table: Dict[str, Dict]) -> 'DecayChain':
+        names = list(table)
+        for entry in table.values():
+            names += [d for d in entry.get('daughters', {}) if d not in names]
+        half_lives = [table.get(name, {}).get('half_life', np.inf) for name in names]
+        branches = [(parent, daughter, fraction) for parent, entry in table.items()
+                    for daughter, fraction in entry.get('daughters', {}).items()]
+        return cls(names, half_lives, branches)
+
+    def matrix(self, removal: Optional[Dict[str, float]] = None,
+               transmutations: List[Tuple[str, str, float]] = ()) -> csr_matrix:
+        removal_rates = np.zeros(len(self.nuclides))
+        for name, rate in (removal or {}).items():
+            removal_rates[self.index[name]] = rate
+        edges = [(self.index[p], self.index[d], r) for p, d, r in transmutations]
+        return transmutation_matrix(self.decay_constants, self.branches, removal_rates, edges)
+
+    def vector(self, amounts: Union[Dict[str, float], np.ndarray]) -> np.ndarray:
+        if isinstance(amounts, dict):
+            vector = np.zeros(len(self.nuclides))
+            for name, value in amounts.items():
+                vector[self.index[name]] = value
+            return vector
+        return np.asarray(amounts, dtype=float)
+
+    def solve(self, n0: Union[Dict[str, float], np.ndarray], times: np.ndarray, method: str = 'cram',
+              removal: Optional[Dict[str, float]] = None,
+              transmutations: List[Tuple[str, str, float]] = (),
+              source: Optional[Union[Dict[str, float], np.ndarray]] = None) -> np.ndarray:
+        A = self.matrix(removal, transmutations)
+        source = None if source is None else self.vector(source)
+        return solve_inventory(A, self.vector(n0), times, method, source)
+
+    def activity(self, inventories: np.ndarray) -> np.ndarray:
+        shape = (len(self.nuclides),) + (1,) * (np.ndim(inventories) - 2)
+        return inventories * self.decay_constants.reshape(shape)
+
+
+def xenon_iodine_chain() -> DecayChain:
+    return DecayChain.from_table({
+        'I135': {'half_life': np.log(2) / LAMBDA_I135, 'daughters': {'Xe135': 1.0}},
+        'Xe135': {'half_life': np.log(2) / LAMBDA_XE135, 'daughters': {'Cs135': 1.0}},
+    })
+
+
+def benchmark_decay(chain_lengths: Tuple[int, ...] = (10, 50, 200), n_times: int = 100,
+                    n_inventories: int = 100, seed: int = 0) -> Dict:
+    rng = np.random.default_rng(seed)
+    results = {}
+    for length in chain_lengths:
+        names = ['N%d' % i for i in range(length)]
+        half_lives = np.append(10**rng.uniform(0, 6, length - 1), np.inf)
+        chain = DecayChain(names, half_lives, [(names[i], names[i + 1], 1.0) for i in range(length - 1)])
+        A = chain.matrix()
+        n0 = rng.random((length, n_inventories))
+        times = np.logspace(0, 6, n_times)
+        entry = {}
+        for method in ('bateman', 'cram'):
+            start = time.perf_counter()
+            solve_inventory(A, n0, times, method)
+            entry[method] = time.perf_counter() - start
+        start = time.perf_counter()
+        for k in range(min(n_inventories, 5)):
+            solve_inventory(A, n0[:, k], times, 'cram')
+        entry['cram_per_inventory_loop'] = (time.perf_counter() - start) * n_inventories / min(n_inventories, 5)
+        results[length] = entry
+    return results
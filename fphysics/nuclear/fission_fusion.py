@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from typing import Union, List, Tuple, Dict
 from ..constants import *
+from .decay import xenon_iodine_chain, LAMBDA_XE135, YIELD_I135, YIELD_XE135, SIGMA_XE135
+from .reaction_rates import REACTIONS, reaction_rate_density, ignition_triple_product
 import math
 
 
@@ -79,18 +81,14 @@ def reproduction_factor(neutrons_produced: float, neutrons_absorbed: float) -> f
     return neutrons_produced / neutrons_absorbed
 
 
-def lawson_criterion(density: float, temperature: float, confinement_time: float, 
-                    reaction: str = 'DT') -> bool:
-    if reaction == 'DT':
-        criterion_value = 3e21
-        nT_tau = density * temperature * confinement_time
-        return nT_tau > criterion_value
-    elif reaction == 'DD':
-        criterion_value = 1e22
-        nT_tau = density * temperature * confinement_time
-        return nT_tau > criterion_value
-    else:
+def lawson_criterion(density: Union[float, np.ndarray], temperature: Union[float, np.ndarray],
+                     confinement_time: Union[float, np.ndarray], reaction: str = 'DT') -> Union[bool, np.ndarray]:
+    if reaction not in REACTIONS:
         raise ValueError(f"Lawson criterion not defined for reaction: {reaction}")
+    # temperature in keV, so n T tau is in keV s/m^3 (about 3e21 for D-T near 15 keV); outside the
+    # reactivity fit the threshold is infinite or NaN and the criterion is not met
+    nT_tau = density * np.asarray(temperature) * confinement_time
+    return nT_tau > ignition_triple_product(temperature, reaction)
 
 
 def fusion_cross_section_dt(energy: float) -> float:
@@ -113,20 +111,9 @@ def fusion_cross_section_dd(energy: float) -> float:
     return 0.1 * BARN_TO_SQUARE_METER * math.exp(-44.4 / math.sqrt(energy))
 
 
-def fusion_reaction_rate(density1: float, density2: float, temperature: float, 
-                        reaction: str = 'DT') -> float:
-    kT = BOLTZMANN_CONSTANT * temperature
-    
-    if reaction == 'DT':
-        if temperature < 1e7:
-            sigma_v = 0
-        else:
-            T_keV = kT / ELECTRON_VOLT / 1000
-            sigma_v = 1.1e-24 * T_keV**2 / (1 + 5.1e-4 * T_keV + 2.1e-7 * T_keV**2)
-        
-        return density1 * density2 * sigma_v
-    else:
-        raise ValueError(f"Reaction rate not implemented for: {reaction}")
+def fusion_reaction_rate(density1: Union[float, np.ndarray], density2: Union[float, np.ndarray],
+                         temperature: Union[float, np.ndarray], reaction: str = 'DT') -> Union[float, np.ndarray]:
+    return reaction_rate_density(density1, density2, temperature, reaction)
 
 
 def ignition_temperature(reaction: str = 'DT') -> float:
@@ -208,21 +195,30 @@ def burnup_calculation(initial_fuel: float, final_fuel: float, energy_released:
     return burnup
 
 
-def xenon_poisoning(flux: float, sigma_a_xe135: float = 2.65e6 * BARN_TO_SQUARE_METER) -> float:
-    yield_xe135 = 0.063
-    yield_i135 = 0.061
-    lambda_i135 = 2.92e-5
-    lambda_xe135 = 2.09e-5
-    
+def xenon_poisoning(flux: float, sigma_a_xe135: float = SIGMA_XE135) -> float:
     sigma_f = 580 * BARN_TO_SQUARE_METER
     
-    production_rate = flux * sigma_f * (yield_xe135 + yield_i135)
-    removal_rate = lambda_xe135 + flux * sigma_a_xe135
+    production_rate = flux * sigma_f * (YIELD_XE135 + YIELD_I135)
+    removal_rate = LAMBDA_XE135 + flux * sigma_a_xe135
     
     xe135_concentration = production_rate / removal_rate
     return flux * sigma_a_xe135 * xe135_concentration
 
 
+def xenon_transient(flux: float, times: np.ndarray, fission_rate_density: float = None,
+                    sigma_a_xe135: float = SIGMA_XE135,
+                    initial: Dict[str, float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    if fission_rate_density is None:
+        fission_rate_density = flux * 580 * BARN_TO_SQUARE_METER
+    
+    chain = xenon_iodine_chain()
+    inventory = chain.solve(initial or {}, times, method='cram',
+                            removal={'Xe135': flux * sigma_a_xe135},
+                            source={'I135': YIELD_I135 * fission_rate_density,
+                                    'Xe135': YIELD_XE135 * fission_rate_density})
+    return inventory[:, chain.index['I135']], inventory[:, chain.index['Xe135']]
+
+
 def plot_fission_cross_section(energy_range: Tuple[float, float] = (0.01, 10)):
     energies = np.logspace(np.log10(energy_range[0]), np.log10(energy_range[1]), 1000)
     
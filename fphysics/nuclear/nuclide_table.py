@@ -0,0 +1,287 @@
+import re
+import time
+from functools import lru_cache
+import numpy as np
+from typing import Union, List, Tuple, Dict, Optional
+from ..constants import *
+from .binding_energy import binding_energy_semf, separation_energy as semf_separation_energy
+
+
+YEAR = 365.25 * 86400.0
+DAY = 86400.0
+HOUR = 3600.0
+
+DECAY_BETA_MINUS = 1
+DECAY_BETA_PLUS = 2
+DECAY_ALPHA = 4
+DECAY_NEUTRON = 8
+DECAY_PROTON = 16
+DECAY_FISSION = 32
+
+# mass excesses of the free neutron, the hydrogen atom and He-4 (MeV)
+MASS_EXCESS_NEUTRON = 8.0713181
+MASS_EXCESS_HYDROGEN = 7.2889711
+MASS_EXCESS_HELIUM4 = 2.4249156
+ALPHA_BINDING_ENERGY = 2 * MASS_EXCESS_HYDROGEN + 2 * MASS_EXCESS_NEUTRON - MASS_EXCESS_HELIUM4
+
+NUCLIDE_DTYPE = np.dtype([
+    ('Z', '<i2'),
+    ('N', '<i2'),
+    ('A', '<i2'),
+    ('mass_excess', '<f8'),
+    ('half_life', '<f8'),
+    ('decay_modes', 'u1'),
+])
+
+ELEMENT_SYMBOLS = (
+    'n', 'H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne', 'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar',
+    'K', 'Ca', 'Sc', 'Ti', 'V', 'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn', 'Ga', 'Ge', 'As', 'Se', 'Br', 'Kr',
+    'Rb', 'Sr', 'Y', 'Zr', 'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd', 'In', 'Sn', 'Sb', 'Te', 'I', 'Xe',
+    'Cs', 'Ba', 'La', 'Ce', 'Pr', 'Nd', 'Pm', 'Sm', 'Eu', 'Gd', 'Tb', 'Dy', 'Ho', 'Er', 'Tm', 'Yb', 'Lu',
+    'Hf', 'Ta', 'W', 'Re', 'Os', 'Ir', 'Pt', 'Au', 'Hg', 'Tl', 'Pb', 'Bi', 'Po', 'At', 'Rn', 'Fr', 'Ra',
+    'Ac', 'Th', 'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk', 'Cf', 'Es', 'Fm', 'Md', 'No', 'Lr', 'Rf', 'Db',
+    'Sg', 'Bh', 'Hs', 'Mt', 'Ds', 'Rg', 'Cn', 'Nh', 'Fl', 'Mc', 'Lv', 'Ts', 'Og',
+)
+ATOMIC_NUMBERS = {symbol: Z for Z, symbol in enumerate(ELEMENT_SYMBOLS)}
+
+# (Z, A, atomic mass in u, half-life in s, decay modes) for the built-in table
+NUCLIDE_RECORDS = [
+    (0, 1, 1.00866491595, 878.4 * np.log(2), DECAY_BETA_MINUS),
+    (1, 1, 1.00782503223, np.inf, 0),
+    (1, 2, 2.01410177812, np.inf, 0),
+    (1, 3, 3.01604927790, 12.32 * YEAR, DECAY_BETA_MINUS),
+    (2, 3, 3.01602932007, np.inf, 0),
+    (2, 4, 4.00260325413, np.inf, 0),
+    (3, 6, 6.01512288742, np.inf, 0),
+    (3, 7, 7.01600343660, np.inf, 0),
+    (4, 9, 9.01218306500, np.inf, 0),
+    (5, 10, 10.01293695, np.inf, 0),
+    (5, 11, 11.00930536, np.inf, 0),
+    (6, 12, 12.0, np.inf, 0),
+    (6, 13, 13.00335483507, np.inf, 0),
+    (6, 14, 14.0032419884, 5700 * YEAR, DECAY_BETA_MINUS),
+    (7, 14, 14.00307400443, np.inf, 0),
+    (7, 15, 15.00010889888, np.inf, 0),
+    (8, 16, 15.99491461957, np.inf, 0),
+    (8, 17, 16.99913175650, np.inf, 0),
+    (8, 18, 17.99915961286, np.inf, 0),
+    (9, 19, 18.99840316273, np.inf, 0),
+    (10, 20, 19.9924401762, np.inf, 0),
+    (11, 23, 22.9897692820, np.inf, 0),
+    (12, 24, 23.985041697, np.inf, 0),
+    (13, 27, 26.98153853, np.inf, 0),
+    (14, 28, 27.97692653465, np.inf, 0),
+    (15, 31, 30.97376199842, np.inf, 0),
+    (16, 32, 31.9720711744, np.inf, 0),
+    (20, 40, 39.962590863, np.inf, 0),
+    (26, 56, 55.93493633, np.inf, 0),
+    (27, 60, 59.93381630, 5.2714 * YEAR, DECAY_BETA_MINUS),
+    (28, 62, 61.92834537, np.inf, 0),
+    (53, 131, 130.9061246, 8.0252 * DAY, DECAY_BETA_MINUS),
+    (54, 135, 134.9072278, 9.14 * HOUR, DECAY_BETA_MINUS),
+    (55, 137, 136.9070895, 30.08 * YEAR, DECAY_BETA_MINUS),
+    (82, 206, 205.9744653, np.inf, 0),
+    (82, 207, 206.9758969, np.inf, 0),
+    (82, 208, 207.9766521, np.inf, 0),
+    (83, 209, 208.9803987, 2.01e19 * YEAR, DECAY_ALPHA),
+    (84, 210, 209.9828737, 138.376 * DAY, DECAY_ALPHA),
+    (86, 222, 222.0175777, 3.8235 * DAY, DECAY_ALPHA),
+    (88, 226, 226.0254098, 1600 * YEAR, DECAY_ALPHA),
+    (90, 232, 232.0380553, 1.40e10 * YEAR, DECAY_ALPHA | DECAY_FISSION),
+    (92, 233, 233.0396352, 1.592e5 * YEAR, DECAY_ALPHA),
+    (92, 234, 234.0409521, 2.455e5 * YEAR, DECAY_ALPHA),
+    (92, 235, 235.0439299, 7.04e8 * YEAR, DECAY_ALPHA | DECAY_FISSION),
+    (92, 238, 238.0507882, 4.468e9 * YEAR, DECAY_ALPHA | DECAY_FISSION),
+    (94, 239, 239.0521634, 2.411e4 * YEAR, DECAY_ALPHA | DECAY_FISSION),
+]
+
+
+def parse_nuclide(name: str) -> Tuple[int, int]:
+    match = re.fullmatch(r'([A-Za-z]+)-?(\d+)', name.strip())
+    if match is None or match.group(1) not in ATOMIC_NUMBERS:
+        raise ValueError(f"Cannot parse nuclide name: {name}")
+    return ATOMIC_NUMBERS[match.group(1)], int(match.group(2))
+
+
+def nuclide_name(Z: int, A: int) -> str:
+    return f'{ELEMENT_SYMBOLS[Z]}-{A}'
+
+
+class NuclideTable:
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self.Z = data['Z']
+        self.N = data['N']
+        self.A = data['A']
+        self.mass_excess = data['mass_excess']
+        self.half_life = data['half_life']
+        self.decay_modes = data['decay_modes']
+
+        # dense (Z, N) -> row map, so lookups are a single gather for any number of queries
+        self._index = np.full((int(self.Z.max()) + 1, int(self.N.max()) + 1), -1, dtype=np.int32)
+        self._index[self.Z, self.N] = np.arange(len(data), dtype=np.int32)
+
+    @classmethod
+    def from_columns(cls, Z: np.ndarray, A: np.ndarray, mass_excess: np.ndarray,
+                     half_life: Optional[np.ndarray] = None,
+                     decay_modes: Optional[np.ndarray] = None) -> 'NuclideTable':
+        Z, A = np.asarray(Z), np.asarray(A)
+        data = np.zeros(len(Z), dtype=NUCLIDE_DTYPE)
+        data['Z'], data['A'], data['N'] = Z, A, A - Z
+        data['mass_excess'] = mass_excess
+        data['half_life'] = np.nan if half_life is None else half_life
+        data['decay_modes'] = 0 if decay_modes is None else decay_modes
+        return cls(np.sort(data, order=['Z', 'N']))
+
+    @classmethod
+    def from_records(cls, records: List[Tuple[int, int, float, float, int]]) -> 'NuclideTable':
+        Z, A, mass, half_life, modes = (np.array(column) for column in zip(*records))
+        return cls.from_columns(Z, A, (mass - A) * ATOMIC_MASS_UNIT_MEV, half_life, modes)
+
+    @classmethod
+    def from_semf(cls, Z_max: int = 118, N_max: int = 320) -> 'NuclideTable':
+        Z, N = np.meshgrid(np.arange(1, Z_max + 1), np.arange(N_max + 1), indexing='ij')
+        A = Z + N
+        with np.errstate(invalid='ignore'):
+            bound = ((binding_energy_semf(A, Z) > 0) & (semf_separation_energy(A, Z, 'neutron') > 0)
+                     & (semf_separation_energy(A, Z, 'proton') > 0))
+        Z, A = Z[bound], A[bound]
+        excess = Z * MASS_EXCESS_HYDROGEN + (A - Z) * MASS_EXCESS_NEUTRON - binding_energy_semf(A, Z)
+        return cls.from_columns(Z, A, excess)
+
+    @classmethod
+    def from_ame2020(cls, path: str) -> 'NuclideTable':
+        # fixed-width rows of mass_1.mas20; '#' marks extrapolated values in place of the decimal point
+        Z, A, excess = [], [], []
+        with open(path) as handle:
+            for line in handle:
+                try:
+                    z, a = int(line[9:14]), int(line[14:19])
+                    value = float(line[28:42].replace('#', '.'))
+                except ValueError:
+                    continue
+                Z.append(z)
+                A.append(a)
+                excess.append(value * 1e-3)
+        return cls.from_columns(np.array(Z), np.array(A), np.array(excess))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'NuclideTable':
+        return cls(np.load(path, mmap_mode='r' if mmap else None))
+
+    def save(self, path: str):
+        np.save(path, np.ascontiguousarray(self.data))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def index(self, Z: Union[int, np.ndarray], A: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        Z, N = np.broadcast_arrays(np.asarray(Z, dtype=np.int64), np.asarray(A, dtype=np.int64) - Z)
+        inside = (Z >= 0) & (N >= 0) & (Z < self._index.shape[0]) & (N < self._index.shape[1])
+        rows = np.full(Z.shape, -1, dtype=np.int32)
+        rows[inside] = self._index[Z[inside], N[inside]]
+        return int(rows) if rows.ndim == 0 else rows
+
+    def lookup(self, field: str, Z: Union[int, np.ndarray], A: Union[int, np.ndarray]) -> np.ndarray:
+        rows = np.asarray(self.index(Z, A))
+        values = np.asarray(self.data[field])[np.maximum(rows, 0)]
+        return np.where(rows >= 0, values, np.nan)
+
+    def __getitem__(self, key: Union[str, Tuple[int, int]]) -> np.void:
+        Z, A = parse_nuclide(key) if isinstance(key, str) else key
+        row = self.index(Z, A)
+        if row < 0:
+            raise KeyError(key)
+        return self.data[row]
+
+    def __contains__(self, key: Union[str, Tuple[int, int]]) -> bool:
+        Z, A = parse_nuclide(key) if isinstance(key, str) else key
+        return self.index(Z, A) >= 0
+
+    def names(self, rows: Optional[np.ndarray] = None) -> List[str]:
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        return [nuclide_name(z, a) for z, a in zip(self.Z[rows], self.A[rows])]
+
+    def atomic_mass(self, Z: Union[int, np.ndarray], A: Union[int, np.ndarray]) -> np.ndarray:
+        return A + self.lookup('mass_excess', Z, A) / ATOMIC_MASS_UNIT_MEV
+
+    def binding_energy(self, Z: Union[int, np.ndarray], A: Union[int, np.ndarray]) -> np.ndarray:
+        return (np.asarray(Z) * MASS_EXCESS_HYDROGEN + (np.asarray(A) - Z) * MASS_EXCESS_NEUTRON
+                - self.lookup('mass_excess', Z, A))
+
+    def separation_energy(self, Z: Union[int, np.ndarray], A: Union[int, np.ndarray],
+                          particle: str = 'neutron') -> np.ndarray:
+        removed = {'neutron': (0, 1, 0.0), 'proton': (1, 1, 0.0), 'alpha': (2, 4, ALPHA_BINDING_ENERGY)}
+        if particle not in removed:
+            raise ValueError(f"Unknown particle type: {particle}")
+        dZ, dA, particle_binding = removed[particle]
+        Z, A = np.asarray(Z), np.asarray(A)
+        return self.binding_energy(Z, A) - self.binding_energy(Z - dZ, A - dA) - particle_binding
+
+    def two_neutron_separation_energy(self, Z: Union[int, np.ndarray], A: Union[int, np.ndarray]) -> np.ndarray:
+        return self.binding_energy(Z, A) - self.binding_energy(Z, np.asarray(A) - 2)
+
+    def drip_lines(self) -> Dict[str, np.ndarray]:
+        # lightest proton-bound and heaviest neutron-bound isotope of every element in the table
+        with np.errstate(invalid='ignore'):
+            neutron_bound = self.separation_energy(self.Z, self.A, 'neutron') > 0
+            proton_bound = self.separation_energy(self.Z, self.A, 'proton') > 0
+        elements = np.unique(self.Z)
+        neutron = np.full(self._index.shape[0], -1)
+        proton = np.full(self._index.shape[0], np.iinfo(np.int64).max)
+        np.maximum.at(neutron, self.Z[neutron_bound], self.A[neutron_bound])
+        np.minimum.at(proton, self.Z[proton_bound], self.A[proton_bound])
+        proton = np.where(proton == np.iinfo(np.int64).max, -1, proton)
+        return {'Z': elements, 'neutron': neutron[elements], 'proton': proton[elements]}
+
+    def stable(self) -> np.ndarray:
+        return np.isinf(self.half_life)
+
+    def decays_by(self, mode: int) -> np.ndarray:
+        return (self.decay_modes & mode) != 0
+
+
+@lru_cache(maxsize=None)
+def nuclide_table(path: Optional[str] = None) -> NuclideTable:
+    # the built-in table is small enough to build in memory; only user-supplied files are memory-mapped
+    if path is None:
+        return NuclideTable.from_records(NUCLIDE_RECORDS)
+    return NuclideTable.load(path)
+
+
+def benchmark_nuclide_table(n_queries: int = 100000, Z_max: int = 118, seed: int = 0) -> Dict:
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    table = NuclideTable.from_semf(Z_max)
+    build = time.perf_counter() - start
+
+    rows = rng.integers(0, len(table), n_queries)
+    Z, A = table.Z[rows], table.A[rows]
+    records = {(z, a): {'Z': z, 'A': a, 'mass_excess': m}
+               for z, a, m in zip(table.Z.tolist(), table.A.tolist(), table.mass_excess.tolist())}
+    start = time.perf_counter()
+    for z, a in zip(Z.tolist(), A.tolist()):
+        records[(z, a)].copy()['mass_excess']
+    dictionary = time.perf_counter() - start
+    start = time.perf_counter()
+    table.lookup('mass_excess', Z, A)
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for z, a in zip(table.Z[:2000].tolist(), table.A[:2000].tolist()):
+        semf_separation_energy(a, z, 'neutron')
+    looped = (time.perf_counter() - start) * len(table) / min(len(table), 2000)
+    start = time.perf_counter()
+    table.separation_energy(table.Z, table.A, 'neutron')
+    table.two_neutron_separation_energy(table.Z, table.A)
+    table.drip_lines()
+    chart = time.perf_counter() - start
+
+    return {
+        'nuclides': len(table),
+        'build_semf_chart': build,
+        'dict_lookup': dictionary,
+        'indexed_lookup': indexed,
+        'looped_separation_energy': looped,
+        'chart_separation_and_drip_lines': chart,
+    }
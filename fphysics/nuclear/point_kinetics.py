@@ -0,0 +1,219 @@
+import time
+import numpy as np
+from typing import Union, Tuple, Dict, Optional
+from .fission_fusion import delayed_neutron_parameters
+from .decay import LAMBDA_I135, LAMBDA_XE135, YIELD_I135, YIELD_XE135, SIGMA_XE135
+
+
+ROS2_GAMMA = 1 + 1 / np.sqrt(2)
+
+
+class PointKinetics:
+    def __init__(self, generation_time: float = 2e-5, fractions: Optional[np.ndarray] = None,
+                 decay_constants: Optional[np.ndarray] = None, flux: float = 3e17,
+                 xenon_worth: float = 0.0, power_coefficient: float = 0.0):
+        groups = delayed_neutron_parameters()
+        self.generation_time = generation_time
+        self.fractions = np.asarray(groups['fractions'] if fractions is None else fractions, dtype=float)
+        self.decay_constants = np.asarray(groups['decay_constants'] if decay_constants is None
+                                          else decay_constants, dtype=float)
+        self.beta = self.fractions.sum()
+        self.n_groups = len(self.fractions)
+        self.xenon_worth = xenon_worth
+        self.power_coefficient = power_coefficient
+
+        # iodine and xenon are normalised to their full-power equilibrium values
+        self.burnout = SIGMA_XE135 * flux
+        self.xenon_production = (LAMBDA_XE135 + self.burnout) / (YIELD_I135 + YIELD_XE135)
+        self.n_states = self.n_groups + 3
+
+    def equilibrium(self, power: Union[float, np.ndarray]) -> np.ndarray:
+        power = np.atleast_1d(np.asarray(power, dtype=float))
+        xenon = self.xenon_production * (YIELD_I135 + YIELD_XE135) * power / (LAMBDA_XE135 + self.burnout * power)
+        return np.column_stack([power] + [power] * self.n_groups + [power, xenon])
+
+    def _split(self, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return y[:, 0], y[:, 1:self.n_groups + 1], y[:, -2], y[:, -1]
+
+    def reactivity(self, y: np.ndarray, external: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        n, _, _, x = self._split(y)
+        return (external - self.xenon_worth * (x - reference[:, 1])
+                + self.power_coefficient * (n - reference[:, 0]))
+
+    def rhs(self, y: np.ndarray, external: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        n, c, i, x = self._split(y)
+        rho = self.reactivity(y, external, reference)
+        dn = ((rho - self.beta) * n + c @ self.fractions) / self.generation_time
+        dc = self.decay_constants * (n[:, None] - c)
+        di = LAMBDA_I135 * (n - i)
+        dx = (self.xenon_production * (YIELD_XE135 * n + YIELD_I135 * i)
+              - (LAMBDA_XE135 + self.burnout * n) * x)
+        return np.column_stack([dn, dc, di, dx])
+
+    def jacobian(self, y: np.ndarray, external: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        n, c, i, x = self._split(y)
+        G, L = self.n_groups, self.generation_time
+        rho = self.reactivity(y, external, reference)
+        J = np.zeros((len(y), self.n_states, self.n_states))
+        J[:, 0, 0] = (rho - self.beta + self.power_coefficient * n) / L
+        J[:, 0, 1:G + 1] = self.fractions / L
+        J[:, 0, -1] = -self.xenon_worth * n / L
+        groups = np.arange(1, G + 1)
+        J[:, groups, 0] = self.decay_constants
+        J[:, groups, groups] = -self.decay_constants
+        J[:, -2, 0] = LAMBDA_I135
+        J[:, -2, -2] = -LAMBDA_I135
+        J[:, -1, 0] = self.xenon_production * YIELD_XE135 - self.burnout * x
+        J[:, -1, -2] = self.xenon_production * YIELD_I135
+        J[:, -1, -1] = -(LAMBDA_XE135 + self.burnout * n)
+        return J
+
+
+def _schedule(reactivity, n_scenarios: int):
+    if isinstance(reactivity, tuple):
+        times, values = reactivity
+        times = np.asarray(times, dtype=float)
+        values = np.broadcast_to(np.asarray(values, dtype=float), (n_scenarios, len(times)))
+        return times, values
+    values = np.broadcast_to(np.asarray(reactivity, dtype=float), (n_scenarios,))
+    return np.array([0.0]), values[:, None]
+
+
+def _external_reactivity(times: np.ndarray, values: np.ndarray, t: np.ndarray,
+                         index: np.ndarray) -> np.ndarray:
+    if len(times) == 1:
+        return np.where(t >= times[0], values[index, 0], 0.0)
+    k = np.clip(np.searchsorted(times, t, side='right'), 1, len(times) - 1)
+    t0, t1 = times[k - 1], times[k]
+    v0, v1 = values[index, k - 1], values[index, k]
+    w = np.clip((t - t0) / (t1 - t0), 0.0, 1.0)
+    before = t < times[0]
+    return np.where(before, 0.0, v0 + w * (v1 - v0))
+
+
+def step_reactivity(amplitudes: np.ndarray, t_insert: float = 0.0, duration: Optional[float] = None,
+                    rise_time: float = 1e-9) -> Tuple[np.ndarray, np.ndarray]:
+    amplitudes = np.asarray(amplitudes, dtype=float)[:, None]
+    if duration is None:
+        return np.array([t_insert, t_insert + rise_time]), np.hstack([0 * amplitudes, amplitudes])
+    t_out = t_insert + duration
+    return (np.array([t_insert, t_insert + rise_time, t_out, t_out + rise_time]),
+            np.hstack([0 * amplitudes, amplitudes, amplitudes, 0 * amplitudes]))
+
+
+def ramp_reactivity(rates: np.ndarray, duration: float, t_start: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    rates = np.asarray(rates, dtype=float)[:, None]
+    return np.array([t_start, t_start + duration]), np.hstack([0 * rates, rates * duration])
+
+
+def simulate_transients(model: PointKinetics, reactivity, t_final: float, n_outputs: int = 201,
+                        initial_power: Union[float, np.ndarray] = 1.0, output_times: Optional[np.ndarray] = None,
+                        rtol: float = 1e-5, atol: float = 1e-9, first_step: float = 1e-6,
+                        max_steps: int = 100000) -> Dict[str, np.ndarray]:
+    if output_times is None:
+        output_times = np.linspace(0.0, t_final, n_outputs)
+    output_times = np.asarray(output_times, dtype=float)
+    if isinstance(reactivity, tuple):
+        n_scenarios = np.atleast_2d(reactivity[1]).shape[0]
+    else:
+        n_scenarios = np.size(reactivity)
+    n_scenarios = max(n_scenarios, np.size(initial_power))
+    schedule_times, schedule_values = _schedule(reactivity, n_scenarios)
+
+    y = model.equilibrium(np.broadcast_to(initial_power, (n_scenarios,)))
+    # power and xenon at t = 0; the feedback reactivity is measured against this state
+    initial = y[:, [0, -1]].copy()
+    reference = initial
+    states = np.full((len(output_times), n_scenarios, model.n_states), np.nan)
+    states[output_times <= 0] = y
+    # 0 once every output time is reached, -1 if the scenario overflowed or ran out of steps
+    status = np.zeros(n_scenarios, dtype=int)
+
+    index = np.arange(n_scenarios)
+    t = np.zeros(n_scenarios)
+    h = np.full(n_scenarios, first_step)
+    target = np.searchsorted(output_times, 0.0, side='right') * np.ones(n_scenarios, dtype=int)
+    identity = np.eye(model.n_states)
+
+    for _ in range(max_steps):
+        alive = (target < len(output_times)) & (status[index] == 0)
+        index, y, t, h, target, reference = (index[alive], y[alive], t[alive], h[alive],
+                                             target[alive], reference[alive])
+        if not len(index):
+            break
+
+        h = np.minimum(h, output_times[target] - t)
+        rho0 = _external_reactivity(schedule_times, schedule_values, t, index)
+        rho1 = _external_reactivity(schedule_times, schedule_values, t + h, index)
+        with np.errstate(over='ignore', invalid='ignore'):
+            W = identity - (ROS2_GAMMA * h)[:, None, None] * model.jacobian(y, rho0, reference)
+            k1 = np.linalg.solve(W, model.rhs(y, rho0, reference)[..., None])[..., 0]
+            f2 = model.rhs(y + h[:, None] * k1, rho1, reference) - 2 * k1
+            k2 = np.linalg.solve(W, f2[..., None])[..., 0]
+            y_new = y + h[:, None] * (1.5 * k1 + 0.5 * k2)
+
+            error = 0.5 * h[:, None] * (k1 + k2)
+            scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+            err = np.max(np.abs(error) / scale, axis=1)
+        failed = ~np.isfinite(err) | (h < 16 * np.finfo(float).eps * t)
+        status[index[failed]] = -1
+        accept = (err <= 1.0) & np.all(y_new[:, 1:] >= -atol, axis=1) & ~failed
+
+        y[accept] = y_new[accept]
+        t = np.where(accept, t + h, t)
+        with np.errstate(divide='ignore'):
+            h = h * np.clip(0.9 * err**-0.5, 0.2, 5.0)
+
+        reached = accept & (t >= output_times[np.minimum(target, len(output_times) - 1)] * (1 - 1e-12))
+        states[target[reached], index[reached]] = y[reached]
+        target = target + reached
+    status[index[target < len(output_times)]] = -1
+
+    n = states[..., 0]
+    external = np.stack([_external_reactivity(schedule_times, schedule_values,
+                                              np.full(n_scenarios, ti), np.arange(n_scenarios))
+                         for ti in output_times])
+    feedback = (- model.xenon_worth * (states[..., -1] - initial[:, 1])
+                + model.power_coefficient * (n - initial[:, 0]))
+    return {
+        't': output_times,
+        'power': n,
+        'precursors': states[..., 1:model.n_groups + 1],
+        'iodine': states[..., -2],
+        'xenon': states[..., -1],
+        'reactivity': external + feedback,
+        'status': status,
+    }
+
+
+def inhour_period(reactivity: Union[float, np.ndarray], generation_time: float = 2e-5,
+                  fractions: Optional[np.ndarray] = None,
+                  decay_constants: Optional[np.ndarray] = None) -> np.ndarray:
+    groups = delayed_neutron_parameters()
+    beta_i = np.asarray(groups['fractions'] if fractions is None else fractions, dtype=float)
+    lam = np.asarray(groups['decay_constants'] if decay_constants is None else decay_constants, dtype=float)
+
+    # rho = omega * Lambda + sum_i beta_i omega / (omega + lambda_i), cleared of denominators
+    base = np.poly1d(np.poly(-lam))
+    numerator = np.poly1d([generation_time, 0]) * base
+    for i, b in enumerate(beta_i):
+        numerator += np.poly1d([b, 0]) * np.poly1d(np.poly(-np.delete(lam, i)))
+    periods = []
+    for rho in np.atleast_1d(reactivity):
+        roots = (numerator - rho * base).roots
+        omega = np.max(roots[np.abs(roots.imag) < 1e-12].real)
+        periods.append(1 / omega if omega != 0 else np.inf)
+    return np.array(periods)
+
+
+def benchmark_point_kinetics(n_scenarios: Tuple[int, ...] = (100, 1000, 10000), t_final: float = 48 * 3600.0):
+    results = {}
+    model = PointKinetics(xenon_worth=0.025, power_coefficient=-0.01)
+    for S in n_scenarios:
+        insertions = np.linspace(-0.003, 0.002, S)
+        start = time.perf_counter()
+        out = simulate_transients(model, step_reactivity(insertions), t_final, n_outputs=97)
+        elapsed = time.perf_counter() - start
+        results[S] = {'time': elapsed, 'scenarios_per_minute': 60 * S / elapsed,
+                      'completed': float(np.mean(out['status'] == 0))}
+    return results
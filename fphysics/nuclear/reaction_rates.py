@@ -0,0 +1,298 @@
+import os
+import time
+from functools import lru_cache
+import numpy as np
+from typing import Union, Tuple, Dict, Optional, Callable
+from scipy.interpolate import CubicHermiteSpline
+from ..constants import *
+
+
+GAUSS_NODES, GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(16)
+KEV = 1e3 * ELECTRON_VOLT
+MILLIBARN = 1e-3 * BARN_TO_SQUARE_METER
+TABLE_VERSION = 1
+
+# Bosch & Hale (1992) S-factor fits in keV and mb: Gamow constant B_G (keV^1/2),
+# reduced mass m_r c^2 (keV), numerator A1..A5 and denominator B1..B4
+BOSCH_HALE = {
+    'DT': (34.3827, 1124656.0, (6.927e4, 7.454e8, 2.050e6, 5.2002e4, 0.0),
+           (6.38e1, -9.95e-1, 6.981e-5, 1.728e-4)),
+    'DDn': (31.3970, 937814.0, (5.3701e4, 3.3027e2, -1.2706e-1, 2.9327e-5, -2.5151e-9),
+            (0.0, 0.0, 0.0, 0.0)),
+    'DDp': (31.3970, 937814.0, (5.5576e4, 2.1054e2, -3.2638e-2, 1.4987e-6, 1.8181e-10),
+            (0.0, 0.0, 0.0, 0.0)),
+    'DHe3': (68.7508, 1124572.0, (5.7501e6, 2.5226e3, 4.5566e1, 0.0, 0.0),
+             (-3.1995e-3, -8.5530e-6, 5.9014e-8, 0.0)),
+}
+
+# charged-particle energy per reaction (keV), whether both reactants are the same species and
+# the temperature range (keV) over which Bosch & Hale validate their reactivities
+REACTIONS = {
+    'DT': {'channels': ('DT',), 'charged_energy': 3.52e3, 'identical': False, 'fit_range': (0.2, 100.0)},
+    'DD': {'channels': ('DDn', 'DDp'), 'charged_energy': 2.43e3, 'identical': True, 'fit_range': (0.2, 100.0)},
+    'DDn': {'channels': ('DDn',), 'charged_energy': 0.82e3, 'identical': True, 'fit_range': (0.2, 100.0)},
+    'DDp': {'channels': ('DDp',), 'charged_energy': 4.03e3, 'identical': True, 'fit_range': (0.2, 100.0)},
+    'DHe3': {'channels': ('DHe3',), 'charged_energy': 18.35e3, 'identical': False, 'fit_range': (0.5, 190.0)},
+}
+
+
+def _reaction(reaction: str) -> Dict:
+    if reaction not in REACTIONS:
+        raise ValueError(f"Reaction rate not implemented for: {reaction}")
+    return REACTIONS[reaction]
+
+
+def kelvin_to_kev(temperature: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    return BOLTZMANN_CONSTANT * np.asarray(temperature, dtype=float) / KEV
+
+
+def gamow_constant(Z1: int, Z2: int, reduced_mass: float) -> float:
+    return np.pi * FINE_STRUCTURE_CONSTANT * Z1 * Z2 * np.sqrt(2 * reduced_mass)
+
+
+def gamow_peak(temperature_kev: Union[float, np.ndarray],
+               gamow: float) -> Tuple[np.ndarray, np.ndarray]:
+    kT = np.asarray(temperature_kev, dtype=float)
+    energy = (0.5 * gamow * kT)**(2 / 3)
+    return energy, 4 * np.sqrt(energy * kT / 3)
+
+
+def bosch_hale_s_factor(energy_kev: Union[float, np.ndarray], reaction: str = 'DT') -> np.ndarray:
+    E = np.asarray(energy_kev, dtype=float)
+    total = np.zeros_like(E)
+    for channel in _reaction(reaction)['channels']:
+        _, _, A, B = BOSCH_HALE[channel]
+        numerator = A[0] + E * (A[1] + E * (A[2] + E * (A[3] + E * A[4])))
+        total = total + numerator / (1 + E * (B[0] + E * (B[1] + E * (B[2] + E * B[3]))))
+    return total * MILLIBARN
+
+
+def bosch_hale_cross_section(energy_kev: Union[float, np.ndarray], reaction: str = 'DT') -> np.ndarray:
+    E = np.asarray(energy_kev, dtype=float)
+    gamow = BOSCH_HALE[_reaction(reaction)['channels'][0]][0]
+    safe = np.where(E > 0, E, 1.0)
+    return np.where(E > 0, bosch_hale_s_factor(safe, reaction) * np.exp(-gamow / np.sqrt(safe)) / safe, 0.0)
+
+
+def vectorize_cross_section(func: Callable) -> Callable:
+    def evaluate(energy):
+        try:
+            values = np.asarray(func(energy), dtype=float)
+            if values.shape == np.shape(energy):
+                return values
+        except (TypeError, ValueError):
+            pass
+        return np.vectorize(func, otypes=[float])(energy)
+    return evaluate
+
+
+def _composite_gauss(integrand: Callable, lo: np.ndarray, hi: np.ndarray, rows: np.ndarray,
+                     n_panels: int) -> np.ndarray:
+    edges = lo[:, None] + (hi - lo)[:, None] * np.linspace(0.0, 1.0, n_panels + 1)
+    half = 0.5 * np.diff(edges, axis=1)
+    x = ((edges[:, :-1] + half)[..., None] + half[..., None] * GAUSS_NODES).reshape(len(rows), -1)
+    w = (half[..., None] * GAUSS_WEIGHTS).reshape(len(rows), -1)
+    return np.sum(integrand(x, rows) * w, axis=-1)
+
+
+def adaptive_quadrature(integrand: Callable, lo: Union[float, np.ndarray], hi: Union[float, np.ndarray],
+                        rtol: float = 1e-10, n_panels: int = 4, max_panels: int = 512) -> np.ndarray:
+    lo, hi = np.broadcast_arrays(np.atleast_1d(np.asarray(lo, dtype=float)),
+                                 np.atleast_1d(np.asarray(hi, dtype=float)))
+    rows = np.arange(lo.size)
+    previous = _composite_gauss(integrand, lo, hi, rows, n_panels)
+    result = np.empty_like(previous)
+
+    # double the panel count only for the intervals that have not settled yet
+    while len(rows):
+        n_panels *= 2
+        current = _composite_gauss(integrand, lo[rows], hi[rows], rows, n_panels)
+        error = np.abs(current - previous) <= rtol * np.abs(current)
+        done = np.all(error, axis=tuple(range(current.ndim - 1))) | (n_panels >= max_panels)
+        result[..., rows[done]] = current[..., done]
+        rows, previous = rows[~done], current[..., ~done]
+    return result
+
+
+def _log_reactivity(s_factor: Callable, temperature_kev: np.ndarray, reduced_mass: float, gamow: float,
+                    rtol: float = 1e-10) -> Tuple[np.ndarray, np.ndarray]:
+    kT = np.atleast_1d(np.asarray(temperature_kev, dtype=float))
+    peak, width = gamow_peak(kT, gamow)
+    tau = 3 * peak / kT
+    lo = np.maximum(peak - 6 * width, 0.0)
+    hi = peak + 6 * width + 30 * kT
+
+    # S(E) exp(-B_G / sqrt(E) - E / kT) scaled by exp(tau) so the peak is O(1) at any temperature
+    def integrand(E, rows):
+        weight = s_factor(E) * np.exp(tau[rows, None] - gamow / np.sqrt(E) - E / kT[rows, None])
+        return np.stack([weight, weight * E / kT[rows, None]])
+
+    moments = adaptive_quadrature(integrand, lo, hi, rtol)
+    log_rate = (np.log(SPEED_OF_LIGHT * np.sqrt(8 / (np.pi * reduced_mass)))
+                + np.log(moments[0]) - 1.5 * np.log(kT) - tau)
+    return log_rate, moments[1] / moments[0] - 1.5
+
+
+def thermal_reactivity(s_factor: Callable, temperature_kev: Union[float, np.ndarray], reduced_mass: float,
+                       gamow: float, rtol: float = 1e-10) -> np.ndarray:
+    kT = np.asarray(temperature_kev, dtype=float)
+    log_rate, _ = _log_reactivity(s_factor, kT.ravel(), reduced_mass, gamow, rtol)
+    return np.exp(log_rate).reshape(kT.shape)
+
+
+def bosch_hale_reactivity(temperature_kev: Union[float, np.ndarray], reaction: str = 'DT',
+                          rtol: float = 1e-10) -> np.ndarray:
+    gamow, reduced_mass = BOSCH_HALE[_reaction(reaction)['channels'][0]][:2]
+    return thermal_reactivity(lambda E: bosch_hale_s_factor(E, reaction), temperature_kev,
+                              reduced_mass, gamow, rtol)
+
+
+def default_cache_dir(name: str = 'reaction_rates') -> str:
+    root = os.environ.get('FPHYSICS_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'fphysics'))
+    return os.path.join(root, name)
+
+
+class RateTable:
+    # tables stay in memory unless cache_dir is given, e.g. default_cache_dir(); outside the
+    # Bosch-Hale fit the reactivity is 0 below and NaN above, or a ValueError with strict=True
+    def __init__(self, reaction: str = 'DT', t_min: Optional[float] = None, t_max: Optional[float] = None,
+                 nodes_per_decade: int = 64, rtol: float = 1e-10, cache_dir: Optional[str] = None,
+                 strict: bool = False):
+        self.reaction = reaction
+        self.fit_range = _reaction(reaction)['fit_range']
+        self.strict = strict
+        lo, hi = self.fit_range
+        t_min = lo if t_min is None else t_min
+        t_max = hi if t_max is None else t_max
+        if strict:
+            self._check_range(t_min, t_max)
+        t_min, t_max = min(max(t_min, lo), hi), max(min(t_max, hi), lo)
+        self.gamow, self.reduced_mass = BOSCH_HALE[REACTIONS[reaction]['channels'][0]][:2]
+        self.nodes_per_decade = nodes_per_decade
+        self.rtol = rtol
+        self.path = None if cache_dir is None else os.path.join(cache_dir, f'{reaction}_v{TABLE_VERSION}.npz')
+        if not self._load(t_min, t_max):
+            self._build(t_min, t_max)
+
+    def _check_range(self, t_min: float, t_max: float):
+        lo, hi = self.fit_range
+        if t_min < lo or t_max > hi:
+            raise ValueError(f"{self.reaction} reactivities are only valid for {lo:g} to {hi:g} keV; "
+                             f"got {t_min:g} to {t_max:g} keV")
+
+    def _load(self, t_min: float, t_max: float) -> bool:
+        if self.path is None or not os.path.exists(self.path):
+            return False
+        try:
+            with np.load(self.path) as data:
+                kT, log_rate, slope = data['kT'], data['log_rate'], data['slope']
+                usable = (data['nodes_per_decade'] >= self.nodes_per_decade and data['rtol'] <= self.rtol
+                          and kT[0] <= t_min and kT[-1] >= t_max)
+        except (OSError, KeyError, ValueError):
+            return False
+        if usable:
+            self._set(kT, log_rate, slope)
+        return usable
+
+    def _save(self, kT: np.ndarray, log_rate: np.ndarray, slope: np.ndarray):
+        if self.path is None:
+            return
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temporary, 'wb') as handle:
+                np.savez(handle, kT=kT, log_rate=log_rate, slope=slope, rtol=self.rtol,
+                         nodes_per_decade=self.nodes_per_decade)
+            os.replace(temporary, self.path)
+        except OSError:
+            pass
+
+    def _build(self, t_min: float, t_max: float):
+        decades = np.log10(t_max / t_min)
+        kT = np.logspace(np.log10(t_min), np.log10(t_max), int(np.ceil(decades * self.nodes_per_decade)) + 1)
+        kT[0], kT[-1] = t_min, t_max
+        s_factor = lambda E: bosch_hale_s_factor(E, self.reaction)
+        log_rate, slope = _log_reactivity(s_factor, kT, self.reduced_mass, self.gamow, self.rtol)
+        self._set(kT, log_rate, slope)
+        self._save(kT, log_rate, slope)
+
+    def _set(self, kT: np.ndarray, log_rate: np.ndarray, slope: np.ndarray):
+        self.t_min, self.t_max = kT[0], kT[-1]
+        self._spline = CubicHermiteSpline(np.log(kT), log_rate, slope)
+
+    def reactivity_kev(self, temperature_kev: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        kT = np.asarray(temperature_kev, dtype=float)
+        lo, hi = self.fit_range
+        positive = kT[kT > 0]
+        if self.strict and positive.size:
+            self._check_range(positive.min(), positive.max())
+        inside = (kT >= lo) & (kT <= hi)
+        fitted = kT[inside]
+        if fitted.size and (fitted.min() < self.t_min or fitted.max() > self.t_max):
+            self._build(max(lo, min(self.t_min, 0.5 * fitted.min())), min(hi, max(self.t_max, 2 * fitted.max())))
+        rate = np.where(kT <= hi, 0.0, np.nan)
+        rate[inside] = np.exp(self._spline(np.log(fitted)))
+        return rate if rate.ndim else float(rate)
+
+    def __call__(self, temperature: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return self.reactivity_kev(kelvin_to_kev(temperature))
+
+
+@lru_cache(maxsize=None)
+def rate_table(reaction: str = 'DT') -> RateTable:
+    return RateTable(reaction)
+
+
+def reactivity(temperature: Union[float, np.ndarray], reaction: str = 'DT') -> Union[float, np.ndarray]:
+    return rate_table(reaction)(temperature)
+
+
+def reaction_rate_density(density1: Union[float, np.ndarray], density2: Union[float, np.ndarray],
+                          temperature: Union[float, np.ndarray], reaction: str = 'DT') -> np.ndarray:
+    # identical reactants would otherwise count every pair twice
+    symmetry = 0.5 if _reaction(reaction)['identical'] else 1.0
+    return symmetry * density1 * density2 * reactivity(temperature, reaction)
+
+
+def ignition_triple_product(temperature_kev: Union[float, np.ndarray], reaction: str = 'DT') -> np.ndarray:
+    # charged-particle heating n^2 <sigma v> E_ch / 4 (or / 2 for one species) against losses 3 n T / tau
+    entry = _reaction(reaction)
+    coefficient = 6.0 if entry['identical'] else 12.0
+    kT = np.asarray(temperature_kev, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return coefficient * kT**2 / (entry['charged_energy'] * rate_table(reaction).reactivity_kev(kT))
+
+
+def _looped_reactivity(temperature_kev: float, reaction: str = 'DT', n_points: int = 1000) -> float:
+    reduced_mass = BOSCH_HALE[REACTIONS[reaction]['channels'][0]][1]
+    energies = np.linspace(1e-3, 100 * temperature_kev, n_points)
+    values = np.array([float(bosch_hale_cross_section(E, reaction)) * E * np.exp(-E / temperature_kev)
+                       for E in energies])
+    integral = np.sum(0.5 * (values[1:] + values[:-1]) * np.diff(energies))
+    return SPEED_OF_LIGHT * np.sqrt(8 / (np.pi * reduced_mass)) * temperature_kev**-1.5 * integral
+
+
+def benchmark_reaction_rates(n_temperatures: Tuple[int, ...] = (100, 10000, 1000000), reaction: str = 'DT',
+                             n_looped: int = 20) -> Dict:
+    results = {}
+    table = RateTable(reaction)
+    for n in n_temperatures:
+        kT = np.logspace(0, 2, n)
+        entry = {}
+        start = time.perf_counter()
+        for value in kT[:n_looped]:
+            _looped_reactivity(value, reaction)
+        entry['looped_trapezoid'] = (time.perf_counter() - start) * n / min(n, n_looped)
+
+        if n <= 10000:
+            start = time.perf_counter()
+            direct = bosch_hale_reactivity(kT, reaction)
+            entry['adaptive_quadrature'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rates = table.reactivity_kev(kT)
+        entry['table'] = time.perf_counter() - start
+        if n <= 10000:
+            entry['max_relative_error'] = float(np.max(np.abs(rates / direct - 1)))
+        results[n] = entry
+    return results
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from typing import Union, List, Tuple, Dict
 from ..constants import *
+from .reaction_rates import adaptive_quadrature, vectorize_cross_section
 import math
 
 
@@ -92,40 +93,42 @@ def reaction_rate(cross_section: float, flux: float, number_density: float) -> f
     return cross_section * flux * number_density
 
 
-def maxwell_boltzmann_average(cross_section_func, temperature: float, 
-                             energy_range: Tuple[float, float] = (0.001, 10.0)) -> float:
-    kT = BOLTZMANN_CONSTANT * temperature / ELECTRON_VOLT
+def maxwell_boltzmann_average(cross_section_func, temperature: Union[float, np.ndarray], 
+                             energy_range: Tuple[float, float] = (0.001, 10.0)) -> Union[float, np.ndarray]:
+    kT = BOLTZMANN_CONSTANT * np.asarray(temperature, dtype=float) / ELECTRON_VOLT
+    kT_flat = np.atleast_1d(kT).ravel()
+    sigma = vectorize_cross_section(cross_section_func)
     
-    def integrand(E):
-        return cross_section_func(E) * E * np.exp(-E / kT)
+    def integrand(E, rows):
+        return sigma(E) * E * np.exp(-E / kT_flat[rows, None])
     
-    energies = np.linspace(energy_range[0], energy_range[1], 1000)
-    values = [integrand(E) for E in energies]
+    lo = np.full(kT_flat.shape, float(energy_range[0]))
+    numerator = adaptive_quadrature(integrand, lo, energy_range[1])
+    average = (numerator / kT_flat**2).reshape(kT.shape)
     
-    numerator = np.trapz(values, energies)
-    denominator = kT**2
-    
-    return numerator / denominator
+    return average if average.ndim else float(average)
 
 
 def coulomb_barrier(Z1: int, Z2: int, R: float) -> float:
     return COULOMB_CONSTANT * Z1 * Z2 * ELEMENTARY_CHARGE**2 / (4 * math.pi * VACUUM_PERMITTIVITY * R)
 
 
-def gamow_factor(Z1: int, Z2: int, energy: float) -> float:
-    eta = Z1 * Z2 * FINE_STRUCTURE_CONSTANT * math.sqrt(ATOMIC_MASS_UNIT * SPEED_OF_LIGHT**2 / (2 * energy))
-    return 2 * math.pi * eta
+def gamow_factor(Z1: int, Z2: int, energy: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    eta = Z1 * Z2 * FINE_STRUCTURE_CONSTANT * np.sqrt(ATOMIC_MASS_UNIT * SPEED_OF_LIGHT**2 / (2 * np.asarray(energy)))
+    return 2 * np.pi * eta
 
 
-def fusion_cross_section(Z1: int, Z2: int, energy: float, S_factor: float = 1.0) -> float:
+def fusion_cross_section(Z1: int, Z2: int, energy: Union[float, np.ndarray],
+                         S_factor: Union[float, np.ndarray] = 1.0) -> Union[float, np.ndarray]:
     gamow = gamow_factor(Z1, Z2, energy)
-    return (S_factor / energy) * np.exp(-gamow)
+    return (S_factor / np.asarray(energy)) * np.exp(-gamow)
 
 
 def resonance_integral(cross_section_func, energy_range: Tuple[float, float]) -> float:
-    energies = np.logspace(np.log10(energy_range[0]), np.log10(energy_range[1]), 1000)
-    values = [cross_section_func(E) / E for E in energies]
-    return np.trapz(values, energies)
+    sigma = vectorize_cross_section(cross_section_func)
+    # sigma(E) dE / E is sigma(e^u) du in u = ln E
+    lo, hi = np.log(energy_range[0]), np.log(energy_range[1])
+    return float(adaptive_quadrature(lambda u, rows: sigma(np.exp(u)), lo, hi)[0])
 
 
 def doppler_broadening(energy: float, temperature: float, mass: float) -> float:
@@ -0,0 +1,106 @@
+import time
+import numpy as np
+from scipy.sparse import diags, identity, kronsum
+from scipy.sparse.linalg import LinearOperator, eigsh, splu
+
+
+def _spacing(spacing, ndim):
+    return np.broadcast_to(np.asarray(spacing, dtype=float), (ndim,))
+
+
+def laplacian_1d(n, dx):
+    return diags([1.0, -2.0, 1.0], [-1, 0, 1], shape=(n, n), format='csr') / dx**2
+
+
+def laplacian_kronecker(shape, spacing):
+    h = _spacing(spacing, len(shape))
+    L = laplacian_1d(shape[0], h[0])
+    for axis in range(1, len(shape)):
+        L = kronsum(laplacian_1d(shape[axis], h[axis]), L, format='csr')
+    return L
+
+
+def kinetic_operator(shape, spacing, m=1, hbar=1):
+    return -hbar**2 / (2 * m) * laplacian_kronecker(shape, spacing)
+
+
+def hamiltonian(V, spacing, m=1, hbar=1):
+    V = np.asarray(V, dtype=float)
+    return (kinetic_operator(V.shape, spacing, m, hbar) + diags(V.ravel())).tocsc()
+
+
+def _inverse_operator(lu):
+    n = lu.shape[0]
+    return LinearOperator((n, n), matvec=lu.solve, matmat=lu.solve, dtype=float)
+
+
+def _shift_invert(H, k, sigma, tol=0, v0=None):
+    lu = splu((H - sigma * identity(H.shape[0], format='csc')).tocsc(),
+              permc_spec='MMD_AT_PLUS_A')
+    return eigsh(H, k, sigma=sigma, which='LM', OPinv=_inverse_operator(lu), tol=tol, v0=v0)
+
+
+def _lowest_eigenpairs(H, k, sigma, method, tol=0, v0=None):
+    if method == 'shift_invert':
+        return _shift_invert(H, k, sigma, tol, v0)
+    if method == 'lanczos':
+        return eigsh(H, k, which='SA', tol=tol, v0=v0)
+    raise ValueError("method must be 'shift_invert' or 'lanczos'")
+
+
+def _sorted_states(energies, vectors, shape, spacing):
+    order = np.argsort(energies)
+    dV = np.prod(_spacing(spacing, len(shape)))
+    states = vectors[:, order].T.reshape((len(order),) + tuple(shape))
+    norms = np.sqrt(np.sum(np.abs(states)**2, axis=tuple(range(1, states.ndim))) * dV)
+    return energies[order], states / norms.reshape((-1,) + (1,) * len(shape))
+
+
+def bound_states(V, spacing, k=6, sigma=None, m=1, hbar=1, method='shift_invert', tol=0, v0=None):
+    V = np.asarray(V, dtype=float)
+    H = hamiltonian(V, spacing, m, hbar)
+    if sigma is None:
+        sigma = V.min()
+    energies, vectors = _lowest_eigenpairs(H, k, sigma, method, tol, v0)
+    return _sorted_states(energies, vectors, V.shape, spacing)
+
+
+def bound_state_sweep(potentials, spacing, k=6, sigma=None, m=1, hbar=1, method='shift_invert',
+                      tol=0):
+    kinetic = None
+    v0 = None
+    all_energies, all_states = [], []
+
+    for V in potentials:
+        V = np.asarray(V, dtype=float)
+        if kinetic is None:
+            kinetic = kinetic_operator(V.shape, spacing, m, hbar).tocsc()
+        H = (kinetic + diags(V.ravel())).tocsc()
+
+        shift = V.min() if sigma is None else sigma
+        energies, vectors = _lowest_eigenpairs(H, k, shift, method, tol, v0)
+        v0 = vectors.sum(axis=1)
+
+        energies, states = _sorted_states(energies, vectors, V.shape, spacing)
+        all_energies.append(energies)
+        all_states.append(states)
+
+    return np.array(all_energies), np.array(all_states)
+
+
+def benchmark_bound_states(sizes=(500, 1000, 2000, 10**4, 10**5), k=6, dense_limit=2000):
+    results = {}
+    for n in sizes:
+        x = np.linspace(-10, 10, n + 2)[1:-1]
+        V = 0.5 * x**2
+        entry = {}
+        if n <= dense_limit:
+            start = time.perf_counter()
+            np.linalg.eigh(hamiltonian(V, x[1] - x[0]).toarray())
+            entry['dense'] = time.perf_counter() - start
+        start = time.perf_counter()
+        energies, _ = bound_states(V, x[1] - x[0], k)
+        entry['sparse'] = time.perf_counter() - start
+        entry['max_error'] = np.max(np.abs(energies - (np.arange(k) + 0.5)))
+        results[n] = entry
+    return results
@@ -0,0 +1,247 @@
+import time
+import string
+import numpy as np
+from scipy import fft
+from .operators import (hadamard_gate, pauli_x, pauli_y, pauli_z, phase_shift_operator, cnot_gate,
+                        swap_gate, toffoli_gate, controlled_phase_gate, quantum_fourier_transform)
+
+
+PAULI_MATRICES = {'I': np.eye(2), 'X': pauli_x(), 'Y': pauli_y(), 'Z': pauli_z()}
+
+
+def zero_state(n_qubits, dtype=complex):
+    state = np.zeros((2,) * n_qubits, dtype=dtype)
+    state[(0,) * n_qubits] = 1.0
+    return state
+
+
+def basis_state(bits, dtype=complex):
+    state = np.zeros((2,) * len(bits), dtype=dtype)
+    state[tuple(bits)] = 1.0
+    return state
+
+
+def _subscripts(n, qubits):
+    letters = string.ascii_letters
+    state = letters[:n]
+    new = letters[n:n + len(qubits)]
+    result = list(state)
+    for q, letter in zip(qubits, new):
+        result[q] = letter
+    gate = new + ''.join(state[q] for q in qubits)
+    return '%s,%s->%s' % (gate, state, ''.join(result))
+
+
+def _is_diagonal(gate):
+    return np.count_nonzero(gate - np.diag(np.diag(gate))) == 0
+
+
+def apply_diagonal(state, diagonal, qubits):
+    shape = [1] * state.ndim
+    for q in qubits:
+        shape[q] = 2
+    order = np.argsort(qubits)
+    phases = np.asarray(diagonal).reshape((2,) * len(qubits)).transpose(order)
+    state *= phases.reshape(shape)
+    return state
+
+
+def apply_gate(state, gate, qubits, out=None):
+    qubits = list(qubits)
+    gate = np.asarray(gate)
+    if _is_diagonal(gate):
+        if out is not None:
+            np.copyto(out, state)
+            state = out
+        return apply_diagonal(state, np.diag(gate), qubits)
+
+    k = len(qubits)
+    tensor = gate.reshape((2,) * (2 * k))
+    if np.iscomplexobj(state):
+        tensor = tensor.astype(state.dtype)
+    if out is None:
+        out = np.empty_like(state)
+    return np.einsum(_subscripts(state.ndim, qubits), tensor, state, out=out)
+
+
+def apply_qft(state, qubits=None, inverse=False):
+    n = state.ndim
+    qubits = list(range(n)) if qubits is None else list(qubits)
+    others = [q for q in range(n) if q not in qubits]
+    moved = np.transpose(state, others + qubits)
+    flat = moved.reshape(moved.shape[:len(others)] + (-1,))
+    transform = fft.fft if inverse else fft.ifft
+    flat = transform(flat, axis=-1, norm='ortho')
+    return np.transpose(flat.reshape(moved.shape), np.argsort(others + qubits))
+
+
+def _embed(gate, qubits, target_qubits):
+    m = len(target_qubits)
+    positions = [target_qubits.index(q) for q in qubits]
+    identity = np.eye(2**m, dtype=complex).reshape((2,) * m + (2**m,))
+    return apply_gate(identity, gate, positions).reshape(2**m, 2**m)
+
+
+class QuantumCircuit:
+    def __init__(self, n_qubits):
+        self.n_qubits = n_qubits
+        self.operations = []
+
+    def gate(self, matrix, *qubits):
+        self.operations.append(('gate', np.asarray(matrix, dtype=complex), tuple(qubits)))
+        return self
+
+    def h(self, q):
+        return self.gate(hadamard_gate(), q)
+
+    def x(self, q):
+        return self.gate(pauli_x(), q)
+
+    def y(self, q):
+        return self.gate(pauli_y(), q)
+
+    def z(self, q):
+        return self.gate(pauli_z(), q)
+
+    def phase(self, phi, q):
+        return self.gate(phase_shift_operator(phi), q)
+
+    def rx(self, theta, q):
+        return self.gate(np.cos(theta / 2) * np.eye(2) - 1j * np.sin(theta / 2) * pauli_x(), q)
+
+    def ry(self, theta, q):
+        return self.gate(np.cos(theta / 2) * np.eye(2) - 1j * np.sin(theta / 2) * pauli_y(), q)
+
+    def rz(self, theta, q):
+        return self.gate(np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)]), q)
+
+    def cx(self, control, target):
+        return self.gate(cnot_gate(), control, target)
+
+    def cz(self, control, target):
+        return self.gate(controlled_phase_gate(np.pi), control, target)
+
+    def cp(self, phi, control, target):
+        return self.gate(controlled_phase_gate(phi), control, target)
+
+    def swap(self, a, b):
+        return self.gate(swap_gate(), a, b)
+
+    def ccx(self, c1, c2, target):
+        return self.gate(toffoli_gate(), c1, c2, target)
+
+    def qft(self, qubits=None, inverse=False):
+        qubits = tuple(range(self.n_qubits)) if qubits is None else tuple(qubits)
+        self.operations.append(('qft', inverse, qubits))
+        return self
+
+    def fused(self, max_qubits=2):
+        fused = []
+        for kind, payload, qubits in self.operations:
+            fused.append((kind, payload, qubits))
+            if kind != 'gate':
+                continue
+            for i in range(len(fused) - 2, -1, -1):
+                other_kind, other, other_qubits = fused[i]
+                if not set(qubits) & set(other_qubits):
+                    continue
+                if other_kind == 'gate' and set(qubits) <= set(other_qubits):
+                    fused[i] = ('gate', _embed(payload, qubits, list(other_qubits)) @ other,
+                                other_qubits)
+                    fused.pop()
+                elif (other_kind == 'gate' and set(other_qubits) <= set(qubits)
+                      and len(qubits) <= max_qubits):
+                    fused[i] = ('gate', payload @ _embed(other, other_qubits, list(qubits)), qubits)
+                    fused.pop()
+                break
+        return fused
+
+    def run(self, state=None, fuse=True, dtype=complex):
+        state = zero_state(self.n_qubits, dtype) if state is None else np.array(state, dtype=dtype)
+        buffer = np.empty_like(state)
+        for kind, payload, qubits in (self.fused() if fuse else self.operations):
+            if kind == 'qft':
+                state = np.ascontiguousarray(apply_qft(state, qubits, payload))
+                buffer = np.empty_like(state)
+            elif _is_diagonal(payload):
+                apply_diagonal(state, np.diag(payload), qubits)
+            else:
+                state, buffer = apply_gate(state, payload, qubits, out=buffer), state
+        return state
+
+    def unitary(self):
+        n = self.n_qubits
+        U = np.eye(2**n, dtype=complex).reshape((2,) * n + (2**n,))
+        for kind, payload, qubits in self.operations:
+            if kind == 'qft':
+                U = apply_qft(U, qubits, payload)
+            else:
+                U = apply_gate(U, payload, qubits)
+        return U.reshape(2**n, 2**n)
+
+
+def probabilities(state, qubits=None):
+    p = np.abs(state)**2
+    if qubits is None:
+        return p.ravel()
+    others = tuple(q for q in range(state.ndim) if q not in qubits)
+    marginal = np.sum(p, axis=others)
+    kept = sorted(qubits)
+    return np.transpose(marginal, [kept.index(q) for q in qubits]).ravel()
+
+
+def sample_state(state, shots, qubits=None, seed=None):
+    rng = np.random.default_rng(seed)
+    p = probabilities(state, qubits)
+    return rng.choice(len(p), size=shots, p=p / p.sum())
+
+
+def measurement_counts(outcomes, n_qubits):
+    values, counts = np.unique(outcomes, return_counts=True)
+    return {format(v, '0%db' % n_qubits): int(c) for v, c in zip(values, counts)}
+
+
+def expectation_value(state, operator, qubits):
+    return np.vdot(state, apply_gate(state, operator, qubits))
+
+
+def pauli_expectation(state, pauli_string):
+    if set(pauli_string) <= {'I', 'Z'}:
+        signs = 1.0
+        for q, p in enumerate(pauli_string):
+            if p == 'Z':
+                shape = [1] * state.ndim
+                shape[q] = 2
+                signs = signs * np.array([1.0, -1.0]).reshape(shape)
+        return float(np.sum(np.abs(state)**2 * signs))
+
+    transformed = state.copy()
+    for q, p in enumerate(pauli_string):
+        if p != 'I':
+            transformed = apply_gate(transformed, PAULI_MATRICES[p], [q])
+    return float(np.real(np.vdot(state, transformed)))
+
+
+def benchmark_circuits(qubit_counts=(10, 12, 16, 20, 22), dense_limit=12):
+    results = {}
+    for n in qubit_counts:
+        entry = {}
+        if n <= dense_limit:
+            start = time.perf_counter()
+            psi = np.zeros(2**n, dtype=complex)
+            psi[0] = 1.0
+            for q in range(n):
+                H = np.kron(np.kron(np.eye(2**q), hadamard_gate()), np.eye(2**(n - q - 1)))
+                psi = H @ psi
+            quantum_fourier_transform(n) @ psi
+            entry['dense_matrix'] = time.perf_counter() - start
+
+        circuit = QuantumCircuit(n)
+        for q in range(n):
+            circuit.h(q)
+        circuit.qft()
+        start = time.perf_counter()
+        circuit.run()
+        entry['state_vector'] = time.perf_counter() - start
+        results[n] = entry
+    return results
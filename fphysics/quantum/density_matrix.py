@@ -0,0 +1,171 @@
+import time
+import string
+import numpy as np
+from .operators import (pauli_x, pauli_y, pauli_z, quantum_fourier_transform, quantum_channel,
+                        partial_trace_operator)
+
+
+LETTERS = string.ascii_letters
+
+
+def _n_qubits(rho):
+    return int(round(np.log2(rho.shape[-1])))
+
+
+def _tensor(rho):
+    n = _n_qubits(rho)
+    return rho.reshape(rho.shape[:-2] + (2,) * (2 * n)), n
+
+
+def _matrix(tensor, n):
+    return tensor.reshape(tensor.shape[:tensor.ndim - 2 * n] + (2**n, 2**n))
+
+
+def density_matrix(state):
+    psi = np.asarray(state, dtype=complex)
+    return np.einsum('...i,...j->...ij', psi, np.conj(psi))
+
+
+def _sandwich_subscripts(n, qubits, with_index):
+    k = len(qubits)
+    rows, cols = LETTERS[:n], LETTERS[n:2 * n]
+    new_rows, new_cols = LETTERS[2 * n:2 * n + k], LETTERS[2 * n + k:2 * n + 2 * k]
+    index = LETTERS[2 * n + 2 * k] if with_index else ''
+    out_rows, out_cols = list(rows), list(cols)
+    for q, r, c in zip(qubits, new_rows, new_cols):
+        out_rows[q], out_cols[q] = r, c
+    left = '...' + index + new_rows + ''.join(rows[q] for q in qubits)
+    right = '...' + index + new_cols + ''.join(cols[q] for q in qubits)
+    return '%s,...%s%s,%s->...%s%s' % (left, rows, cols, right, ''.join(out_rows),
+                                       ''.join(out_cols))
+
+
+def apply_unitary(rho, U, qubits):
+    T, n = _tensor(np.asarray(rho, dtype=complex))
+    k = len(qubits)
+    U = np.asarray(U, dtype=complex)
+    U = U.reshape(U.shape[:-2] + (2,) * (2 * k))
+    out = np.einsum(_sandwich_subscripts(n, qubits, False), U, T, np.conj(U), optimize='greedy')
+    return _matrix(out, n)
+
+
+def apply_kraus(rho, kraus, qubits):
+    T, n = _tensor(np.asarray(rho, dtype=complex))
+    k = len(qubits)
+    K = np.asarray(kraus, dtype=complex)
+    K = K.reshape(K.shape[:-2] + (2,) * (2 * k))
+    out = np.einsum(_sandwich_subscripts(n, qubits, True), K, T, np.conj(K), optimize='greedy')
+    return _matrix(out, n)
+
+
+def partial_trace(rho, keep):
+    rho = np.asarray(rho)
+    n = _n_qubits(rho)
+    k = len(keep)
+    reduced = partial_trace_operator(rho, [2] * n, [q for q in range(n) if q not in keep])
+    # partial_trace_operator keeps qubits in ascending order; reorder them as listed in keep
+    rank = list(np.argsort(np.argsort(keep)))
+    T, _ = _tensor(reduced)
+    batch = list(range(T.ndim - 2 * k))
+    T = T.transpose(batch + [len(batch) + r for r in rank] + [len(batch) + k + r for r in rank])
+    return _matrix(T, k)
+
+
+def expectation(rho, operator, qubits):
+    reduced = partial_trace(rho, list(qubits))
+    return np.real(np.einsum('ij,...ji->...', np.asarray(operator), reduced))
+
+
+def purity(rho):
+    return np.real(np.einsum('...ij,...ji->...', rho, rho))
+
+
+def von_neumann_entropy(rho):
+    p = np.clip(np.linalg.eigvalsh(rho), 0, None)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -np.sum(np.where(p > 0, p * np.log2(p), 0.0), axis=-1)
+
+
+def state_fidelity(rho, psi):
+    psi = np.asarray(psi, dtype=complex).ravel()
+    return np.real(np.einsum('i,...ij,j->...', np.conj(psi), rho, psi))
+
+
+def _kraus_stack(operators, weights):
+    weights = np.asarray(weights, dtype=float)
+    stack = [np.sqrt(w)[..., None, None] * np.asarray(E, dtype=complex)
+             for E, w in zip(operators, weights)]
+    return np.stack(stack, axis=-3)
+
+
+def dephasing_kraus(gamma):
+    gamma = np.asarray(gamma, dtype=float)
+    return _kraus_stack([np.eye(2), pauli_z()], [1 - gamma, gamma])
+
+
+def amplitude_damping_kraus(gamma):
+    gamma = np.asarray(gamma, dtype=float)
+    E0 = np.zeros(gamma.shape + (2, 2), dtype=complex)
+    E0[..., 0, 0] = 1.0
+    E0[..., 1, 1] = np.sqrt(1 - gamma)
+    E1 = np.zeros_like(E0)
+    E1[..., 0, 1] = np.sqrt(gamma)
+    return np.stack([E0, E1], axis=-3)
+
+
+def depolarizing_kraus(p):
+    p = np.asarray(p, dtype=float)
+    return _kraus_stack([np.eye(2), pauli_x(), pauli_y(), pauli_z()],
+                        [1 - 3 * p / 4, p / 4, p / 4, p / 4])
+
+
+def bit_flip_kraus(p):
+    p = np.asarray(p, dtype=float)
+    return _kraus_stack([np.eye(2), pauli_x()], [1 - p, p])
+
+
+def phase_flip_kraus(p):
+    p = np.asarray(p, dtype=float)
+    return _kraus_stack([np.eye(2), pauli_z()], [1 - p, p])
+
+
+def bit_phase_flip_kraus(p):
+    p = np.asarray(p, dtype=float)
+    return _kraus_stack([np.eye(2), pauli_y()], [1 - p, p])
+
+
+def run_density_matrix(circuit, rho=None, noise=None):
+    n = circuit.n_qubits
+    if rho is None:
+        rho = np.zeros((2**n, 2**n), dtype=complex)
+        rho[0, 0] = 1.0
+    for kind, payload, qubits in circuit.operations:
+        if kind == 'qft':
+            U = quantum_fourier_transform(len(qubits))
+            rho = apply_unitary(rho, np.conj(U).T if payload else U, qubits)
+        else:
+            rho = apply_unitary(rho, payload, qubits)
+        if noise is not None:
+            for q in qubits:
+                rho = apply_kraus(rho, noise, [q])
+    return rho
+
+
+def benchmark_density_matrix(n_qubits=6, n_parameters=64):
+    gammas = np.linspace(0, 1, n_parameters)
+    rho = density_matrix(np.full(2**n_qubits, 2**(-n_qubits / 2)))
+    target = n_qubits // 2
+
+    start = time.perf_counter()
+    for gamma in gammas:
+        E0 = np.sqrt(1 - gamma) * np.eye(2)
+        E1 = np.sqrt(gamma) * pauli_z()
+        full = [np.kron(np.kron(np.eye(2**target), E), np.eye(2**(n_qubits - target - 1)))
+                for E in (E0, E1)]
+        quantum_channel(full, rho)
+    dense_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    apply_kraus(rho, dephasing_kraus(gammas), [target])
+    batched_time = time.perf_counter() - start
+    return {'dense_loop': dense_time, 'batched_local': batched_time}
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy.linalg import expm
 from ..constants import *
 
 def momentum_operator(dx):
@@ -56,6 +57,8 @@ def rotation_operator(theta, n):
     return np.exp(-1j * theta * n)
 
 def time_evolution_operator(H, t):
+    if np.ndim(H) == 2:
+        return expm(-1j * np.asarray(H) * t / REDUCED_PLANCK)
     return np.exp(-1j * H * t / REDUCED_PLANCK)
 
 def parity_operator(psi):
@@ -106,11 +109,8 @@ def controlled_phase_gate(phi):
 
 def quantum_fourier_transform(n):
     N = 2**n
-    qft_matrix = np.zeros((N, N), dtype=complex)
-    for i in range(N):
-        for j in range(N):
-            qft_matrix[i, j] = np.exp(2j * PI * i * j / N) / np.sqrt(N)
-    return qft_matrix
+    k = np.arange(N)
+    return np.exp(2j * PI * (np.outer(k, k) % N) / N) / np.sqrt(N)
 
 def density_matrix_operator(psi):
     return np.outer(psi, np.conj(psi))
@@ -119,11 +119,17 @@ def trace_operator(rho):
     return np.trace(rho)
 
 def partial_trace_operator(rho, dims, subsystem):
-    # Simplified for 2-qubit system
-    if subsystem == 0:
-        return rho[0:2, 0:2] + rho[2:4, 2:4]
-    else:
-        return rho[::2, ::2] + rho[1::2, 1::2]
+    dims = list(dims)
+    n = len(dims)
+    traced = set(np.atleast_1d(subsystem).tolist())
+    keep = [i for i in range(n) if i not in traced]
+    d_keep = int(np.prod([dims[i] for i in keep]))
+    rho = np.asarray(rho)
+    batch = rho.shape[:-2]
+    cols = [n + i if i in keep else i for i in range(n)]
+    reduced = np.einsum(rho.reshape(batch + tuple(dims) * 2), [Ellipsis] + list(range(n)) + cols,
+                        [Ellipsis] + keep + [n + i for i in keep])
+    return reduced.reshape(batch + (d_keep, d_keep))
 
 def fidelity_operator(rho1, rho2):
     return np.trace(np.sqrt(np.sqrt(rho1) @ rho2 @ np.sqrt(rho1)))
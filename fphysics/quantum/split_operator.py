@@ -0,0 +1,116 @@
+import time
+import numpy as np
+from scipy import fft
+from .wave_functions import gaussian_wave_packet
+
+
+def absorbing_mask(grids, width, power=1/8):
+    mask = 1.0
+    for g in np.broadcast_arrays(*grids):
+        lo, hi = g.min(), g.max()
+        depth = np.clip(np.maximum(lo + width - g, g - (hi - width)) / width, 0, 1)
+        mask = mask * np.cos(0.5 * np.pi * depth)**power
+    return mask
+
+
+def wavenumber_grids(shape, spacing):
+    spacing = np.broadcast_to(np.asarray(spacing, dtype=float), (len(shape),))
+    return np.meshgrid(*[2 * np.pi * fft.fftfreq(n, d) for n, d in zip(shape, spacing)],
+                       indexing='ij', sparse=True)
+
+
+class SplitOperatorPropagator:
+    def __init__(self, grids, potential, dt, m=1, hbar=1, absorber_width=0.0, absorber_power=1/8,
+                 workers=None):
+        self.grids = [np.asarray(g, dtype=float) for g in np.broadcast_arrays(*grids)]
+        self.shape = self.grids[0].shape
+        self.ndim = len(self.shape)
+        self.spacing = np.array([np.ptp(g) / (n - 1) for g, n in zip(self.grids, self.shape)])
+        self.dV = np.prod(self.spacing)
+        self.dt = dt
+        self.axes = tuple(range(-self.ndim, 0))
+        self.workers = workers
+
+        k_squared = sum(k**2 for k in wavenumber_grids(self.shape, self.spacing))
+        self._kinetic = np.exp(-1j * hbar * k_squared * dt / (2 * m))
+
+        half = np.exp(-0.5j * np.asarray(potential, dtype=float) * dt / hbar)
+        mask = absorbing_mask(self.grids, absorber_width, absorber_power) if absorber_width else 1.0
+        self._half = np.broadcast_to(half, self.shape)
+        self._half_masked = np.broadcast_to(half * mask, self.shape)
+        self._full_masked = np.broadcast_to(half * half * mask, self.shape)
+
+    def _kinetic_step(self, psi):
+        psi = fft.fftn(psi, axes=self.axes, overwrite_x=True, workers=self.workers)
+        psi *= self._kinetic
+        return fft.ifftn(psi, axes=self.axes, overwrite_x=True, workers=self.workers)
+
+    def _blocks(self, psi, n_steps, every):
+        done = 0
+        while done < n_steps:
+            block = min(every, n_steps - done)
+            psi *= self._half
+            for step in range(block):
+                psi = self._kinetic_step(psi)
+                psi *= self._full_masked if step < block - 1 else self._half_masked
+            done += block
+            yield done * self.dt, psi
+
+    def propagate(self, psi0, n_steps):
+        psi = np.array(psi0, dtype=complex)
+        for _, psi in self._blocks(psi, n_steps, n_steps):
+            pass
+        return psi
+
+    def propagate_steps(self, psi0, n_steps, save_every=1):
+        psi = np.array(psi0, dtype=complex)
+        yield 0.0, psi.copy()
+        for t, psi in self._blocks(psi, n_steps, save_every):
+            yield t, psi.copy()
+
+    def observables(self, psi):
+        density = np.abs(psi)**2 * self.dV
+        norm = np.sum(density, axis=self.axes)
+        position = np.stack([np.sum(density * g, axis=self.axes) for g in self.grids], axis=-1)
+        return norm, position / norm[..., None]
+
+    def run(self, psi0, n_steps, observe_every=1, transmission_region=None):
+        psi = np.array(psi0, dtype=complex)
+        history = {'t': [], 'norm': [], 'position': []}
+        if transmission_region is not None:
+            region = np.broadcast_to(transmission_region, self.shape)
+            history['transmission'] = []
+
+        def record(t, psi):
+            norm, position = self.observables(psi)
+            history['t'].append(t)
+            history['norm'].append(norm)
+            history['position'].append(position)
+            if transmission_region is not None:
+                history['transmission'].append(np.sum(np.abs(psi[..., region])**2, axis=-1) * self.dV)
+
+        record(0.0, psi)
+        for t, psi in self._blocks(psi, n_steps, observe_every):
+            record(t, psi)
+
+        return {key: np.array(value) for key, value in history.items()}, psi
+
+
+def gaussian_packets(x, x0, sigma, k0):
+    x0, sigma, k0 = (np.asarray(v, dtype=float)[..., None] for v in (x0, sigma, k0))
+    return gaussian_wave_packet(np.asarray(x, dtype=float), x0, sigma, k0)
+
+
+def benchmark_split_operator(n_points=(1024, 4096), batch_sizes=(1, 16), n_steps=1000):
+    results = {}
+    for n in n_points:
+        x = np.linspace(-200, 200, n)
+        V = np.where(np.abs(x) < 1, 1.0, 0.0)
+        propagator = SplitOperatorPropagator([x], V, 0.01, absorber_width=20)
+        for batch in batch_sizes:
+            psi0 = gaussian_packets(x, np.full(batch, -50.0), 5.0, np.linspace(0.5, 2.0, batch))
+            start = time.perf_counter()
+            propagator.propagate(psi0, n_steps)
+            elapsed = time.perf_counter() - start
+            results[n, batch] = {'time': elapsed, 'packet_steps_per_second': batch * n_steps / elapsed}
+    return results
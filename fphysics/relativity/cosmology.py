@@ -1,6 +1,7 @@
 import math
 import numpy as np
 from ..constants import *
+from ..astrophysics.distance_tables import cosmology
 
 def hubble_law(distance):
     return HUBBLE_CONSTANT * distance
@@ -11,14 +12,14 @@ def critical_density():
 def age_of_universe(h0=HUBBLE_CONSTANT):
     return 2 / (3 * h0)
 
-def comoving_distance(redshift, h0=HUBBLE_CONSTANT):
-    return SPEED_OF_LIGHT * redshift / h0
+def comoving_distance(redshift, h0=HUBBLE_CONSTANT, matter_density=0.3, lambda_density=0.7):
+    return cosmology(matter_density, lambda_density, h0=h0).comoving_distance(redshift)
 
-def luminosity_distance(redshift):
-    return comoving_distance(redshift) * (1 + redshift)
+def luminosity_distance(redshift, h0=HUBBLE_CONSTANT, matter_density=0.3, lambda_density=0.7):
+    return cosmology(matter_density, lambda_density, h0=h0).luminosity_distance(redshift)
 
-def angular_diameter_distance(redshift):
-    return comoving_distance(redshift) / (1 + redshift)**2
+def angular_diameter_distance(redshift, h0=HUBBLE_CONSTANT, matter_density=0.3, lambda_density=0.7):
+    return cosmology(matter_density, lambda_density, h0=h0).angular_diameter_distance(redshift)
 
 def scale_factor_evolution(time, matter_density=0.3):
     return (time / age_of_universe())**(2/3)
@@ -43,8 +44,8 @@ def jeans_length(temperature, density, mean_molecular_weight=1):
 def schwarzschild_horizon_cosmology(mass):
     return 2 * GRAVITATIONAL_CONSTANT * mass / SPEED_OF_LIGHT**2
 
-def redshift_to_lookback_time(redshift, h0=HUBBLE_CONSTANT):
-    return (2 / (3 * h0)) * (1 - 1/math.sqrt(1 + redshift))
+def redshift_to_lookback_time(redshift, h0=HUBBLE_CONSTANT, matter_density=0.3, lambda_density=0.7):
+    return cosmology(matter_density, lambda_density, h0=h0).lookback_time(redshift)
 
 def density_parameter(density_type, critical_density=CRITICAL_DENSITY_UNIVERSE):
     return density_type / critical_density
@@ -1,5 +1,8 @@
 import math
+import numpy as np
 from ..constants import *
+from ..mathematical.curvature import CurvatureGrid
+from .spacetime import schwarzschild_metric
 
 def schwarzschild_radius(mass):
     return 2 * GRAVITATIONAL_CONSTANT * mass / SPEED_OF_LIGHT**2
@@ -25,6 +28,16 @@ def einstein_field_tensor(mass, radius):
     rs = schwarzschild_radius(mass)
     return -(1 - rs / radius)
 
+def curvature_field(metric, coordinates):
+    return CurvatureGrid(metric, coordinates)
+
+def einstein_tensor_field(metric, coordinates):
+    return CurvatureGrid(metric, coordinates).einstein
+
+def schwarzschild_curvature(mass, r, theta):
+    R, TH = np.meshgrid(r, theta, indexing='ij')
+    return CurvatureGrid(schwarzschild_metric(mass, R, TH), [None, r, theta, None])
+
 def ricci_scalar(mass, radius):
     return 0
 
@@ -0,0 +1,286 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from ..constants import GRAVITATIONAL_CONSTANT, SPEED_OF_LIGHT
+from ..mathematical.curvature import christoffel_from_derivatives
+from ..computational.ode_solvers import dopri5_step
+
+
+ESCAPED, CAPTURED, DISK, UNFINISHED = 0, 1, 2, 3
+
+# Boyer-Lindquist coordinates are singular on the polar axis, so camera rays start at least
+# this fraction of their radius away from it
+POLAR_OFFSET = 1e-8
+
+
+def gravitational_length(mass):
+    return GRAVITATIONAL_CONSTANT * mass / SPEED_OF_LIGHT**2
+
+
+def horizon_radius(spin=0.0, mass=1.0):
+    return mass + np.sqrt(mass**2 - spin**2)
+
+
+def _kerr_functions(r, theta, spin, mass):
+    r, theta = np.broadcast_arrays(np.asarray(r, dtype=float), np.asarray(theta, dtype=float))
+    s, c = np.sin(theta), np.cos(theta)
+    sigma = r**2 + spin**2 * c**2
+    delta = r**2 - 2 * mass * r + spin**2
+    return r, s, c, sigma, delta
+
+
+def kerr_metric(r, theta, spin=0.0, mass=1.0):
+    r, s, c, sigma, delta = _kerr_functions(r, theta, spin, mass)
+    g = np.zeros((4, 4) + r.shape)
+    g[0, 0] = -(1 - 2 * mass * r / sigma)
+    g[0, 3] = g[3, 0] = -2 * mass * spin * r * s**2 / sigma
+    g[1, 1] = sigma / delta
+    g[2, 2] = sigma
+    g[3, 3] = (r**2 + spin**2 + 2 * mass * spin**2 * r * s**2 / sigma) * s**2
+    return g
+
+
+def kerr_inverse_metric(r, theta, spin=0.0, mass=1.0):
+    g = kerr_metric(r, theta, spin, mass)
+    r, s, c, sigma, delta = _kerr_functions(r, theta, spin, mass)
+    det = g[0, 0] * g[3, 3] - g[0, 3]**2
+    g_inv = np.zeros_like(g)
+    g_inv[0, 0] = g[3, 3] / det
+    g_inv[0, 3] = g_inv[3, 0] = -g[0, 3] / det
+    g_inv[3, 3] = g[0, 0] / det
+    g_inv[1, 1] = delta / sigma
+    g_inv[2, 2] = 1 / sigma
+    return g_inv
+
+
+def kerr_metric_derivatives(r, theta, spin=0.0, mass=1.0):
+    r, s, c, sigma, delta = _kerr_functions(r, theta, spin, mass)
+    M, a = mass, spin
+    dsigma_r, dsigma_th = 2 * r, -2 * a**2 * s * c
+    q = (sigma - 2 * r**2) / sigma**2
+
+    dg = np.zeros((4, 4, 4) + r.shape)
+    dg[1, 0, 0] = 2 * M * q
+    dg[2, 0, 0] = -2 * M * r * dsigma_th / sigma**2
+    dg[1, 0, 3] = dg[1, 3, 0] = -2 * M * a * s**2 * q
+    dg[2, 0, 3] = dg[2, 3, 0] = -2 * M * a * r * (2 * s * c * sigma - s**2 * dsigma_th) / sigma**2
+    dg[1, 1, 1] = (dsigma_r * delta - sigma * (2 * r - 2 * M)) / delta**2
+    dg[2, 1, 1] = dsigma_th / delta
+    dg[1, 2, 2] = dsigma_r
+    dg[2, 2, 2] = dsigma_th
+    dg[1, 3, 3] = 2 * r * s**2 + 2 * M * a**2 * s**4 * q
+    dg[2, 3, 3] = (2 * (r**2 + a**2) * s * c
+                   + 2 * M * a**2 * r * (4 * s**3 * c * sigma - s**4 * dsigma_th) / sigma**2)
+    return dg
+
+
+def kerr_christoffel(r, theta, spin=0.0, mass=1.0):
+    return christoffel_from_derivatives(kerr_inverse_metric(r, theta, spin, mass),
+                                        kerr_metric_derivatives(r, theta, spin, mass))
+
+
+def schwarzschild_christoffel(r, theta, mass=1.0):
+    r, theta = np.broadcast_arrays(np.asarray(r, dtype=float), np.asarray(theta, dtype=float))
+    s, c = np.sin(theta), np.cos(theta)
+    f = r - 2 * mass
+    G = np.zeros((4, 4, 4) + r.shape)
+    G[0, 0, 1] = G[0, 1, 0] = mass / (r * f)
+    G[1, 0, 0] = mass * f / r**3
+    G[1, 1, 1] = -mass / (r * f)
+    G[1, 2, 2] = -f
+    G[1, 3, 3] = -f * s**2
+    G[2, 1, 2] = G[2, 2, 1] = 1 / r
+    G[2, 3, 3] = -s * c
+    G[3, 1, 3] = G[3, 3, 1] = 1 / r
+    G[3, 2, 3] = G[3, 3, 2] = c / s
+    return G
+
+
+def schwarzschild_acceleration(y, mass=1.0):
+    r, theta = y[1], y[2]
+    ut, ur, uth, uph = y[4:]
+    s, c = np.sin(theta), np.cos(theta)
+    f = r - 2 * mass
+    return np.array([
+        -2 * mass / (r * f) * ut * ur,
+        -(mass * f / r**3 * ut**2 - mass / (r * f) * ur**2 - f * (uth**2 + s**2 * uph**2)),
+        -(2 / r * ur * uth - s * c * uph**2),
+        -(2 / r * ur * uph + 2 * c / s * uth * uph),
+    ])
+
+
+def kerr_acceleration(y, spin=0.0, mass=1.0):
+    G = kerr_christoffel(y[1], y[2], spin, mass)
+    return -np.einsum('abc...,b...,c...->a...', G, y[4:], y[4:], optimize=True)
+
+
+def _geodesic_rhs(y, spin, mass):
+    if spin == 0:
+        return np.concatenate([y[4:], schwarzschild_acceleration(y, mass)])
+    return np.concatenate([y[4:], kerr_acceleration(y, spin, mass)])
+
+
+def camera_rays(alpha, beta, distance, inclination, spin=0.0, mass=1.0):
+    alpha, beta = np.broadcast_arrays(np.asarray(alpha, dtype=float).ravel(),
+                                      np.asarray(beta, dtype=float).ravel())
+    si, ci = np.sin(inclination), np.cos(inclination)
+    x = distance * si - beta * ci
+    y = alpha
+    z = distance * ci + beta * si
+    vx, vy, vz = si, 0.0, ci
+
+    offset = POLAR_OFFSET * np.sqrt(x**2 + y**2 + z**2)
+    x = np.where(x**2 + y**2 < offset**2, np.where(x >= 0, x + offset, x - offset), x)
+
+    r = np.sqrt(x**2 + y**2 + z**2)
+    rho2 = x**2 + y**2
+    theta = np.arccos(z / r)
+    phi = np.arctan2(y, x)
+    ur = (x * vx + y * vy + z * vz) / r
+    uth = (z * ur - r * vz) / np.sqrt(rho2) / r
+    uph = (x * vy - y * vx) / rho2
+
+    g = kerr_metric(r, theta, spin, mass)
+    A = g[0, 0]
+    B = 2 * g[0, 3] * uph
+    C = g[1, 1] * ur**2 + g[2, 2] * uth**2 + g[3, 3] * uph**2
+    ut = (-B - np.sqrt(B**2 - 4 * A * C)) / (2 * A)
+
+    # trace the photon that reaches the camera backwards along its own path
+    return np.array([np.zeros_like(r), r, theta, phi, -ut, -ur, -uth, -uph])
+
+
+def _dormand_prince_step(rhs, y, k1, h):
+    # the shared batched stepper works on (n, dim) rows; rays are stored as (8, n) columns
+    y_new, K, error = dopri5_step(lambda t, Y: rhs(Y.T).T, 0.0, y.T, k1.T, h)
+    return y_new.T, error.T, K[6].T
+
+
+def trace_rays(y0, spin=0.0, mass=1.0, r_escape=None, disk_inner=None, disk_outer=None,
+               rtol=1e-6, atol=1e-8, max_steps=20000, step_fraction=0.1, horizon_margin=1e-3):
+    y = np.array(y0, dtype=float)
+    n = y.shape[1]
+    r_horizon = horizon_radius(spin, mass) * (1 + horizon_margin)
+    r_escape = 1.01 * np.max(y[1]) if r_escape is None else r_escape
+    with_disk = disk_inner is not None or disk_outer is not None
+    disk_inner = 0.0 if disk_inner is None else disk_inner
+    disk_outer = np.inf if disk_outer is None else disk_outer
+    rhs = lambda state: _geodesic_rhs(state, spin, mass)
+
+    result = {
+        'status': np.full(n, UNFINISHED, dtype=np.int8),
+        'final': np.full((8, n), np.nan),
+        'steps': np.zeros(n, dtype=np.int64),
+        'min_r': y[1].copy(),
+        'disk_radius': np.full(n, np.nan),
+        'disk_phi': np.full(n, np.nan),
+    }
+
+    index = np.arange(n)
+    h = step_fraction * y[1]
+    k1 = rhs(y)
+    min_r = y[1].copy()
+    steps = np.zeros(n, dtype=np.int64)
+    for _ in range(max_steps):
+        if not len(index):
+            break
+        h = np.minimum(h, step_fraction * y[1])
+        y_new, error, k7 = _dormand_prince_step(rhs, y, k1, h)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        with np.errstate(invalid='ignore'):
+            err = np.max(np.abs(error) / scale, axis=0)
+        accept = err <= 1.0
+        with np.errstate(divide='ignore'):
+            h = h * np.clip(0.9 * err**-0.2, 0.2, 5.0)
+
+        status = np.full(len(index), UNFINISHED, dtype=np.int8)
+        if with_disk:
+            c_old, c_new = np.cos(y[2]), np.cos(y_new[2])
+            crossed = accept & (c_old * c_new <= 0) & (c_old != c_new)
+            fraction = np.where(crossed, c_old / np.where(crossed, c_old - c_new, 1.0), 0.0)
+            r_cross = y[1] + fraction * (y_new[1] - y[1])
+            hit = crossed & (r_cross >= disk_inner) & (r_cross <= disk_outer)
+            result['disk_radius'][index[hit]] = r_cross[hit]
+            result['disk_phi'][index[hit]] = (y[3] + fraction * (y_new[3] - y[3]))[hit]
+            status[hit] = DISK
+
+        y[:, accept] = y_new[:, accept]
+        k1[:, accept] = k7[:, accept]
+        steps += accept
+        min_r = np.minimum(min_r, y[1])
+
+        undecided = status == UNFINISHED
+        status[undecided & (y[1] <= r_horizon)] = CAPTURED
+        status[undecided & (y[1] >= r_escape) & (y[5] > 0)] = ESCAPED
+        done = (status != UNFINISHED) | ~np.all(np.isfinite(y), axis=0) | ~np.isfinite(h)
+
+        if np.any(done):
+            finished = index[done]
+            result['status'][finished] = status[done]
+            result['final'][:, finished] = y[:, done]
+            result['steps'][finished] = steps[done]
+            result['min_r'][finished] = min_r[done]
+            keep = ~done
+            index, y, k1, h, steps, min_r = (index[keep], y[:, keep], k1[:, keep], h[keep],
+                                              steps[keep], min_r[keep])
+
+    result['final'][:, index] = y
+    result['steps'][index] = steps
+    result['min_r'][index] = min_r
+    return result
+
+
+def _trace_chunk(alpha_beta, distance, inclination, spin, mass, options):
+    alpha, beta = alpha_beta
+    return trace_rays(camera_rays(alpha, beta, distance, inclination, spin, mass), spin, mass,
+                      **options)
+
+
+def trace_image(alpha, beta, distance=1000.0, inclination=np.pi / 2, spin=0.0, mass=1.0,
+                chunk_size=65536, n_workers=None, **options):
+    alpha, beta = np.broadcast_arrays(np.asarray(alpha, dtype=float), np.asarray(beta, dtype=float))
+    shape = alpha.shape
+    flat_alpha, flat_beta = alpha.ravel(), beta.ravel()
+    chunks = [(flat_alpha[i:i + chunk_size], flat_beta[i:i + chunk_size])
+              for i in range(0, flat_alpha.size, chunk_size)]
+    worker = partial(_trace_chunk, distance=distance, inclination=inclination, spin=spin, mass=mass,
+                     options=options)
+
+    executor = ProcessPoolExecutor(n_workers) if n_workers else None
+    try:
+        parts = list(executor.map(worker, chunks) if executor is not None else map(worker, chunks))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    final = np.concatenate([p['final'] for p in parts], axis=1)
+    image = {key: np.concatenate([p[key] for p in parts]).reshape(shape)
+             for key in ('status', 'steps', 'min_r', 'disk_radius', 'disk_phi')}
+    for i, key in enumerate(('t', 'r', 'theta', 'phi')):
+        image[key] = final[i].reshape(shape)
+    return image
+
+
+def image_plane(width, height, field_of_view):
+    half_w = 0.5 * field_of_view
+    half_h = half_w * height / width
+    return np.meshgrid(np.linspace(-half_w, half_w, width), np.linspace(half_h, -half_h, height))
+
+
+def benchmark_ray_tracing(resolutions=(32, 64, 128), spins=(0.0, 0.9), n_workers=None):
+    results = {}
+    for n in resolutions:
+        alpha, beta = image_plane(n, n, 30.0)
+        for spin in spins:
+            start = time.perf_counter()
+            image = trace_image(alpha, beta, 1000.0, np.radians(80), spin, disk_inner=6.0,
+                                disk_outer=20.0, n_workers=n_workers)
+            elapsed = time.perf_counter() - start
+            results[n, spin] = {
+                'time': elapsed,
+                'rays_per_second': n * n / elapsed,
+                'captured_fraction': float(np.mean(image['status'] == CAPTURED)),
+                'disk_fraction': float(np.mean(image['status'] == DISK)),
+            }
+    return results
@@ -7,11 +7,13 @@ def minkowski_metric():
 
 def schwarzschild_metric(mass, r, theta=0):
     rs = 2 * GRAVITATIONAL_CONSTANT * mass / SPEED_OF_LIGHT**2
-    g_tt = -(1 - rs/r)
-    g_rr = 1 / (1 - rs/r)
-    g_theta = r**2
-    g_phi = r**2 * math.sin(theta)**2
-    return np.diag([g_tt, g_rr, g_theta, g_phi])
+    r, theta = np.broadcast_arrays(np.asarray(r, dtype=float), np.asarray(theta, dtype=float))
+    g = np.zeros((4, 4) + r.shape)
+    g[0, 0] = -(1 - rs/r)
+    g[1, 1] = 1 / (1 - rs/r)
+    g[2, 2] = r**2
+    g[3, 3] = r**2 * np.sin(theta)**2
+    return g
 
 def proper_distance(metric, dx):
     return math.sqrt(np.dot(dx, np.dot(metric, dx)))
@@ -1,6 +1,6 @@
-```python
 import numpy as np
 import cmath
+from itertools import combinations_with_replacement
 
 
 def add_field_mode(creation_operators, annihilation_operators, momentum, energy):
@@ -179,15 +179,7 @@ def casimir_energy(plate_separation, dimensions=3):
 
 
 def generate_occupations(n_particles, n_states):
-    if n_particles == 0:
-        return [[]]
-    
-    occupations = []
-    for i in range(n_states):
-        for sub_occupation in generate_occupations(n_particles - 1, n_states):
-            new_occupation = [i] + sub_occupation
-            occupations.append(new_occupation)
-    return occupations
+    return [list(c) for c in combinations_with_replacement(range(n_states), n_particles)]
 
 
 def create_fock_space(single_particle_states, max_particles):
@@ -199,11 +191,5 @@ def create_fock_space(single_particle_states, max_particles):
 
 
 def many_body_hamiltonian(fock_space_basis, single_particle_energies):
-    hamiltonian = np.zeros((len(fock_space_basis), len(fock_space_basis)))
-    
-    for i, state_i in enumerate(fock_space_basis):
-        for particle in state_i:
-            hamiltonian[i][i] += single_particle_energies[particle]
-            
-    return hamiltonian
-```
+    energies = np.asarray(single_particle_energies, dtype=float)
+    return np.diag([energies[list(state)].sum() for state in fock_space_basis])
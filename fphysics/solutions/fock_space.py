@@ -0,0 +1,267 @@
+import time
+from math import comb
+import numpy as np
+from scipy.sparse import coo_matrix, diags, identity, kron
+from scipy.sparse.linalg import LinearOperator
+from scipy.linalg import eigh_tridiagonal
+
+
+def popcount(x):
+    x = np.asarray(x, dtype=np.uint64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+def _binomial_table(n_modes, n_particles):
+    # comb(m, k) for the combinatorial number system; comb(63, 31) still fits in int64
+    return np.array([[comb(m, k) for k in range(n_particles + 2)] for m in range(n_modes)],
+                    dtype=np.int64).reshape(n_modes, n_particles + 2)
+
+
+def _colex_states(n_modes, n_particles):
+    # subsets of the first m modes in colexicographic order: those without mode m - 1 first,
+    # then those with it; lower particle numbers that can no longer be filled are dropped
+    levels = [np.zeros(1, dtype=np.uint64)] + [np.zeros(0, dtype=np.uint64)] * n_particles
+    for m in range(n_modes):
+        bit = np.uint64(1) << np.uint64(m)
+        for k in range(n_particles, 0, -1):
+            levels[k] = np.concatenate([levels[k], levels[k - 1] | bit])
+        lowest = n_particles - (n_modes - m - 1)
+        for k in range(max(lowest, 0)):
+            levels[k] = np.zeros(0, dtype=np.uint64)
+    return levels[n_particles]
+
+
+class FermionBasis:
+    def __init__(self, n_modes, n_particles):
+        if n_modes > 63:
+            raise ValueError("At most 63 modes fit in a 64-bit occupation string")
+        self.n_modes = n_modes
+        self.n_particles = n_particles
+        self.dimension = comb(n_modes, n_particles)
+        self._binomials = _binomial_table(n_modes, n_particles)
+        self.states = _colex_states(n_modes, n_particles)
+
+    def rank(self, states):
+        # combinatorial number system: the i-th occupied mode p_i contributes comb(p_i, i)
+        states = np.asarray(states, dtype=np.uint64)
+        rank = np.zeros(states.shape, dtype=np.int64)
+        count = np.zeros(states.shape, dtype=np.int64)
+        for m in range(self.n_modes):
+            occupied = ((states >> np.uint64(m)) & np.uint64(1)).astype(bool)
+            count += occupied
+            rank += np.where(occupied, self._binomials[m, np.minimum(count, self.n_particles + 1)], 0)
+        return rank
+
+    def unrank(self, indices):
+        return self.states[indices]
+
+    def occupations(self, states=None):
+        states = self.states if states is None else np.asarray(states, dtype=np.uint64)
+        modes = np.arange(self.n_modes, dtype=np.uint64)
+        return ((states[:, None] >> modes) & np.uint64(1)).astype(np.int8)
+
+    def number(self, mode):
+        return ((self.states >> np.uint64(mode)) & np.uint64(1)).astype(float)
+
+
+def combinatorial_rank(occupied_modes):
+    occupied = np.sort(np.atleast_2d(occupied_modes), axis=1)
+    return sum(np.array([comb(int(p), k + 1) for p in column], dtype=np.int64)
+               for k, column in enumerate(occupied.T))
+
+
+def hopping_matrix_elements(basis, i, j):
+    bit_i, bit_j = np.uint64(1) << np.uint64(i), np.uint64(1) << np.uint64(j)
+    s = basis.states
+    if i == j:
+        rows = np.flatnonzero(s & bit_j)
+        return rows, rows, np.ones(len(rows))
+
+    allowed = ((s & bit_j) != 0) & (((s & bit_i) == 0))
+    cols = np.flatnonzero(allowed)
+    lo, hi = min(i, j), max(i, j)
+    between = np.uint64((2**hi - 1) ^ (2**(lo + 1) - 1))
+    signs = 1.0 - 2.0 * (popcount(s[cols] & between) % 2)
+    rows = basis.rank(s[cols] ^ bit_i ^ bit_j)
+    return rows, cols, signs
+
+
+def one_body_operator(basis, matrix):
+    matrix = np.asarray(matrix)
+    rows, cols, values = [], [], []
+    for i, j in zip(*np.nonzero(matrix)):
+        r, c, v = hopping_matrix_elements(basis, i, j)
+        rows.append(r)
+        cols.append(c)
+        values.append(matrix[i, j] * v)
+    D = basis.dimension
+    if not rows:
+        return coo_matrix((D, D)).tocsr()
+    return coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                      shape=(D, D)).tocsr()
+
+
+def lattice_hopping(n_sites, t=1.0, periodic=True):
+    T = np.zeros((n_sites, n_sites))
+    for i in range(n_sites - 1 + bool(periodic and n_sites > 2)):
+        j = (i + 1) % n_sites
+        T[i, j] = T[j, i] = -t
+    return T
+
+
+class HubbardModel:
+    def __init__(self, hopping, n_up, n_down, interaction):
+        hopping = np.asarray(hopping, dtype=float)
+        self.n_sites = hopping.shape[0]
+        self.up = FermionBasis(self.n_sites, n_up)
+        self.down = FermionBasis(self.n_sites, n_down)
+        self.shape = (self.up.dimension, self.down.dimension)
+        self.dimension = self.shape[0] * self.shape[1]
+        self.interaction = interaction
+
+        self.kinetic_up = one_body_operator(self.up, hopping)
+        self.kinetic_down = one_body_operator(self.down, hopping)
+        self._occupations_up = self.up.occupations().astype(float)
+        self._occupations_down = self.down.occupations().astype(float)
+        self._interaction_diagonal = interaction * self.double_occupancy()
+
+    def double_occupancy(self):
+        return self._occupations_up @ self._occupations_down.T
+
+    def matvec(self, v):
+        V = np.asarray(v).reshape(self.shape)
+        out = self.kinetic_up @ V + (self.kinetic_down @ V.T).T
+        out += self._interaction_diagonal * V
+        return out.ravel()
+
+    def operator(self):
+        D = self.dimension
+        return LinearOperator((D, D), matvec=self.matvec, dtype=float)
+
+    def sparse(self):
+        I_up = identity(self.shape[0], format='csr')
+        I_down = identity(self.shape[1], format='csr')
+        return (kron(self.kinetic_up, I_down) + kron(I_up, self.kinetic_down)
+                + diags(self._interaction_diagonal.ravel())).tocsr()
+
+
+class BosonBasis:
+    def __init__(self, n_modes, n_particles):
+        self.n_modes = n_modes
+        self.n_particles = n_particles
+        self._encoding = FermionBasis(n_modes + n_particles - 1, n_particles)
+        self.dimension = self._encoding.dimension
+        self.states = self.decode(self._encoding.states)
+
+    def encode(self, occupations):
+        occupations = np.atleast_2d(occupations).astype(np.int64)
+        positions = np.cumsum(occupations, axis=1)[:, :-1] + np.arange(self.n_modes - 1)
+        bars = np.bitwise_or.reduce(np.uint64(1) << positions.astype(np.uint64), axis=1) \
+            if self.n_modes > 1 else np.zeros(len(occupations), dtype=np.uint64)
+        full = np.uint64(2**(self.n_modes + self.n_particles - 1) - 1)
+        return ~bars & full
+
+    def decode(self, codes):
+        codes = np.asarray(codes, dtype=np.uint64)
+        n_bits = self.n_modes + self.n_particles - 1
+        bits = ((codes[:, None] >> np.arange(n_bits, dtype=np.uint64)) & np.uint64(1)).astype(bool)
+        mode = np.cumsum(~bits, axis=1) - ~bits
+        occupations = np.zeros((len(codes), self.n_modes), dtype=np.int64)
+        rows = np.broadcast_to(np.arange(len(codes))[:, None], bits.shape)
+        np.add.at(occupations, (rows[bits], mode[bits]), 1)
+        return occupations
+
+    def rank(self, occupations):
+        return self._encoding.rank(self.encode(occupations))
+
+
+def boson_hopping_matrix_elements(basis, i, j):
+    n = basis.states
+    if i == j:
+        rows = np.arange(basis.dimension)
+        return rows, rows, n[:, j].astype(float)
+    cols = np.flatnonzero(n[:, j] > 0)
+    target = n[cols].copy()
+    values = np.sqrt(target[:, j] * (target[:, i] + 1.0))
+    target[:, j] -= 1
+    target[:, i] += 1
+    return basis.rank(target), cols, values
+
+
+def bose_hubbard_hamiltonian(hopping, n_particles, interaction, chemical_potential=0.0):
+    hopping = np.asarray(hopping, dtype=float)
+    basis = BosonBasis(hopping.shape[0], n_particles)
+    rows, cols, values = [], [], []
+    for i, j in zip(*np.nonzero(hopping)):
+        r, c, v = boson_hopping_matrix_elements(basis, i, j)
+        rows.append(r)
+        cols.append(c)
+        values.append(hopping[i, j] * v)
+
+    n = basis.states.astype(float)
+    diagonal = 0.5 * interaction * np.sum(n * (n - 1), axis=1) - chemical_potential * n_particles
+    D = basis.dimension
+    H = diags(diagonal)
+    if rows:
+        H = H + coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                           shape=(D, D))
+    return H.tocsr(), basis
+
+
+def lanczos_ground_state(H, v0=None, max_iter=300, tol=1e-10, seed=None):
+    matvec = H.matvec if hasattr(H, 'matvec') else (lambda x: H @ x)
+    D = H.shape[0]
+    rng = np.random.default_rng(seed)
+    start = rng.normal(size=D) if v0 is None else np.array(v0, dtype=float)
+    start /= np.linalg.norm(start)
+
+    alphas, betas = [], []
+    v_prev, v = np.zeros(D), start.copy()
+    energy = np.inf
+    for k in range(max_iter):
+        w = matvec(v)
+        alpha = v @ w
+        w -= alpha * v + (betas[-1] * v_prev if betas else 0.0)
+        alphas.append(alpha)
+        beta = np.linalg.norm(w)
+
+        new_energy = eigh_tridiagonal(alphas, betas, eigvals_only=True,
+                                      select='i', select_range=(0, 0))[0]
+        converged = abs(new_energy - energy) < tol * max(1.0, abs(new_energy))
+        energy = new_energy
+        if converged or beta < 1e-14:
+            break
+        betas.append(beta)
+        v_prev, v = v, w / beta
+
+    energies, vectors = eigh_tridiagonal(alphas, betas[:len(alphas) - 1], select='i',
+                                         select_range=(0, 0))
+    coefficients = vectors[:, 0]
+
+    ground = coefficients[0] * start
+    v_prev, v = np.zeros(D), start.copy()
+    for k in range(len(alphas) - 1):
+        w = matvec(v) - alphas[k] * v - (betas[k - 1] * v_prev if k else 0.0)
+        v_prev, v = v, w / betas[k]
+        ground += coefficients[k + 1] * v
+
+    return energies[0], ground / np.linalg.norm(ground)
+
+
+def benchmark_fock_space(chain_lengths=(8, 10, 12), interaction=4.0):
+    results = {}
+    for L in chain_lengths:
+        start = time.perf_counter()
+        model = HubbardModel(lattice_hopping(L), L // 2, L // 2, interaction)
+        build_time = time.perf_counter() - start
+        energy, _ = lanczos_ground_state(model.operator(), seed=0)
+        results[L] = {
+            'dimension': model.dimension,
+            'build': build_time,
+            'lanczos': time.perf_counter() - start - build_time,
+            'energy_per_site': energy / L,
+        }
+    return results
@@ -1,4 +1,5 @@
 from ..constants import *
+from ..computational.nbody import integrate_nbody
 import numpy as np
 from typing import List, Tuple
 
@@ -47,34 +48,19 @@ def simulate_spring_mass_system(mass, spring_constant, initial_displacement, tim
     return times, positions
 
 def simulate_orbital_motion(central_mass, orbital_mass, initial_position, initial_velocity, time_duration=100, time_step=0.01):
-    positions = [initial_position]
-    velocities = [initial_velocity]
-    
-    x, y = initial_position
-    vx, vy = initial_velocity
-    
+    mu = GRAVITATIONAL_CONSTANT * central_mass
+
+    def central_acceleration(positions):
+        r = np.linalg.norm(positions, axis=1, keepdims=True)
+        return -mu * positions / r**3
+
     times = np.arange(0, time_duration, time_step)
-    
-    for t in times[1:]:
-        r = np.sqrt(x**2 + y**2)
-        force_magnitude = GRAVITATIONAL_CONSTANT * central_mass * orbital_mass / r**2
-        
-        fx = -force_magnitude * x / r
-        fy = -force_magnitude * y / r
-        
-        ax = fx / orbital_mass
-        ay = fy / orbital_mass
-        
-        vx += ax * time_step
-        vy += ay * time_step
-        
-        x += vx * time_step
-        y += vy * time_step
-        
-        positions.append((x, y))
-        velocities.append((vx, vy))
-    
-    return times, positions, velocities
+    _, positions, velocities = integrate_nbody(
+        [initial_position], [initial_velocity], [orbital_mass], time_step, len(times) - 1,
+        acceleration=central_acceleration
+    )
+
+    return times, positions[:, 0], velocities[:, 0]
 
 def simulate_wave_propagation(amplitude, frequency, wavelength, time_duration=5, space_points=100, time_step=0.01):
     x_points = np.linspace(0, wavelength * 3, space_points)
@@ -122,12 +108,5 @@ def simulate_electric_field(charges_positions, test_charge_position, grid_size=5
 
 def simulate_radioactive_decay(initial_quantity, decay_constant, time_duration=100, time_step=0.1):
     times = np.arange(0, time_duration, time_step)
-    quantities = []
-    
-    current_quantity = initial_quantity
-    
-    for t in times:
-        quantities.append(current_quantity)
-        current_quantity = initial_quantity * np.exp(-decay_constant * t)
-    
+    quantities = initial_quantity * np.exp(-decay_constant * times)
     return times, quantities
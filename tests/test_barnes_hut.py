@@ -0,0 +1,16 @@
+import numpy as np
+
+from fphysics.computational.barnes_hut import barnes_hut_accelerations
+from fphysics.computational.nbody import pairwise_accelerations
+
+
+def test_barnes_hut_matches_direct_sum():
+    rng = np.random.default_rng(0)
+    positions = rng.normal(size=(500, 3))
+    masses = rng.uniform(1, 2, 500)
+    direct = pairwise_accelerations(positions, masses, G=1.0)
+    np.testing.assert_allclose(barnes_hut_accelerations(positions, masses, theta=0.0, G=1.0), direct,
+                               atol=1e-10)
+    approximate = barnes_hut_accelerations(positions, masses, theta=0.3, G=1.0)
+    relative = np.linalg.norm(approximate - direct, axis=1) / np.linalg.norm(direct, axis=1)
+    assert np.median(relative) < 1e-3
@@ -0,0 +1,34 @@
+import numpy as np
+
+from fphysics.quantum.bound_states import bound_state_sweep, bound_states
+
+
+def harmonic_grid(n, half_width=8.0):
+    x = np.linspace(-half_width, half_width, n)
+    return x, x[1] - x[0]
+
+
+def test_harmonic_oscillator_1d():
+    x, dx = harmonic_grid(2001)
+    energies, states = bound_states(0.5 * x**2, dx, k=5)
+    np.testing.assert_allclose(energies, np.arange(5) + 0.5, atol=1e-4)
+    np.testing.assert_allclose(np.sum(states**2, axis=1) * dx, 1.0)
+    np.testing.assert_allclose(np.abs(states[0]), np.pi**-0.25 * np.exp(-x**2 / 2), atol=1e-4)
+
+
+def test_harmonic_oscillator_2d_degeneracies():
+    x, dx = harmonic_grid(161)
+    X, Y = np.meshgrid(x, x, indexing='ij')
+    energies, _ = bound_states(0.5 * (X**2 + Y**2), dx, k=6)
+    np.testing.assert_allclose(energies, [1, 2, 2, 3, 3, 3], atol=5e-3)
+
+
+def test_lanczos_and_sweep_agree_with_shift_invert():
+    x, dx = harmonic_grid(801)
+    potentials = [0.5 * w**2 * x**2 for w in (0.8, 1.0, 1.3)]
+    direct = [bound_states(V, dx, k=4)[0] for V in potentials]
+    lanczos = [bound_states(V, dx, k=4, method='lanczos')[0] for V in potentials]
+    swept, _ = bound_state_sweep(potentials, dx, k=4)
+    np.testing.assert_allclose(lanczos, direct, rtol=1e-9)
+    np.testing.assert_allclose(swept, direct, rtol=1e-9)
+    np.testing.assert_allclose(swept[:, 0], 0.5 * np.array([0.8, 1.0, 1.3]), rtol=1e-3)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from fphysics.quantum.circuits import QuantumCircuit, pauli_expectation, zero_state
+
+HADAMARD = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+CNOT = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])
+
+
+def embed(gate, first, n):
+    # qubit 0 is the most significant bit of the flattened state
+    k = int(np.log2(gate.shape[0]))
+    return np.kron(np.kron(np.eye(2**first), gate), np.eye(2**(n - first - k)))
+
+
+def ry(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]])
+
+
+def test_random_circuit_matches_dense_kronecker_reference():
+    n = 5
+    rng = np.random.default_rng(3)
+    circuit = QuantumCircuit(n)
+    reference = np.eye(2**n, dtype=complex)
+    for _ in range(30):
+        q = int(rng.integers(n - 1))
+        theta = rng.uniform(0, 2 * np.pi)
+        circuit.h(q)
+        circuit.ry(theta, q + 1)
+        circuit.cx(q, q + 1)
+        reference = embed(CNOT, q, n) @ embed(ry(theta), q + 1, n) @ embed(HADAMARD, q, n) @ reference
+
+    expected = reference[:, 0]
+    np.testing.assert_allclose(circuit.run(fuse=False).ravel(), expected, atol=1e-12)
+    np.testing.assert_allclose(circuit.run(fuse=True).ravel(), expected, atol=1e-12)
+    np.testing.assert_allclose(circuit.unitary(), reference, atol=1e-12)
+
+
+@pytest.mark.parametrize("n", [1, 3, 5])
+def test_qft_is_discrete_fourier_transform(n):
+    circuit = QuantumCircuit(n)
+    circuit.qft()
+    N = 2**n
+    dft = np.exp(2j * np.pi * np.outer(np.arange(N), np.arange(N)) / N) / np.sqrt(N)
+    np.testing.assert_allclose(circuit.unitary(), dft, atol=1e-12)
+
+
+def test_ghz_state_correlations():
+    circuit = QuantumCircuit(4)
+    circuit.h(0)
+    for q in range(3):
+        circuit.cx(q, q + 1)
+    state = circuit.run()
+    expected = zero_state(4)
+    expected[(0,) * 4] = expected[(1,) * 4] = 1 / np.sqrt(2)
+    np.testing.assert_allclose(state, expected, atol=1e-12)
+    assert pauli_expectation(state, 'ZZII') == pytest.approx(1.0)
+    assert pauli_expectation(state, 'XXXX') == pytest.approx(1.0)
+    assert pauli_expectation(state, 'ZIII') == pytest.approx(0.0, abs=1e-12)
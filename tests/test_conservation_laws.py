@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from fphysics.computational.conservation_laws import (
+    advection_law,
+    burgers_law,
+    conservation_law_steps,
+    shallow_water_law,
+    solve_conservation_law,
+)
+
+
+# SSP-RK3 needs a smaller CFL number for its time error to stay below WENO5's
+SCHEMES = [("godunov", 1, 0.4), ("muscl", 2, 0.4), ("weno5", 3, 0.2)]
+GAUSS_POINTS, GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(5)
+
+
+def cell_averages(profile, n, length=2.0):
+    dx = length / n
+    centers = (np.arange(n) + 0.5) * dx
+    points = centers[:, None] + 0.5 * dx * GAUSS_POINTS
+    return 0.5 * profile(points) @ GAUSS_WEIGHTS, dx
+
+
+def initial_profile(x):
+    return 1.0 + 0.5 * np.sin(np.pi * x)
+
+
+def burgers_exact(x, t):
+    # smooth solution before the shock forms at t = 2 / pi, from u = u0(x - u t)
+    u = initial_profile(x)
+    for _ in range(50):
+        residual = u - initial_profile(x - u * t)
+        derivative = 1 + 0.5 * np.pi * t * np.cos(np.pi * (x - u * t))
+        u = u - residual / derivative
+    return u
+
+
+def l1_errors(law, exact, scheme, sizes, t_final, cfl):
+    errors = []
+    for n in sizes:
+        u0, dx = cell_averages(initial_profile, n)
+        _, U = solve_conservation_law(law, u0, dx, t_final, n_snapshots=2, scheme=scheme,
+                                      riemann='exact', bc='periodic', cfl=cfl)
+        reference, _ = cell_averages(lambda x: exact(x, t_final), n)
+        errors.append(np.mean(np.abs(U[-1] - reference)))
+    errors = np.array(errors)
+    return np.log2(errors[:-1] / errors[1:])
+
+
+@pytest.mark.parametrize("scheme, order, cfl", SCHEMES)
+def test_advection_convergence_order(scheme, order, cfl):
+    exact = lambda x, t: initial_profile(x - t)
+    orders = l1_errors(advection_law(1.0), exact, scheme, (40, 80, 160), 0.5, cfl)
+    assert orders[-1] > order - 0.2
+
+
+@pytest.mark.parametrize("scheme, order, cfl", SCHEMES)
+def test_burgers_convergence_order_before_shock(scheme, order, cfl):
+    orders = l1_errors(burgers_law(), burgers_exact, scheme, (40, 80, 160), 0.3, cfl)
+    assert orders[-1] > order - 0.2
+
+
+def dam_break_middle_state(h_left, h_right, gravity):
+    # left rarefaction meets a right shock at depth h_star moving with velocity u_star
+    h = 0.5 * (h_left + h_right)
+    for _ in range(100):
+        rarefaction = 2 * (np.sqrt(gravity * h_left) - np.sqrt(gravity * h))
+        shock = (h - h_right) * np.sqrt(0.5 * gravity * (1 / h + 1 / h_right))
+        derivative = (-np.sqrt(gravity / h)
+                      - np.sqrt(0.5 * gravity * (1 / h + 1 / h_right))
+                      + (h - h_right) * 0.25 * gravity / h**2
+                      / np.sqrt(0.5 * gravity * (1 / h + 1 / h_right)))
+        h -= (rarefaction - shock) / derivative
+    return h, 2 * (np.sqrt(gravity * h_left) - np.sqrt(gravity * h))
+
+
+def test_dam_break_matches_stoker_solution():
+    gravity, n, t_final = 9.81, 800, 0.1
+    x = (np.arange(n) + 0.5) / n - 0.5
+    h0 = np.where(x < 0, 2.0, 1.0)
+    U0 = np.array([h0, np.zeros(n)])
+    _, U = solve_conservation_law(shallow_water_law(gravity), U0, 1 / n, t_final, n_snapshots=2,
+                                  scheme='muscl')
+    h, hu = U[-1]
+    h_star, u_star = dam_break_middle_state(2.0, 1.0, gravity)
+    shock_speed = h_star * u_star / (h_star - 1.0)
+    plateau = (x > 0.2 * u_star * t_final) & (x < 0.8 * shock_speed * t_final)
+    np.testing.assert_allclose(h[plateau], h_star, rtol=5e-3)
+    np.testing.assert_allclose(hu[plateau] / h[plateau], u_star, rtol=1e-2)
+    shock_position = x[np.argmax(h < 0.5 * (h_star + 1.0))]
+    assert shock_position == pytest.approx(shock_speed * t_final, abs=3 / n)
+    assert np.sum(h) == pytest.approx(np.sum(h0))
+
+
+def test_max_steps_raises_instead_of_truncating():
+    u0, dx = cell_averages(initial_profile, 50)
+    steps = conservation_law_steps(burgers_law(), u0, dx, 1.0, n_snapshots=2, max_steps=5,
+                                   bc='periodic')
+    next(steps)
+    with pytest.raises(RuntimeError, match="max_steps"):
+        next(steps)
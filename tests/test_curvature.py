@@ -0,0 +1,59 @@
+import numpy as np
+
+from fphysics.mathematical import tensor_calculus
+from fphysics.mathematical.curvature import CurvatureGrid
+
+
+def sphere(radius, n=401):
+    theta = np.linspace(0.3, 2.8, n)
+    metric = np.zeros((2, 2, n))
+    metric[0, 0] = radius**2
+    metric[1, 1] = (radius * np.sin(theta))**2
+    return theta, CurvatureGrid(metric, [theta, None])
+
+
+def test_sphere_christoffel_symbols():
+    theta, grid = sphere(2.0)
+    interior = slice(1, -1)
+    np.testing.assert_allclose(grid.christoffel[0, 1, 1][interior], (-np.sin(theta) * np.cos(theta))[interior],
+                               atol=1e-4)
+    np.testing.assert_allclose(grid.christoffel[1, 0, 1][interior], (1 / np.tan(theta))[interior], atol=1e-4)
+    np.testing.assert_allclose(grid.christoffel[1, 1, 0], grid.christoffel[1, 0, 1])
+
+
+def test_sphere_ricci_scalar():
+    _, grid = sphere(2.0)
+    np.testing.assert_allclose(grid.ricci_scalar[2:-2], 2 / 2.0**2, rtol=5e-3)
+
+
+def test_schwarzschild_is_ricci_flat_with_kretschmann_scalar():
+    mass = 1.0
+    r = np.linspace(3, 10, 81)
+    theta = np.linspace(0.5, 2.6, 81)
+    R, T = np.meshgrid(r, theta, indexing='ij')
+    metric = np.zeros((4, 4) + R.shape)
+    metric[0, 0] = -(1 - 2 * mass / R)
+    metric[1, 1] = 1 / (1 - 2 * mass / R)
+    metric[2, 2] = R**2
+    metric[3, 3] = (R * np.sin(T))**2
+    grid = CurvatureGrid(metric, [None, r, theta, None])
+    interior = (slice(2, -2), slice(2, -2))
+    np.testing.assert_allclose(grid.kretschmann[interior], (48 * mass**2 / R**6)[interior], rtol=2e-2)
+    assert np.max(np.abs(grid.ricci[(Ellipsis,) + interior])) < 2e-2
+
+
+def test_tensor_calculus_accepts_one_entry_per_coordinate():
+    theta = np.linspace(0.3, 2.8, 401)
+    metric = np.zeros((2, 2, len(theta)))
+    metric[0, 0] = 4.0
+    metric[1, 1] = 4.0 * np.sin(theta)**2
+    expected = CurvatureGrid(metric, [theta, None]).christoffel
+    # phi is held fixed along the sampled curve, either as a scalar or as a constant array
+    for phi in (0.0, np.zeros_like(theta)):
+        np.testing.assert_allclose(tensor_calculus.christoffel_symbols(metric, [theta, phi]), expected)
+
+    flat = tensor_calculus.metric_tensor_minkowski()
+    gamma = tensor_calculus.christoffel_symbols(flat, [0.0, 1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(gamma, np.zeros((4, 4, 4)))
+    np.testing.assert_array_equal(tensor_calculus.riemann_tensor(gamma, [0.0, 1.0, 2.0, 3.0]),
+                                  np.zeros((4, 4, 4, 4)))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from scipy.linalg import expm
+
+from fphysics.nuclear.decay import DecayChain, solve_inventory, transmutation_matrix
+
+
+def branching_chain():
+    return DecayChain(['A', 'B', 'C', 'D', 'E'], [10.0, 3.0, 50.0, 0.5, np.inf],
+                      [('A', 'B', 0.7), ('A', 'C', 0.3), ('B', 'D', 1.0), ('C', 'D', 1.0), ('D', 'E', 1.0)])
+
+
+def test_two_member_chain_matches_bateman_formula():
+    chain = DecayChain(['P', 'D', 'G'], [2.0, 5.0, np.inf], [('P', 'D', 1.0), ('D', 'G', 1.0)])
+    lam1, lam2 = chain.decay_constants[:2]
+    t = np.array([0.0, 1.0, 4.0, 20.0])
+    expected = lam1 / (lam2 - lam1) * (np.exp(-lam1 * t) - np.exp(-lam2 * t))
+    for method in ('bateman', 'cram', 'expm'):
+        np.testing.assert_allclose(chain.solve({'P': 1.0}, t, method)[:, 1], expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", ["bateman", "cram", "expm"])
+def test_batched_inventories_match_dense_expm(method):
+    chain = branching_chain()
+    A = chain.matrix()
+    n0 = np.random.default_rng(1).uniform(0, 1, (5, 3))
+    times = np.array([0.0, 0.3, 2.0, 7.5, 40.0])
+    expected = np.array([expm(A.toarray() * t) @ n0 for t in times])
+    np.testing.assert_allclose(chain.solve(n0, times, method), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_cram_handles_stiff_chain_and_unsorted_times():
+    half_lives = np.array([1e-3, 1e9, 1.0, 1e5, np.inf])
+    A = transmutation_matrix(np.log(2) / half_lives, [(i, i + 1, 1.0) for i in range(4)])
+    n0 = np.array([1.0, 0.0, 0.0, 0.0, 0.0])
+    times = np.array([1e6, 10.0, 1e3])
+    expected = np.array([expm(A.toarray() * t) @ n0 for t in times])
+    np.testing.assert_allclose(solve_inventory(A, n0, times, 'cram'), expected, rtol=1e-10, atol=1e-14)
+    assert solve_inventory(A, n0, times, 'cram').sum(axis=1) == pytest.approx(1.0, abs=1e-12)
+
+
+def test_constant_source_approaches_equilibrium():
+    chain = DecayChain(['X', 'Y'], [4.0, np.inf], [('X', 'Y', 1.0)])
+    out = chain.solve({'X': 0.0}, [200.0], 'cram', source={'X': 3.0})
+    assert out[0, 0] == pytest.approx(3.0 / chain.decay_constants[0], rel=1e-10)
+    assert out[0, 0] + out[0, 1] == pytest.approx(600.0, rel=1e-10)
+
+
+@pytest.mark.parametrize("gap", [0.0, 1e-13])
+def test_bateman_rejects_nearly_equal_decay_constants(gap):
+    chain = DecayChain(['A', 'B', 'C'], [1.0, 1.0 * (1 + gap), np.inf], [('A', 'B', 1.0), ('B', 'C', 1.0)])
+    with pytest.raises(ValueError, match="method='cram'"):
+        chain.solve({'A': 1.0}, [2.0], 'bateman')
+    # the degenerate limit is lam t exp(-lam t)
+    lam = chain.decay_constants[0]
+    assert chain.solve({'A': 1.0}, [2.0], 'cram')[0, 1] == pytest.approx(2 * lam * np.exp(-2 * lam),
+                                                                          rel=1e-10)
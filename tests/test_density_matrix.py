@@ -0,0 +1,62 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from fphysics.quantum.density_matrix import density_matrix, partial_trace
+from fphysics.quantum.operators import partial_trace_operator
+
+
+def random_density(dim, rng, batch=()):
+    A = rng.normal(size=batch + (dim, dim)) + 1j * rng.normal(size=batch + (dim, dim))
+    rho = A @ np.conj(np.swapaxes(A, -1, -2))
+    return rho / np.trace(rho, axis1=-2, axis2=-1)[..., None, None]
+
+
+def reference_partial_trace(rho, dims, keep):
+    # sum over the traced indices explicitly, keeping subsystems in the order given
+    n = len(dims)
+    T = rho.reshape(tuple(dims) * 2)
+    traced = [i for i in range(n) if i not in keep]
+    d_keep = int(np.prod([dims[i] for i in keep]))
+    out = np.zeros((d_keep, d_keep), dtype=complex)
+    for row in itertools.product(*[range(dims[i]) for i in keep]):
+        for col in itertools.product(*[range(dims[i]) for i in keep]):
+            total = 0
+            for t in itertools.product(*[range(dims[i]) for i in traced]):
+                r, c = [0] * n, [0] * n
+                for i, v in zip(keep, row):
+                    r[i] = v
+                for i, v in zip(keep, col):
+                    c[i] = v
+                for i, v in zip(traced, t):
+                    r[i] = c[i] = v
+                total += T[tuple(r + c)]
+            out[np.ravel_multi_index(row, [dims[i] for i in keep]),
+                np.ravel_multi_index(col, [dims[i] for i in keep])] = total
+    return out
+
+
+@pytest.mark.parametrize("traced", [[0], [1], [2], [0, 2], [0, 1, 2]])
+def test_partial_trace_operator_mixed_dimensions(traced):
+    rng = np.random.default_rng(0)
+    dims = [2, 3, 2]
+    rho = random_density(12, rng)
+    keep = [i for i in range(3) if i not in traced]
+    np.testing.assert_allclose(partial_trace_operator(rho, dims, traced),
+                               reference_partial_trace(rho, dims, keep), atol=1e-12)
+
+
+@pytest.mark.parametrize("keep", [[0], [2], [0, 2], [2, 0], [1, 2, 0]])
+def test_partial_trace_keeps_requested_qubit_order(keep):
+    rng = np.random.default_rng(1)
+    rho = random_density(8, rng, batch=(4,))
+    reduced = partial_trace(rho, keep)
+    for b in range(4):
+        np.testing.assert_allclose(reduced[b], reference_partial_trace(rho[b], [2, 2, 2], keep),
+                                   atol=1e-12)
+
+
+def test_partial_trace_of_bell_state_is_maximally_mixed():
+    bell = np.array([1, 0, 0, 1]) / np.sqrt(2)
+    np.testing.assert_allclose(partial_trace(density_matrix(bell), [0]), np.eye(2) / 2)
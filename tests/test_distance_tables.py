@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from fphysics.astrophysics.distance_tables import cosmology
+
+
+def comoving_reference(engine, z):
+    return engine.hubble_distance * quad(lambda s: 1 / engine.efunc(s), 0, z, epsabs=0, epsrel=1e-12)[0]
+
+
+@pytest.mark.parametrize("z", [0.01, 0.5, 3.0, 1000.0])
+def test_comoving_distance_matches_quadrature(z):
+    engine = cosmology()
+    assert engine.comoving_distance(z) == pytest.approx(comoving_reference(engine, z), rel=1e-9)
+
+
+def test_large_redshift_query_leaves_cached_table_unchanged():
+    engine = cosmology(omega_m=0.3, omega_lambda=0.7)
+    z_max, comoving = engine.z_max, engine._comoving
+    low = engine.comoving_distance(np.array([0.5, 2.0]))
+
+    high = engine.comoving_distance(5000.0)
+    assert high == pytest.approx(comoving_reference(engine, 5000.0), rel=1e-9)
+    assert cosmology(omega_m=0.3, omega_lambda=0.7) is engine
+    assert engine.z_max == z_max and engine._comoving is comoving
+    np.testing.assert_array_equal(engine.comoving_distance(np.array([0.5, 2.0])), low)
+
+
+@pytest.mark.parametrize("z", [[0.5, np.nan, 2.0], [0.5, np.nan, 5000.0], [np.nan, np.nan]])
+def test_missing_redshifts_give_nan_distances(z):
+    engine = cosmology()
+    z = np.array(z)
+    missing = np.isnan(z)
+    for method in (engine.comoving_distance, engine.luminosity_distance, engine.lookback_time):
+        values = method(z)
+        assert np.all(np.isnan(values[missing]))
+        np.testing.assert_array_equal(values[~missing], method(z[~missing]))
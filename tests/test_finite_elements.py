@@ -0,0 +1,41 @@
+import math
+
+import numpy as np
+import pytest
+
+from fphysics.computational.finite_elements import linear_fem_1d, quadratic_fem_1d
+
+
+def exact_uniform_load(x, length=1.0):
+    # -u'' = 1 with u(0) = u(L) = 0
+    return 0.5 * x * (length - x)
+
+
+@pytest.mark.parametrize("fem, nodes_per_element", [(linear_fem_1d, 1), (quadratic_fem_1d, 2)])
+def test_uniform_load_matches_analytic(fem, nodes_per_element):
+    n = 64
+    last = nodes_per_element * n
+    u = fem(n, 1.0, lambda xi, xj: 1.0, {0: 0.0, last: 0.0})
+    x = np.linspace(0, 1, last + 1)
+    np.testing.assert_allclose(u, exact_uniform_load(x), atol=1e-3)
+
+
+@pytest.mark.parametrize("fem", [linear_fem_1d, quadratic_fem_1d])
+@pytest.mark.parametrize("load", [
+    lambda a, b: math.sin(a),
+    lambda a, b: 1.0 if a < 0.5 else 0.0,
+])
+def test_scalar_only_load_callbacks(fem, load):
+    n = 16
+    last = n if fem is linear_fem_1d else 2 * n
+    u = fem(n, 1.0, load, {0: 0.0, last: 0.0})
+    vectorized = fem(n, 1.0, np.vectorize(load, otypes=[float]), {0: 0.0, last: 0.0})
+    np.testing.assert_allclose(u, vectorized)
+
+
+def test_cg_solver_matches_direct():
+    n = 200
+    load = lambda xi, xj: np.sin(np.pi * xi)
+    direct = linear_fem_1d(n, 1.0, load, {0: 0.0, n: 1.0})
+    cg = linear_fem_1d(n, 1.0, load, {0: 0.0, n: 1.0}, solver='cg')
+    np.testing.assert_allclose(cg, direct, atol=1e-8)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from fphysics.solutions.fock_space import (
+    FermionBasis,
+    HubbardModel,
+    bose_hubbard_hamiltonian,
+    combinatorial_rank,
+    lanczos_ground_state,
+    lattice_hopping,
+    popcount,
+)
+
+
+@pytest.mark.parametrize("n_modes, n_particles", [(1, 1), (6, 0), (6, 3), (12, 5), (12, 12)])
+def test_fermion_basis_ranks_in_colex_order(n_modes, n_particles):
+    basis = FermionBasis(n_modes, n_particles)
+    assert len(basis.states) == basis.dimension
+    assert np.all(popcount(basis.states) == n_particles)
+    np.testing.assert_array_equal(basis.rank(basis.states), np.arange(basis.dimension))
+    if n_particles:
+        occupied = np.array([np.flatnonzero(o) for o in basis.occupations()])
+        np.testing.assert_array_equal(combinatorial_rank(occupied), np.arange(basis.dimension))
+
+
+def test_fermion_basis_cost_follows_dimension_not_mode_count():
+    basis = FermionBasis(63, 2)
+    assert basis.dimension == 63 * 62 // 2
+    top = (np.uint64(1) << np.uint64(62)) | (np.uint64(1) << np.uint64(61))
+    assert basis.rank([top])[0] == basis.dimension - 1
+
+
+@pytest.mark.parametrize("n_up, n_down", [(2, 3), (3, 3), (1, 4)])
+def test_free_fermions_fill_single_particle_levels(n_up, n_down):
+    hopping = lattice_hopping(6, periodic=True)
+    levels = np.linalg.eigvalsh(hopping)
+    model = HubbardModel(hopping, n_up, n_down, 0.0)
+    ground = np.linalg.eigvalsh(model.sparse().toarray())[0]
+    assert ground == pytest.approx(levels[:n_up].sum() + levels[:n_down].sum(), abs=1e-12)
+
+
+@pytest.mark.parametrize("U", [0.5, 4.0, 20.0])
+def test_two_site_hubbard_ground_state(U):
+    model = HubbardModel(lattice_hopping(2, t=1.0), 1, 1, U)
+    ground = np.linalg.eigvalsh(model.sparse().toarray())[0]
+    assert ground == pytest.approx(U / 2 - np.sqrt(U**2 / 4 + 4), abs=1e-12)
+
+
+def test_matvec_and_lanczos_match_dense():
+    model = HubbardModel(lattice_hopping(6), 3, 3, 4.0)
+    H = model.sparse()
+    v = np.random.default_rng(0).normal(size=model.dimension)
+    np.testing.assert_allclose(model.matvec(v), H @ v, atol=1e-12)
+
+    energies, vectors = np.linalg.eigh(H.toarray())
+    energy, ground = lanczos_ground_state(model.operator(), seed=0)
+    assert energy == pytest.approx(energies[0], abs=1e-9)
+    assert abs(vectors[:, 0] @ ground) == pytest.approx(1.0, abs=1e-9)
+
+
+def test_bose_hubbard_matches_single_particle_limit():
+    H, basis = bose_hubbard_hamiltonian(lattice_hopping(3, periodic=False), 2, 0.0)
+    levels = np.linalg.eigvalsh(lattice_hopping(3, periodic=False))
+    assert np.linalg.eigvalsh(H.toarray())[0] == pytest.approx(2 * levels[0], abs=1e-12)
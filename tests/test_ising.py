@@ -0,0 +1,59 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy.special import ellipk
+
+from fphysics.computational.ising import IsingModel2D, onsager_magnetization
+
+
+def exact_energy_per_site(size, temperature, coupling=1.0):
+    configurations = np.array(list(itertools.product([-1, 1], repeat=size * size)))
+    spins = configurations.reshape(-1, size, size)
+    bonds = np.sum(spins * (np.roll(spins, 1, 1) + np.roll(spins, 1, 2)), axis=(1, 2))
+    energies = -coupling * bonds
+    weights = np.exp(-(energies - energies.min()) / temperature)
+    return np.sum(weights * energies) / np.sum(weights) / size**2
+
+
+def onsager_energy_per_site(temperature, coupling=1.0):
+    x = 2 * coupling / temperature
+    k = 2 * np.sinh(x) / np.cosh(x)**2
+    return -coupling / np.tanh(x) * (1 + 2 / np.pi * (2 * np.tanh(x)**2 - 1) * ellipk(k**2))
+
+
+@pytest.mark.parametrize("method, field", [("metropolis", 0.0), ("metropolis", 0.3),
+                                           ("wolff", 0.0), ("swendsen_wang", 0.0)])
+def test_running_energy_and_magnetization_match_lattice(method, field):
+    model = IsingModel2D(8, 2.3, field=field, seed=1)
+    model.run(50, method)
+    assert model.energy == pytest.approx(model.total_energy())
+    assert model.magnetization == np.sum(model.spins)
+
+
+def test_total_energy_of_ordered_and_checkerboard_states():
+    model = IsingModel2D(4, 1.0, coupling=1.5, field=0.5, initial='up')
+    assert model.total_energy() == pytest.approx(-2 * 1.5 * 16 - 0.5 * 16)
+    model.spins[model._colors[1]] = -1
+    assert model.total_energy() == pytest.approx(2 * 1.5 * 16)
+
+
+@pytest.mark.parametrize("method", ["metropolis", "wolff", "swendsen_wang"])
+def test_small_lattice_energy_matches_exact_enumeration(method):
+    model = IsingModel2D(4, 2.5, seed=2)
+    energies, _ = model.run(4000, method, burn_in=200)
+    assert np.mean(energies) == pytest.approx(exact_energy_per_site(4, 2.5), abs=0.03)
+
+
+@pytest.mark.parametrize("method, n_sweeps", [("metropolis", 1000), ("wolff", 1000),
+                                              ("swendsen_wang", 1000)])
+@pytest.mark.parametrize("temperature", [1.8, 3.2])
+def test_large_lattice_reproduces_onsager(method, n_sweeps, temperature):
+    model = IsingModel2D(32, temperature, initial='up', seed=3)
+    energies, magnetizations = model.run(n_sweeps, method, burn_in=200)
+    assert np.mean(energies) == pytest.approx(onsager_energy_per_site(temperature), abs=0.02)
+    if temperature < 2.269:
+        assert np.mean(np.abs(magnetizations)) == pytest.approx(onsager_magnetization(temperature),
+                                                                abs=0.01)
+    else:
+        assert np.mean(np.abs(magnetizations)) < 0.1
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from fphysics.computational.mcmc import (
+    effective_sample_size,
+    hamiltonian_monte_carlo_chains,
+    metropolis_chains,
+    split_rhat,
+)
+
+
+MEAN = np.array([1.0, -2.0])
+SIGMA = np.array([0.5, 2.0])
+
+
+def gaussian_log_prob(X):
+    return -0.5 * np.sum(((X - MEAN) / SIGMA)**2, axis=1)
+
+
+def gaussian_grad(X):
+    return -(X - MEAN) / SIGMA**2
+
+
+def ar1(phi, n, m, d, seed):
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(size=(n, m, d)) * np.sqrt(1 - phi**2)
+    x = np.empty((n, m, d))
+    x[0] = rng.normal(size=(m, d))
+    for i in range(1, n):
+        x[i] = phi * x[i - 1] + noise[i]
+    return x
+
+
+def test_metropolis_chains_recover_gaussian_moments(tmp_path):
+    initial = np.random.default_rng(0).normal(size=(16, 2)) * 3
+    samples, acceptance, history = metropolis_chains(
+        gaussian_log_prob, initial, 1.0, n_samples=4000, burn_in=500, monitor_every=1000,
+        memmap_path=tmp_path / "samples.npy", seed=1)
+    assert samples.shape == (4000, 16, 2)
+    assert np.all((acceptance > 0.2) & (acceptance < 0.8))
+    flat = np.asarray(samples).reshape(-1, 2)
+    np.testing.assert_allclose(flat.mean(axis=0), MEAN, atol=0.1)
+    np.testing.assert_allclose(flat.std(axis=0), SIGMA, rtol=0.05)
+    np.testing.assert_array_equal(history['n_samples'], [1000, 2000, 3000, 4000])
+    np.testing.assert_allclose(history['rhat'][-1], 1.0, atol=0.02)
+    np.testing.assert_array_equal(np.load(tmp_path / "samples.npy"), samples)
+
+
+def test_hmc_chains_recover_gaussian_moments():
+    initial = np.random.default_rng(2).normal(size=(8, 2))
+    samples, acceptance, _ = hamiltonian_monte_carlo_chains(
+        gaussian_log_prob, gaussian_grad, initial, step_size=0.2, n_steps=10, n_samples=2000,
+        burn_in=200, seed=3)
+    assert np.all(acceptance > 0.8)
+    flat = samples.reshape(-1, 2)
+    np.testing.assert_allclose(flat.mean(axis=0), MEAN, atol=0.05)
+    np.testing.assert_allclose(flat.std(axis=0), SIGMA, rtol=0.05)
+
+
+def test_rhat_is_one_for_iid_and_large_for_separated_chains():
+    iid = np.random.default_rng(4).normal(size=(2000, 4, 3))
+    np.testing.assert_allclose(split_rhat(iid), 1.0, atol=0.01)
+    shifted = iid + np.array([0.0, 0.0, 0.0, 3.0])[None, :, None]
+    assert np.all(split_rhat(shifted) > 1.2)
+
+
+def test_ess_matches_iid_sample_count():
+    iid = np.random.default_rng(5).normal(size=(2000, 4, 3))
+    np.testing.assert_allclose(effective_sample_size(iid), 8000, rtol=0.1)
+
+
+@pytest.mark.parametrize("phi", [0.5, 0.9])
+def test_ess_matches_ar1_integrated_autocorrelation(phi):
+    chains = ar1(phi, 5000, 4, 2, seed=6)
+    expected = 20000 * (1 - phi) / (1 + phi)
+    np.testing.assert_allclose(effective_sample_size(chains), expected, rtol=0.15)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from fphysics.computational.mesh_fem import (
+    box_mesh,
+    element_geometry,
+    elasticity_2d,
+    rectangle_mesh,
+    steady_heat_conduction,
+)
+
+
+def boundary_nodes(nodes):
+    return np.flatnonzero(np.any((nodes == 0) | (nodes == 1), axis=1))
+
+
+def manufactured_error(mesh, dim, n):
+    # -laplacian(u) = f for u = prod sin(pi x_i), which vanishes on the boundary
+    nodes, elements = mesh(*([n] * dim))
+    exact = np.prod(np.sin(np.pi * nodes), axis=1)
+    source = lambda x: dim * np.pi**2 * np.prod(np.sin(np.pi * x), axis=1)
+    u = steady_heat_conduction(nodes, elements, 1.0, source,
+                               {node: 0.0 for node in boundary_nodes(nodes)})
+    return np.max(np.abs(u - exact))
+
+
+@pytest.mark.parametrize("mesh, dim, sizes", [(rectangle_mesh, 2, (8, 16, 32)), (box_mesh, 3, (4, 8, 16))])
+def test_poisson_converges_at_second_order(mesh, dim, sizes):
+    errors = np.array([manufactured_error(mesh, dim, n) for n in sizes])
+    orders = np.log2(errors[:-1] / errors[1:])
+    np.testing.assert_allclose(orders, 2.0, atol=0.25)
+
+
+@pytest.mark.parametrize("mesh, dim", [(rectangle_mesh, 2), (box_mesh, 3)])
+def test_meshes_tile_the_unit_domain(mesh, dim):
+    nodes, elements = mesh(*([3] * dim))
+    _, volumes = element_geometry(nodes, elements)
+    assert np.all(volumes > 0)
+    assert np.sum(volumes) == pytest.approx(1.0)
+
+
+def test_cantilever_tip_deflection_matches_timoshenko_beam():
+    length, height, E, nu, load = 10.0, 1.0, 1000.0, 0.0, 1.0
+    nodes, elements = rectangle_mesh(160, 16, length, height)
+    clamped = np.flatnonzero(nodes[:, 0] == 0)
+    tip = np.flatnonzero(nodes[:, 0] == length)
+    # parabolic shear traction on the free end, lumped onto its nodes
+    y = nodes[tip, 1]
+    shear = 6 * load / height**3 * y * (height - y)
+    weights = np.full(len(tip), height / (len(tip) - 1))
+    weights[[0, -1]] /= 2
+    forces = {node: (0.0, -f) for node, f in zip(tip, shear * weights)}
+
+    u = elasticity_2d(nodes, elements, E, nu, point_forces=forces,
+                      dirichlet={node: (0.0, 0.0) for node in clamped})
+    inertia = height**3 / 12
+    shear_modulus = E / (2 * (1 + nu))
+    expected = load * length**3 / (3 * E * inertia) + 1.2 * load * length / (shear_modulus * height)
+    # constant-strain triangles are too stiff in bending and approach the beam value from below
+    assert 0.97 * expected < -np.mean(u[tip, 1]) < expected
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from fphysics.astrophysics.planetary import orbital_energy
+from fphysics.computational.nbody import (
+    integrate_nbody,
+    nbody_total_energy,
+    orbital_diagnostics,
+)
+
+
+def test_orbital_diagnostics_natural_units():
+    positions = [[0.0, 0.0, 0.0], [2.0, 0.0, 0.0]]
+    velocities = [[0.0, 0.0, 0.0], [0.0, 0.5, 0.0]]
+    masses = [1.0, 1e-3]
+    diagnostics = orbital_diagnostics(positions, velocities, masses, G=1.0)
+    mu = 1.0 + 1e-3
+    a = 1 / (2 / 2.0 - 0.25 / mu)
+    np.testing.assert_allclose(diagnostics['semi_major_axis'], [a])
+    np.testing.assert_allclose(diagnostics['orbital_energy'], [-1e-3 / (2 * a)])
+
+
+def test_orbital_diagnostics_si_matches_planetary():
+    au, v_earth = 1.495978707e11, 29.78e3
+    masses = [1.989e30, 5.972e24]
+    diagnostics = orbital_diagnostics([[0, 0, 0], [au, 0, 0]], [[0, 0, 0], [0, v_earth, 0]], masses)
+    assert diagnostics['semi_major_axis'][0] == pytest.approx(au, rel=0.02)
+    np.testing.assert_allclose(diagnostics['orbital_energy'],
+                               orbital_energy(masses[1], masses[0], diagnostics['semi_major_axis']))
+
+
+def circular_binary():
+    masses = np.array([1.0, 1e-3])
+    total = masses.sum()
+    positions = np.array([[-masses[1], 0, 0], [masses[0], 0, 0]]) / total
+    velocities = np.array([[0, -masses[1], 0], [0, masses[0], 0]]) / np.sqrt(total)
+    return positions, velocities, masses, 2 * np.pi / np.sqrt(total)
+
+
+@pytest.mark.parametrize("method, tolerance", [("leapfrog", 2e-4), ("yoshida4", 1e-7), ("wisdom_holman", 1e-9)])
+def test_circular_orbit_closes_after_one_period(method, tolerance):
+    positions, velocities, masses, period = circular_binary()
+    t, X, V = integrate_nbody(positions, velocities, masses, period / 1000, 1000, method=method,
+                              save_every=10, G=1.0)
+    assert t[-1] == pytest.approx(period)
+    np.testing.assert_allclose(X[-1], positions, atol=tolerance)
+    energies = [nbody_total_energy(x, v, masses, G=1.0) for x, v in zip(X, V)]
+    np.testing.assert_allclose(energies, energies[0], rtol=1e-8)
+
+
+
+@pytest.mark.parametrize("method", ["leapfrog", "yoshida4", "wisdom_holman"])
+@pytest.mark.parametrize("n_steps, save_every", [(1000, 10), (1000, 7), (1000, 3000)])
+def test_output_always_ends_at_final_step(method, n_steps, save_every):
+    positions, velocities, masses, period = circular_binary()
+    t, X, V = integrate_nbody(positions, velocities, masses, period / n_steps, n_steps,
+                              method=method, save_every=save_every, G=1.0)
+    _, X_every, V_every = integrate_nbody(positions, velocities, masses, period / n_steps, n_steps,
+                                          method=method, G=1.0)
+    assert len(t) == len(X) == len(V) == -(-n_steps // save_every) + 1
+    assert t[-1] == pytest.approx(period)
+    np.testing.assert_allclose(X[-1], X_every[-1])
+    np.testing.assert_allclose(V[-1], V_every[-1])
+
+
+@pytest.mark.parametrize("options", [{"theta": 0.5},
+                                     {"acceleration": lambda x: np.zeros_like(x)}])
+def test_wisdom_holman_rejects_custom_forces(options):
+    positions, velocities, masses, period = circular_binary()
+    with pytest.raises(ValueError):
+        integrate_nbody(positions, velocities, masses, period / 100, 10, method="wisdom_holman",
+                        G=1.0, **options)
@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+from fphysics.nuclear import binding_energy
+from fphysics.nuclear.binding_energy import binding_energy_semf, get_nuclear_data
+from fphysics.nuclear.nuclide_table import NUCLIDE_RECORDS, nuclide_table
+
+
+@pytest.fixture
+def builtin_table(tmp_path, monkeypatch):
+    monkeypatch.setenv('FPHYSICS_CACHE_DIR', str(tmp_path))
+    monkeypatch.setenv('HOME', str(tmp_path))
+    nuclide_table.cache_clear()
+    yield nuclide_table()
+    nuclide_table.cache_clear()
+
+
+def test_builtin_table_is_built_in_memory(builtin_table, tmp_path):
+    assert not os.listdir(tmp_path)
+    assert not isinstance(builtin_table.data, np.memmap)
+    assert len(builtin_table) == len(NUCLIDE_RECORDS)
+    assert nuclide_table() is builtin_table
+
+
+def test_saved_table_is_memory_mapped(builtin_table, tmp_path):
+    path = str(tmp_path / 'nuclides.npy')
+    builtin_table.save(path)
+    loaded = nuclide_table(path)
+    assert isinstance(loaded.data, np.memmap)
+    np.testing.assert_array_equal(loaded.data, builtin_table.data)
+
+
+def test_nuclear_data_is_a_deprecated_view_of_the_table(builtin_table):
+    with pytest.warns(DeprecationWarning):
+        data = binding_energy.NUCLEAR_DATA
+    assert data['U-235'] == {'A': 235, 'Z': 92, 'mass': pytest.approx(235.043930, abs=1e-5)}
+    assert data['C-12']['mass'] == 12.0
+
+
+@pytest.mark.parametrize("Z, A, per_nucleon", [(2, 4, 7.0739), (26, 56, 8.7903), (92, 238, 7.5701)])
+def test_binding_energy_per_nucleon(builtin_table, Z, A, per_nucleon):
+    assert builtin_table.binding_energy(Z, A) / A == pytest.approx(per_nucleon, abs=2e-3)
+
+
+def test_get_nuclear_data_reads_table(builtin_table):
+    data = get_nuclear_data('Fe-56')
+    assert (data['Z'], data['A'], data['N']) == (26, 56, 30)
+    assert data['mass'] == pytest.approx(55.934942, abs=1e-5)
+    with pytest.raises(ValueError):
+        get_nuclear_data('Fe-99')
+
+
+def test_vectorized_lookup_matches_scalar(builtin_table):
+    Z = np.array([2, 26, 92, 8])
+    A = np.array([4, 56, 238, 16])
+    np.testing.assert_array_equal(builtin_table.index(Z, A), [builtin_table.index(z, a) for z, a in zip(Z, A)])
+
+
+def test_semf_vectorized_matches_scalar():
+    A, Z = np.meshgrid(np.arange(20, 240, 7), np.arange(10, 90, 9), indexing='ij')
+    expected = [[binding_energy_semf(int(a), int(z)) for a, z in zip(row_a, row_z)] for row_a, row_z in zip(A, Z)]
+    np.testing.assert_allclose(binding_energy_semf(A, Z), expected, rtol=1e-14)
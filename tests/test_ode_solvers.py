@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from fphysics.computational.ode_solvers import dopri5_batch, euler_batch, rk4_batch
+
+
+def decay(t, Y):
+    return -Y
+
+
+@pytest.mark.parametrize("integrator", [euler_batch, rk4_batch])
+@pytest.mark.parametrize("save_every", [1, 7, 10, 2000])
+def test_batch_output_ends_at_final_time(integrator, save_every):
+    t, Y = integrator(decay, [[1.0], [2.0]], (0, 1), 1e-3, save_every)
+    assert t[0] == 0 and t[-1] == pytest.approx(1.0)
+    assert np.all(np.diff(t) > 0)
+    assert np.all(np.isfinite(Y))
+    np.testing.assert_allclose(Y[-1, :, 0], np.array([1.0, 2.0]) * np.exp(-t[-1]), rtol=1e-3)
+
+
+def oscillator(t, Y):
+    return np.column_stack([Y[:, 1], -Y[:, 0]])
+
+
+def test_rk4_is_fourth_order():
+    errors = []
+    for h in (0.1, 0.05):
+        t, Y = rk4_batch(oscillator, [[1.0, 0.0]], (0, 6.4), h)
+        errors.append(np.linalg.norm(Y[-1, 0] - [np.cos(t[-1]), -np.sin(t[-1])]))
+    assert errors[0] / errors[1] == pytest.approx(16, rel=0.1)
+
+
+def test_dopri5_matches_analytic_oscillator():
+    phases = np.linspace(0, np.pi, 5)
+    y0 = np.column_stack([np.cos(phases), -np.sin(phases)])
+    t_eval = np.linspace(0, 10, 41)
+    t, Y, info = dopri5_batch(oscillator, y0, (0, 10), t_eval, rtol=1e-10, atol=1e-12)
+    assert np.all(info['status'] == 0)
+    np.testing.assert_allclose(Y[..., 0], np.cos(t[:, None] + phases), atol=1e-8)
+
+
+def test_dopri5_matches_solve_ivp_van_der_pol():
+    def van_der_pol(t, Y):
+        return np.column_stack([Y[:, 1], 2.0 * (1 - Y[:, 0]**2) * Y[:, 1] - Y[:, 0]])
+
+    y0 = np.array([[2.0, 0.0], [0.5, -1.0]])
+    t_eval = np.linspace(0, 8, 17)
+    _, Y, _ = dopri5_batch(van_der_pol, y0, (0, 8), t_eval, rtol=1e-10, atol=1e-12)
+    for i, y in enumerate(y0):
+        reference = solve_ivp(lambda t, y: van_der_pol(t, y[None])[0], (0, 8), y, t_eval=t_eval,
+                              method='DOP853', rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(Y[:, i], reference.y.T, atol=1e-7)
+
+
+def test_dopri5_terminal_event_locates_impact():
+    def falling(t, Y):
+        return np.column_stack([Y[:, 1], np.full(len(Y), -9.81)])
+
+    def ground(t, Y):
+        return Y[:, 0]
+    ground.terminal = True
+    ground.direction = -1
+
+    heights = np.array([1.0, 5.0, 20.0])
+    _, _, info = dopri5_batch(falling, np.column_stack([heights, 0 * heights]), (0, 10), events=ground)
+    assert np.all(info['status'] == 1)
+    order = np.argsort(info['i_events'][0])
+    np.testing.assert_allclose(info['t_events'][0][order], np.sqrt(2 * heights / 9.81), rtol=1e-10)
+    np.testing.assert_allclose(info['t_final'], np.sqrt(2 * heights / 9.81), rtol=1e-10)
+
+
+def test_dopri5_stops_at_finite_time_blow_up():
+    # y' = y**2 blows up at t = 1 / y0; only the first trajectory reaches it before t = 2
+    _, Y, info = dopri5_batch(lambda t, Y: Y**2, [[1.0], [0.1]], (0, 2), max_steps=10000)
+    assert list(info['status']) == [-1, 0]
+    assert info['t_final'][0] == pytest.approx(1.0, abs=1e-3)
+    assert info['n_steps'][0] + info['n_rejected'][0] < 10000
+    assert Y[-1, 1, 0] == pytest.approx(1 / (10 - 2), rel=1e-6)
+
+
+def test_dopri5_max_steps_counts_rejected_steps():
+    _, _, info = dopri5_batch(lambda t, Y: Y**2, [[1.0]], (0, 2), max_steps=5)
+    assert info['status'][0] == -1
+    assert info['n_steps'][0] + info['n_rejected'][0] == 5
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from fphysics.computational.batch_evaluation import evaluate_batch
+from fphysics.computational.optimization import (
+    differential_evolution,
+    genetic_algorithm,
+    particle_swarm_optimization,
+    rastrigin,
+)
+
+
+OPTIMIZERS = [
+    lambda **kw: genetic_algorithm(population_size=20, generations=30, **kw),
+    lambda **kw: particle_swarm_optimization(n_particles=20, max_iter=30, **kw),
+    lambda **kw: differential_evolution(population_size=20, max_iter=30, **kw),
+]
+BOUNDS = [(-5.12, 5.12)] * 3
+
+
+def scalar_rastrigin(x):
+    assert np.ndim(x) == 1
+    return float(rastrigin(x))
+
+
+def test_evaluate_batch_paths_agree():
+    X = np.random.default_rng(0).uniform(-5, 5, size=(7, 3))
+    expected = [rastrigin(x) for x in X]
+    np.testing.assert_allclose(evaluate_batch(rastrigin, X, vectorized=True), expected)
+    np.testing.assert_allclose(evaluate_batch(scalar_rastrigin, X), expected)
+
+
+@pytest.mark.parametrize("optimize", OPTIMIZERS)
+def test_vectorized_pooled_and_scalar_fitness_give_identical_runs(optimize):
+    scalar = optimize(f=scalar_rastrigin, bounds=BOUNDS, seed=1)
+    vectorized = optimize(f=rastrigin, bounds=BOUNDS, vectorized=True, seed=1)
+    pooled = optimize(f=rastrigin, bounds=BOUNDS, n_workers=2, chunksize=4, seed=1)
+    for x, best in (vectorized, pooled):
+        np.testing.assert_allclose(x, scalar[0])
+        assert best == pytest.approx(scalar[1])
+    assert scalar[1] == pytest.approx(rastrigin(scalar[0]))
+
+
+@pytest.mark.parametrize("optimize", [
+    lambda **kw: genetic_algorithm(population_size=40, generations=200, **kw),
+    lambda **kw: particle_swarm_optimization(n_particles=40, max_iter=200, **kw),
+    lambda **kw: differential_evolution(population_size=40, max_iter=200, **kw),
+])
+def test_population_optimizers_minimize_sphere(optimize):
+    x, best = optimize(f=lambda X: np.sum((X - 1)**2, axis=-1), bounds=BOUNDS, vectorized=True,
+                       seed=2)
+    np.testing.assert_allclose(x, 1.0, atol=0.05)
+    assert best < 1e-3
+
+
+@pytest.mark.parametrize("population_size", [1, 2, 3])
+def test_differential_evolution_rejects_populations_without_three_donors(population_size):
+    with pytest.raises(ValueError):
+        differential_evolution(rastrigin, BOUNDS, population_size=population_size, max_iter=1,
+                               vectorized=True)
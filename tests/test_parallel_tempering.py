@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from fphysics.computational.mcmc import _replica_exchange, parallel_tempering
+
+
+def two_modes(X):
+    x = np.asarray(X)[..., 0]
+    return np.logaddexp(-0.5 * (x - 3)**2, -0.5 * (x + 3)**2)
+
+
+def tempered_moments(temperature):
+    x = np.linspace(-15, 15, 20001)
+    weight = np.exp(two_modes(x[:, None]) / temperature)
+    weight /= np.sum(weight)
+    return np.sum(weight * x), np.sum(weight * x**2)
+
+
+@pytest.mark.parametrize("parity, pairs", [(0, [(0, 1), (2, 3)]), (1, [(1, 2)])])
+def test_exchange_swaps_states_and_log_probs_of_accepted_pairs(parity, pairs):
+    betas = np.array([1.0, 0.5, 0.25, 0.125])
+    X = np.arange(4.0)[:, None]
+    # colder replicas hold the higher log-probability, so log_alpha > 0 and every pair swaps
+    L = np.array([-1.0, 0.0, 1.0, 2.0])
+    X_before, L_before = X.copy(), L.copy()
+    accept = _replica_exchange(X, L, betas, parity, np.random.default_rng(0))
+    assert np.all(accept) and len(accept) == len(pairs)
+    for i, j in pairs:
+        assert X[i, 0] == X_before[j, 0] and X[j, 0] == X_before[i, 0]
+        assert L[i] == L_before[j] and L[j] == L_before[i]
+    untouched = sorted(set(range(4)) - {k for pair in pairs for k in pair})
+    np.testing.assert_array_equal(X[untouched], X_before[untouched])
+
+
+def test_exchange_acceptance_follows_metropolis_rule():
+    betas = np.array([1.0, 0.5])
+    # log_alpha = (beta_0 - beta_1) * (L_1 - L_0) = log(0.3)
+    L0 = np.array([0.0, 2 * np.log(0.3)])
+    rng = np.random.default_rng(1)
+    accepted = [_replica_exchange(np.zeros((2, 1)), L0.copy(), betas, 0, rng)[0] for _ in range(20000)]
+    assert np.mean(accepted) == pytest.approx(0.3, abs=0.015)
+
+
+def test_returned_log_probs_match_stored_samples():
+    samples, log_probs, acceptance, swaps = parallel_tempering(
+        two_modes, [0.0], temperatures=[1.0, 3.0, 9.0], step_size=1.0, n_samples=500,
+        burn_in=50, vectorized=True, seed=2)
+    assert samples.shape == (500, 3, 1) and log_probs.shape == (500, 3)
+    np.testing.assert_allclose(log_probs, two_modes(samples))
+    assert acceptance.shape == (3,) and swaps.shape == (2,)
+    assert np.all((swaps > 0) & (swaps <= 1))
+
+
+def test_every_temperature_samples_its_tempered_two_mode_target():
+    temperatures = np.array([1.0, 2.0, 4.0, 8.0, 16.0])
+    samples, _, _, _ = parallel_tempering(
+        two_modes, [3.0], temperatures=temperatures, step_size=1.5, n_samples=40000,
+        burn_in=2000, vectorized=True, seed=3)
+    for k, T in enumerate(temperatures):
+        mean, second = tempered_moments(T)
+        x = samples[:, k, 0]
+        assert np.mean(x) == pytest.approx(mean, abs=0.25)
+        assert np.mean(x**2) == pytest.approx(second, rel=0.05)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from fphysics.computational.pde_steppers import (
+    heat_equation_1d_implicit,
+    heat_equation_adi,
+    wave_equation_1d_implicit,
+)
+
+
+def zero(t):
+    return 0.0
+
+
+def sine(x):
+    return np.sin(np.pi * x)
+
+
+def mode_symbol(n, L=1.0):
+    # eigenvalue of the second difference (times -dx^2) for the lowest sine mode
+    dx = L / (n - 1)
+    return 4 * np.sin(np.pi * dx / (2 * L))**2
+
+
+@pytest.mark.parametrize("theta", [0.5, 1.0])
+def test_heat_sine_mode_decays_by_discrete_amplification(theta):
+    nx, nt, T, alpha = 51, 20, 0.1, 1.0
+    x, t, u = heat_equation_1d_implicit(alpha, 1.0, T, nx, nt, lambda x: np.sin(np.pi * x), (zero, zero), theta)
+    r = alpha * (T / nt) * (nx - 1)**2
+    mu = mode_symbol(nx)
+    g = (1 - (1 - theta) * r * mu) / (1 + theta * r * mu)
+    np.testing.assert_allclose(u, g**np.arange(nt + 1)[:, None] * np.sin(np.pi * x), atol=1e-12)
+    if theta == 0.5:
+        np.testing.assert_allclose(u[-1], np.exp(-np.pi**2 * T) * np.sin(np.pi * x), atol=1e-3)
+
+
+def test_heat_relaxes_to_linear_profile_with_dirichlet_values():
+    x, _, u = heat_equation_1d_implicit(1.0, 1.0, 5.0, 41, 50, lambda x: 0 * x,
+                                        (lambda t: 1.0, lambda t: 3.0), theta=1.0)
+    np.testing.assert_allclose(u[-1], 1.0 + 2.0 * x, atol=1e-8)
+
+
+def test_adi_sine_mode_matches_peaceman_rachford_factor():
+    n, dt, steps = 33, 2e-3, 25
+    x = np.linspace(0, 1, n)
+    X, Y = np.meshgrid(x, x, indexing='ij')
+    t, u = heat_equation_adi(1.0, np.sin(np.pi * X) * np.sin(np.pi * Y), x[1] - x[0], dt, steps)
+    half = 0.5 * dt * (n - 1)**2 * mode_symbol(n)
+    g = ((1 - half) / (1 + half))**2
+    np.testing.assert_allclose(u[-1], g**steps * np.sin(np.pi * X) * np.sin(np.pi * Y), atol=1e-12)
+    np.testing.assert_allclose(u[-1], np.exp(-2 * np.pi**2 * t[-1]) * np.sin(np.pi * X) * np.sin(np.pi * Y),
+                               atol=2e-3)
+
+
+def test_wave_standing_mode():
+    x, t, u = wave_equation_1d_implicit(1.0, 1.0, 2.0, 201, 800, lambda x: np.sin(np.pi * x),
+                                        lambda x: 0 * x, (zero, zero))
+    np.testing.assert_allclose(u, np.cos(np.pi * t)[:, None] * np.sin(np.pi * x), atol=1e-3)
+
+
+def test_history_ends_at_final_time_when_save_every_does_not_divide_steps():
+    _, t, u = heat_equation_1d_implicit(1.0, 1.0, 0.1, 21, 10, sine, (zero, zero), save_every=3)
+    _, t_all, u_all = heat_equation_1d_implicit(1.0, 1.0, 0.1, 21, 10, sine, (zero, zero))
+    np.testing.assert_allclose(t, [0.0, 0.03, 0.06, 0.09, 0.1])
+    np.testing.assert_allclose(u, u_all[[0, 3, 6, 9, 10]])
+
+    _, t, u = wave_equation_1d_implicit(1.0, 1.0, 0.1, 21, 10, sine, lambda x: 0 * x, (zero, zero),
+                                        save_every=4)
+    _, _, u_all = wave_equation_1d_implicit(1.0, 1.0, 0.1, 21, 10, sine, lambda x: 0 * x, (zero, zero))
+    np.testing.assert_allclose(t, [0.0, 0.04, 0.08, 0.1])
+    np.testing.assert_allclose(u, u_all[[0, 4, 8, 10]])
+
+    x = np.linspace(0, 1, 17)
+    u0 = np.outer(np.sin(np.pi * x), np.sin(np.pi * x))
+    t, u = heat_equation_adi(1.0, u0, x[1] - x[0], 0.01, 10, save_every=4)
+    _, u_all = heat_equation_adi(1.0, u0, x[1] - x[0], 0.01, 10)
+    np.testing.assert_allclose(t, [0.0, 0.04, 0.08, 0.1])
+    np.testing.assert_allclose(u, u_all[[0, 4, 8, 10]])
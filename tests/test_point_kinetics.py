@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from fphysics.nuclear.fission_fusion import delayed_neutron_parameters
+from fphysics.nuclear.point_kinetics import PointKinetics, inhour_period, simulate_transients, step_reactivity
+
+
+def test_feedback_reference_is_initial_state_without_zero_output():
+    model = PointKinetics(xenon_worth=0.025, power_coefficient=-0.01)
+    with_zero = simulate_transients(model, step_reactivity([0.001]), 100, output_times=[0, 10, 100])
+    without_zero = simulate_transients(model, step_reactivity([0.001]), 100, output_times=[10, 100])
+    np.testing.assert_allclose(without_zero['reactivity'], with_zero['reactivity'][1:])
+    assert without_zero['reactivity'][0, 0] == pytest.approx(1.5e-4, rel=0.05)
+
+
+def test_equilibrium_is_steady_without_insertion():
+    model = PointKinetics(xenon_worth=0.025, power_coefficient=-0.01)
+    out = simulate_transients(model, 0.0, 3600.0, n_outputs=5, initial_power=[0.5, 1.0])
+    np.testing.assert_allclose(out['power'], np.broadcast_to([0.5, 1.0], out['power'].shape), rtol=1e-6)
+
+
+@pytest.mark.parametrize("rho", [0.0005, 0.001])
+def test_asymptotic_period_matches_inhour(rho):
+    model = PointKinetics()
+    out = simulate_transients(model, step_reactivity([rho]), 300.0, output_times=[200.0, 300.0],
+                              rtol=1e-6, atol=1e-12)
+    omega = np.log(out['power'][1, 0] / out['power'][0, 0]) / 100.0
+    assert 1 / omega == pytest.approx(inhour_period(rho)[0], rel=1e-3)
+
+
+def test_status_flags_overflow_and_exhausted_steps():
+    model = PointKinetics()
+    # rho = 0.01 is prompt supercritical: the power overflows long before t = 10 s
+    out = simulate_transients(model, step_reactivity([0.001, 0.01]), 10.0, output_times=[0, 10], rtol=1e-2)
+    np.testing.assert_array_equal(out['status'], [0, -1])
+    assert np.all(np.isfinite(out['power'][:, 0]))
+    short = simulate_transients(model, step_reactivity([0.001, 0.01]), 10.0, output_times=[0, 10], max_steps=50)
+    np.testing.assert_array_equal(short['status'], [-1, -1])
+
+
+def test_xenon_constants_are_shared():
+    from fphysics.nuclear import decay, fission_fusion, point_kinetics
+    chain = decay.xenon_iodine_chain()
+    np.testing.assert_allclose(chain.decay_constants[[chain.index['I135'], chain.index['Xe135']]],
+                               [decay.LAMBDA_I135, decay.LAMBDA_XE135])
+    assert point_kinetics.SIGMA_XE135 is decay.SIGMA_XE135
+    assert fission_fusion.xenon_poisoning(3e17) == pytest.approx(
+        3e17 * decay.SIGMA_XE135 * 3e17 * 580e-28 * (decay.YIELD_I135 + decay.YIELD_XE135)
+        / (decay.LAMBDA_XE135 + 3e17 * decay.SIGMA_XE135))
+
+
+@pytest.mark.parametrize("rho", [-0.002, 0.001, 0.005])
+def test_inhour_period_with_repeated_decay_constants(rho):
+    groups = delayed_neutron_parameters()
+    beta, lam = groups['fractions'], groups['decay_constants']
+    # splitting a group into two halves with the same decay constant describes the same reactor
+    split_beta = np.concatenate([beta, [beta[2] / 2]])
+    split_beta[2] /= 2
+    split_lam = np.concatenate([lam, [lam[2]]])
+    np.testing.assert_allclose(inhour_period(rho, fractions=split_beta, decay_constants=split_lam),
+                               inhour_period(rho), rtol=1e-8)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from fphysics.computational.poisson import poisson_fft, poisson_multigrid, poisson_sor
+
+
+def grid(n):
+    x = np.linspace(0, 1, n)
+    X, Y = np.meshgrid(x, x, indexing='ij')
+    return X, Y, x[1] - x[0]
+
+
+def dirichlet_problem(n):
+    # u = x + y + x^2 y has laplacian 2 y, which the 5-point stencil reproduces exactly
+    X, Y, h = grid(n)
+    exact = X + Y + X**2 * Y
+    f = 2 * Y
+    u0 = exact.copy()
+    u0[1:-1, 1:-1] = 0.0
+    return exact, f, u0, h
+
+
+@pytest.mark.parametrize("n", [33, 34, 40])
+def test_multigrid_respects_dirichlet_values(n):
+    X, Y, h = grid(n)
+    exact = X + Y
+    u0 = exact.copy()
+    u0[1:-1, 1:-1] = 0.0
+    u, _ = poisson_multigrid(np.zeros_like(exact), u0, h)
+    np.testing.assert_allclose(u, exact, atol=1e-8)
+
+
+@pytest.mark.parametrize("n", [34, 40])
+def test_multigrid_on_grids_without_coarse_levels(n):
+    exact, f, u0, h = dirichlet_problem(n)
+    u, history = poisson_multigrid(f, u0, h)
+    np.testing.assert_allclose(u, exact, atol=1e-9)
+    assert history[-1] < 1e-8
+
+
+@pytest.mark.parametrize("cycle", ["V", "W"])
+def test_multigrid_matches_direct_solver(cycle):
+    exact, f, u0, h = dirichlet_problem(65)
+    u, history = poisson_multigrid(f, u0, h, cycle=cycle, tol=1e-10)
+    direct = poisson_fft(f, h, bc='dirichlet', boundary=u0)
+    np.testing.assert_allclose(u, direct, atol=1e-9)
+    np.testing.assert_allclose(direct, exact, atol=1e-10)
+    assert len(history) < 15
+
+
+def test_sor_matches_direct_solver():
+    exact, f, u0, h = dirichlet_problem(33)
+    u, history = poisson_sor(f, u0, h, tol=1e-10)
+    np.testing.assert_allclose(u, exact, atol=1e-8)
+
+
+def test_periodic_fft_solves_manufactured_problem():
+    n = 64
+    x = np.arange(n) / n
+    X, Y = np.meshgrid(x, x, indexing='ij')
+    u = np.sin(2 * np.pi * X) * np.cos(4 * np.pi * Y)
+    h = 1 / n
+    lap = ((np.roll(u, 1, 0) + np.roll(u, -1, 0) + np.roll(u, 1, 1) + np.roll(u, -1, 1) - 4 * u) / h**2)
+    np.testing.assert_allclose(poisson_fft(lap, h), u, atol=1e-10)
@@ -0,0 +1,55 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from fphysics.relativity.ray_tracing import (
+    CAPTURED,
+    ESCAPED,
+    camera_rays,
+    kerr_metric,
+    trace_image,
+    trace_rays,
+)
+
+
+def conserved_quantities(y, spin):
+    g = kerr_metric(y[1], y[2], spin)
+    u = y[4:]
+    energy = -(g[0, 0] * u[0] + g[0, 3] * u[3])
+    angular_momentum = g[3, 0] * u[0] + g[3, 3] * u[3]
+    norm = np.einsum('ab...,a...,b...->...', g, u, u)
+    return energy, angular_momentum, norm
+
+
+def test_schwarzschild_shadow_edge_at_critical_impact_parameter():
+    impact = 3 * np.sqrt(3) * np.array([0.995, 1.005])
+    image = trace_image(impact, 0.0, distance=1000.0, rtol=1e-9, atol=1e-11)
+    np.testing.assert_array_equal(image['status'], [CAPTURED, ESCAPED])
+    # the escaping ray turns around at the largest root of r^3 - b^2 r + 2 b^2 = 0
+    turning_point = np.max(np.roots([1, 0, -impact[1]**2, 2 * impact[1]**2]).real)
+    assert image['min_r'][1] == pytest.approx(turning_point, rel=1e-3)
+
+
+@pytest.mark.parametrize("spin", [0.0, 0.9])
+def test_energy_and_angular_momentum_are_conserved(spin):
+    alpha, beta = np.meshgrid(np.linspace(-10, 10, 6), np.linspace(-10, 10, 6))
+    y0 = camera_rays(alpha, beta, 100.0, np.radians(60), spin)
+    result = trace_rays(y0, spin, rtol=1e-9, atol=1e-11)
+    escaped = result['status'] == ESCAPED
+    assert np.any(escaped)
+    E0, L0, _ = conserved_quantities(y0[:, escaped], spin)
+    E1, L1, norm = conserved_quantities(result['final'][:, escaped], spin)
+    np.testing.assert_allclose(E1, E0, rtol=1e-6)
+    np.testing.assert_allclose(L1, L0, atol=1e-6 * np.max(np.abs(L0)))
+    np.testing.assert_allclose(norm, 0.0, atol=1e-6 * np.max(E0**2))
+
+
+@pytest.mark.parametrize("spin", [0.0, 0.9])
+def test_face_on_camera_traces_the_on_axis_pixel(spin):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        image = trace_image(np.array([0.0, 20.0]), 0.0, distance=1000.0, inclination=0.0, spin=spin,
+                            max_steps=2000)
+    np.testing.assert_array_equal(image['status'], [CAPTURED, ESCAPED])
+    assert np.all(image['steps'] < 2000)
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from fphysics.constants import SPEED_OF_LIGHT
+from fphysics.nuclear.fission_fusion import fusion_reaction_rate, lawson_criterion
+from fphysics.nuclear.reaction_rates import (
+    BOSCH_HALE,
+    REACTIONS,
+    RateTable,
+    bosch_hale_cross_section,
+    bosch_hale_reactivity,
+    gamow_peak,
+    kelvin_to_kev,
+)
+
+
+def maxwellian_reference(kT, reaction):
+    gamow, reduced_mass = BOSCH_HALE[REACTIONS[reaction]['channels'][0]][:2]
+    integral = quad(lambda E: bosch_hale_cross_section(E, reaction) * E * np.exp(-E / kT), 0, 200 * kT,
+                    points=[gamow_peak(kT, gamow)[0]], epsabs=0, epsrel=1e-12, limit=500)[0]
+    return SPEED_OF_LIGHT * np.sqrt(8 / (np.pi * reduced_mass)) * kT**-1.5 * integral
+
+
+@pytest.mark.parametrize("reaction", ["DT", "DDn", "DHe3"])
+def test_reactivity_matches_quadrature(reaction):
+    kT = np.array([1.0, 10.0, 100.0])
+    expected = [maxwellian_reference(t, reaction) for t in kT]
+    np.testing.assert_allclose(bosch_hale_reactivity(kT, reaction), expected, rtol=1e-9)
+
+
+def test_dt_reactivity_at_10_kev():
+    # Bosch & Hale (1992), Table VIII: 1.136e-16 cm^3/s
+    assert bosch_hale_reactivity(10.0) == pytest.approx(1.136e-22, rel=0.01)
+
+
+def test_rate_table_interpolates_and_persists(tmp_path):
+    kT = np.geomspace(0.2, 100.0, 37)
+    table = RateTable('DT', cache_dir=str(tmp_path))
+    np.testing.assert_allclose(table.reactivity_kev(kT), bosch_hale_reactivity(kT), rtol=1e-8)
+    assert os.listdir(tmp_path)
+
+    reloaded = RateTable('DT', cache_dir=str(tmp_path))
+    np.testing.assert_array_equal(reloaded.reactivity_kev(kT), table.reactivity_kev(kT))
+    assert reloaded.reactivity_kev(np.array([0.0, -1.0])).tolist() == [0.0, 0.0]
+
+
+def test_rate_table_is_memory_only_without_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('FPHYSICS_CACHE_DIR', str(tmp_path))
+    monkeypatch.setenv('HOME', str(tmp_path))
+    RateTable('DT').reactivity_kev(10.0)
+    assert not os.listdir(tmp_path)
+
+
+def test_rate_table_outside_the_fit():
+    table = RateTable('DT')
+    lo, hi = REACTIONS['DT']['fit_range']
+    assert (table.t_min, table.t_max) == (lo, hi)
+    rate = table.reactivity_kev(np.array([0.1, lo, 10.0, hi, 500.0]))
+    assert rate[0] == 0.0
+    assert np.all(rate[1:4] > 0)
+    assert np.isnan(rate[4])
+    assert (table.t_min, table.t_max) == (lo, hi)
+
+    strict = RateTable('DT', strict=True)
+    with pytest.raises(ValueError, match="keV"):
+        strict.reactivity_kev(np.array([10.0, 500.0]))
+    with pytest.raises(ValueError):
+        RateTable('DHe3', t_max=1000.0, strict=True)
+
+
+def test_fusion_reaction_rate_does_not_raise_for_physical_temperatures():
+    assert fusion_reaction_rate(1e20, 1e20, 300.0) == 0.0
+    assert fusion_reaction_rate(1e20, 1e20, 1e6) == 0.0
+    assert np.isnan(fusion_reaction_rate(1e20, 1e20, 2e9))
+    rate = fusion_reaction_rate(1e20, 1e20, np.array([1e6, 1e7, 1e8]))
+    assert rate[0] == 0.0
+    np.testing.assert_allclose(rate[1:], 1e40 * bosch_hale_reactivity(kelvin_to_kev([1e7, 1e8])), rtol=1e-8)
+
+
+def test_dt_lawson_criterion_near_15_kev():
+    # the D-T ignition triple product is about 3e21 keV s/m^3 around 15 keV
+    assert not lawson_criterion(1e20, 15.0, 1.0)
+    assert lawson_criterion(1e20, 15.0, 3.0)
+
+
+@pytest.mark.parametrize("reaction", ["DT", "DD"])
+def test_lawson_criterion_outside_the_fit_is_not_met(reaction):
+    np.testing.assert_array_equal(lawson_criterion(1e20, np.array([0.0, 0.1, 500.0]), 1e6, reaction),
+                                  [False, False, False])
@@ -0,0 +1,37 @@
+import numpy as np
+
+from fphysics.quantum.split_operator import SplitOperatorPropagator, gaussian_packets
+
+
+def position_spread(propagator, psi):
+    x = propagator.grids[0]
+    density = np.abs(psi)**2
+    density /= density.sum(axis=-1, keepdims=True)
+    mean = density @ x
+    return np.sqrt(density @ x**2 - mean**2)
+
+
+def test_free_packets_follow_analytic_motion_and_spreading():
+    x = np.linspace(-80, 80, 4096)
+    psi0 = gaussian_packets(x, [-20.0, 0.0, 10.0], [1.0, 1.5, 2.0], [2.0, -1.0, 0.5])
+    propagator = SplitOperatorPropagator([x], np.zeros_like(x), dt=0.01)
+    history, psi = propagator.run(psi0, 500, observe_every=100)
+
+    t = history['t'][-1]
+    np.testing.assert_allclose(history['norm'] / history['norm'][0], 1.0, rtol=1e-12)
+    np.testing.assert_allclose(history['position'][-1, :, 0], np.array([-20.0, 0.0, 10.0])
+                               + np.array([2.0, -1.0, 0.5]) * t, atol=1e-8)
+    width = position_spread(propagator, psi0)
+    np.testing.assert_allclose(position_spread(propagator, psi), width * np.sqrt(1 + (t / (2 * width**2))**2),
+                               rtol=1e-6)
+
+
+def test_harmonic_ground_state_is_stationary_and_coherent_state_oscillates():
+    x = np.linspace(-20, 20, 1024)
+    ground = np.pi**-0.25 * np.exp(-x**2 / 2)
+    shifted = np.pi**-0.25 * np.exp(-(x - 3.0)**2 / 2)
+    propagator = SplitOperatorPropagator([x], 0.5 * x**2, dt=0.005)
+    history, psi = propagator.run(np.stack([ground, shifted]), 400, observe_every=40)
+
+    np.testing.assert_allclose(np.abs(psi[0])**2, ground**2, atol=1e-5)
+    np.testing.assert_allclose(history['position'][:, 1, 0], 3.0 * np.cos(history['t']), atol=1e-4)